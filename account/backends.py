@@ -0,0 +1,91 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import ValidationError
+
+from account import hashing, identity
+from core import cache
+from tenant.context import get_current_tenant
+from tenant.members import ais_member, is_member
+
+
+class TenantModelBackend(ModelBackend):
+    """
+    ModelBackend that only accepts members of the current tenant, both when
+    logging in and when loading the session's user on a tenant's host.
+    """
+
+    def user_can_authenticate(self, user):
+        return super().user_can_authenticate(user) and is_member(
+            user, get_current_tenant()
+        )
+
+    async def auser_can_authenticate(self, user):
+        return super().user_can_authenticate(user) and await ais_member(
+            user, get_current_tenant()
+        )
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        """authenticate() with the password check run on the hashing pool."""
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        user = await UserModel._default_manager.filter(
+            **{UserModel.USERNAME_FIELD: username}
+        ).afirst()
+        if user is None:
+            # Usernames are emails for registered users, so an address typed
+            # in another case is resolved through the identity table.
+            owner = await sync_to_async(identity.resolve)(username)
+            if owner and owner.user_id is not None:
+                user = await UserModel._default_manager.filter(
+                    pk=owner.user_id
+                ).afirst()
+        if user is None:
+            # Hash anyway, so response time does not reveal unknown usernames.
+            await hashing.ahash_password(password)
+            return None
+        matches, outdated = await hashing.averify_password(password, user.password)
+        if not matches or not await self.auser_can_authenticate(user):
+            return None
+        if outdated:
+            user.password = await hashing.ahash_password(password)
+            await user.asave(update_fields=["password"])
+        return user
+
+
+class CachedModelBackend(TenantModelBackend):
+    """
+    ModelBackend whose per-request user lookup is served from the cache.
+
+    The user is cached under its versioned object key, which core.signals
+    bumps on every save, so a password change (and with it the session auth
+    hash checked by django.contrib.auth.get_user) is seen on the next request.
+    Inactive and missing users are never cached.
+    """
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            pk = UserModel._meta.pk.to_python(user_id)
+        except ValidationError:
+            return None
+        parent = super()
+        return cache.get_or_set(UserModel, pk, "auth", lambda: parent.get_user(pk))
+
+    async def aget_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            pk = UserModel._meta.pk.to_python(user_id)
+        except ValidationError:
+            return None
+
+        async def acompute():
+            user = await UserModel._default_manager.filter(pk=pk).afirst()
+            if user is None or not await self.auser_can_authenticate(user):
+                return None
+            return user
+
+        return await cache.aget_or_set(UserModel, pk, "auth", acompute)
@@ -1,7 +1,12 @@
 from django import forms
 from django.contrib.auth.models import User
-from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.forms import PasswordResetForm, UserCreationForm
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.utils.text import capfirst
+
+from account import identity
 
 
 class RegisterForm(forms.Form):
@@ -28,25 +33,32 @@ class RegisterForm(forms.Form):
     )
 
     def clean(self):
+        # Cheapest checks first: the email lookup and the validator chain
+        # only run once the passwords are present and match.
         cleaned_data = super().clean()
         email = cleaned_data.get("email", "")
         password1 = cleaned_data.get("password1", "")
         password2 = cleaned_data.get("password2", "")
-        if email and User.objects.filter(email=email).exists():
-            self.add_error("email", "User with this email exists")
         if not password1 or not password2:
             self.add_error("password1", "Password is required")
             self.add_error("password2", "Password is required")
+            return cleaned_data
         if password1 != password2:
             self.add_error("password1", "Passwords do not match")
             self.add_error("password2", "Passwords do not match")
+            return cleaned_data
+        owner = identity.resolve(email)
+        if owner and owner.user_id is not None:
+            self.add_error("email", "User with this email exists")
+            return cleaned_data
         try:
             validate_password(password1)
         except forms.ValidationError as errs:
             raise forms.ValidationError({"password1": errs.messages})
         return cleaned_data
 
-    def save(self):
+    def save(self, password_hash=None):
+        """Create the user; ``password_hash`` skips hashing when pre-computed."""
         try:
             # cleaned_data = self.cleaned_data
             full_name = self.cleaned_data.get("name", "")
@@ -62,13 +74,14 @@ class RegisterForm(forms.Form):
             else:
                 first_name = name_split[0]
                 last_name = " ".join(name_split[1:])
-            user = User.objects.create_user(
-                username=email,
-                email=email,
-                password=password,
+            user = User(
+                username=User.normalize_username(email),
+                email=User.objects.normalize_email(email),
                 first_name=first_name,
                 last_name=last_name,
+                password=password_hash or make_password(password),
             )
+            user.save()
             return {
                 "status": "success",
                 "info": "User created succcessfully",
@@ -76,3 +89,45 @@ class RegisterForm(forms.Form):
             }
         except Exception as e:
             return {"status": "error", "info": f"Error occured {str(e)}"}
+
+
+class IdentityEmailMixin:
+    """
+    ModelForm mixin that checks the email is unused, case-insensitively,
+    through the identity table rather than a query on the model's column.
+    """
+
+    identity_owner = None
+
+    def validate_unique(self):
+        exclude = self._get_validation_exclusions()
+        exclude.add("email")
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except ValidationError as e:
+            self._update_errors(e)
+        owner = identity.resolve(self.cleaned_data.get("email"))
+        owner_id = owner and getattr(owner, f"{self.identity_owner}_id")
+        if owner_id not in (None, self.instance.pk):
+            opts = self._meta.model._meta
+            self.add_error(
+                "email",
+                f"{capfirst(opts.verbose_name)} with this "
+                f"{capfirst(opts.get_field('email').verbose_name)} already exists.",
+            )
+
+
+class IdentityPasswordResetForm(PasswordResetForm):
+    """PasswordResetForm that finds the user by identity, not an iexact scan."""
+
+    def get_users(self, email):
+        owner = identity.resolve(email)
+        if owner is None or owner.user_id is None:
+            return
+        user = User.objects.filter(pk=owner.user_id, is_active=True).first()
+        if (
+            user is not None
+            and user.has_usable_password()
+            and identity.normalize_email(user.email) == identity.normalize_email(email)
+        ):
+            yield user
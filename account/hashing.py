@@ -0,0 +1,79 @@
+"""
+Password hashing off the calling thread.
+
+Everything here must stay importable before ``django.setup()``, because
+"spawn" process-pool workers (the default on macOS and Windows) import
+this module from scratch.
+
+The async helpers run hashes on a small shared thread pool: hashlib's
+PBKDF2 (like the argon2 and bcrypt bindings) releases the GIL, so the event
+loop keeps serving other requests while a hash computes. At most
+``PASSWORD_HASHING_BACKLOG`` hashes may be queued or running; beyond that
+``HashingBusy`` is raised so a login storm gets a fast 503 instead of an
+ever-growing queue.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing pool already has a full backlog."""
+
+
+_pool = None
+_slots = None
+_pool_lock = threading.Lock()
+
+
+def hash_password(password):
+    from django.contrib.auth.hashers import make_password
+
+    return make_password(password)
+
+
+def verify_password(password, encoded):
+    """Return ``(matches, outdated)``; outdated hashes should be re-made."""
+    from django.contrib.auth.hashers import check_password
+
+    outdated = []
+    matches = check_password(password, encoded, setter=outdated.append)
+    return matches, bool(outdated)
+
+
+def get_pool():
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is None:
+            from django.conf import settings
+
+            _pool = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                thread_name_prefix="hashing",
+            )
+            _slots = threading.BoundedSemaphore(settings.PASSWORD_HASHING_BACKLOG)
+    return _pool, _slots
+
+
+async def _run(func, *args):
+    pool, slots = get_pool()
+    if not slots.acquire(blocking=False):
+        raise HashingBusy
+    try:
+        future = pool.submit(func, *args)
+    except BaseException:
+        slots.release()
+        raise
+    # Released when the hash finishes, not when the caller stops waiting,
+    # so a cancelled request cannot let the backlog overrun.
+    future.add_done_callback(lambda _: slots.release())
+    return await asyncio.wrap_future(future)
+
+
+async def ahash_password(password):
+    return await _run(hash_password, password)
+
+
+async def averify_password(password, encoded):
+    return await _run(verify_password, password, encoded)
@@ -0,0 +1,129 @@
+"""
+Email identity lookups.
+
+Registration, login, password reset and the customer and company forms
+resolve an email through the indexed EmailIdentity table, cached per
+address, instead of scanning auth_user.email or the per-model email
+columns. Addresses are matched case-insensitively.
+
+An address keeps the first user, customer and company that claimed it;
+a later record with the same address is not linked until the first one
+lets go of it.
+"""
+
+from collections import namedtuple
+
+from django.db import transaction
+
+from account.models import EmailIdentity
+from core import cache
+
+Identity = namedtuple("Identity", ["user_id", "customer_id", "company_id"])
+
+OWNERS = ("user", "customer", "company")
+
+
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+def resolve(email):
+    """The Identity owning ``email``, or None when no one uses it."""
+    email = normalize_email(email)
+    if not email:
+        return None
+
+    def compute():
+        row = (
+            EmailIdentity.objects.filter(email=email)
+            .values_list("user_id", "customer_id", "company_id")
+            .first()
+        )
+        return Identity(*row) if row else None
+
+    return cache.get_or_set(EmailIdentity, email, "identity", compute)
+
+
+def claim(owner, pk, email):
+    """Point ``email`` at ``owner`` (user/customer/company) ``pk``."""
+    email = normalize_email(email)
+    with transaction.atomic():
+        for identity in EmailIdentity.objects.filter(**{owner: pk}).exclude(
+            email=email
+        ):
+            _detach(identity, owner)
+        if email:
+            identity, _ = EmailIdentity.objects.get_or_create(email=email)
+            if getattr(identity, f"{owner}_id") is None:
+                setattr(identity, f"{owner}_id", pk)
+                identity.save(update_fields=[owner])
+                cache.bump(EmailIdentity, email)
+
+
+def claim_new(owner, records):
+    """
+    ``claim`` for many just-created ``(pk, email)`` records at once, e.g.
+    after a bulk_create; they have no older address to give up.
+    """
+    wanted = {}
+    for pk, email in records:
+        wanted.setdefault(normalize_email(email), pk)
+    wanted.pop("", None)
+    with transaction.atomic():
+        EmailIdentity.objects.bulk_create(
+            [EmailIdentity(email=email) for email in wanted], ignore_conflicts=True
+        )
+        identities = list(
+            EmailIdentity.objects.filter(
+                email__in=list(wanted), **{f"{owner}__isnull": True}
+            )
+        )
+        for identity in identities:
+            setattr(identity, f"{owner}_id", wanted[identity.email])
+        EmailIdentity.objects.bulk_update(identities, [owner])
+    for identity in identities:
+        cache.bump(EmailIdentity, identity.email)
+
+
+def release(email):
+    """Drop ``email``'s row once its owners have been deleted."""
+    email = normalize_email(email)
+    identity = EmailIdentity.objects.filter(email=email).first()
+    if identity is not None and not any(
+        getattr(identity, f"{owner}_id") for owner in OWNERS
+    ):
+        identity.delete()
+    cache.bump(EmailIdentity, email)
+
+
+def _detach(identity, owner):
+    setattr(identity, f"{owner}_id", None)
+    if any(getattr(identity, f"{other}_id") for other in OWNERS):
+        identity.save(update_fields=[owner])
+    else:
+        identity.delete()
+    cache.bump(EmailIdentity, identity.email)
+
+
+def rebuild():
+    """
+    Recreate every identity from the user, customer and company tables.
+    Lookups cached before the rebuild expire on their own.
+    """
+    from django.contrib.auth.models import User
+
+    from company.models import Company
+    from customer.models import Customer
+
+    identities = {}
+    for owner, model in (("user", User), ("customer", Customer), ("company", Company)):
+        rows = model.objects.exclude(email="").order_by("pk").values_list("pk", "email")
+        for pk, email in rows.iterator():
+            email = normalize_email(email)
+            identity = identities.setdefault(email, EmailIdentity(email=email))
+            if getattr(identity, f"{owner}_id") is None:
+                setattr(identity, f"{owner}_id", pk)
+    with transaction.atomic():
+        EmailIdentity.objects.all().delete()
+        EmailIdentity.objects.bulk_create(identities.values(), batch_size=1000)
+    return len(identities)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from account import identity
+
+
+class Command(BaseCommand):
+    help = "Rebuild the email identity table from users, customers and companies"
+
+    def handle(self, *args, **options):
+        count = identity.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} email identities"))
@@ -10,3 +10,31 @@ class PermissionTable(models.Model):
             ("c_admin", "Administrator"),
             ("c_customer", "Customer"),
         )
+
+
+class EmailIdentity(models.Model):
+    """
+    One row per normalized (stripped, lower-cased) email address, pointing
+    at the user, customer and company that use it. Kept in sync by
+    core.signals; read through account.identity.
+    """
+
+    email = models.CharField(max_length=254, unique=True)
+    user = models.OneToOneField(
+        User, null=True, on_delete=models.SET_NULL, related_name="email_identity"
+    )
+    customer = models.OneToOneField(
+        "customer.Customer",
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="email_identity",
+    )
+    company = models.OneToOneField(
+        "company.Company",
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="email_identity",
+    )
+
+    def __str__(self):
+        return self.email
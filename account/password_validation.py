@@ -0,0 +1,140 @@
+"""
+Common-password check against a precompiled, memory-mapped hash table.
+
+Django's CommonPasswordValidator decompresses its 20,000-entry list into a
+set of strings in every worker. CompiledCommonPasswordValidator compiles the
+same list once per host into a sorted array of 64-bit BLAKE2b hashes
+(``.npy``, about 160 KB) and memory-maps it, so workers share the pages and
+a lookup is a binary search. With 64-bit hashes a false "too common" is
+vanishingly unlikely at this list size.
+
+Tables live in PASSWORD_TABLE_DIR, a directory owned by the app rather than
+the shared temp directory, and a table is only mapped if this user owns it,
+nobody else can write it and it holds entries; otherwise it is recompiled.
+A planted or truncated table would silently switch the check off.
+"""
+
+import gzip
+import hashlib
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.password_validation import CommonPasswordValidator
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext as _
+
+_tables = {}
+
+
+def password_hash(password):
+    digest = hashlib.blake2b(password.encode(), digest_size=8).digest()
+    return np.uint64(int.from_bytes(digest, "little"))
+
+
+def read_password_list(path):
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return [line.strip() for line in f]
+    except OSError:
+        with open(path) as f:
+            return [line.strip() for line in f]
+
+
+def default_compiled_path(password_list_path):
+    """Per-host location, keyed on the source list so edits recompile."""
+    source = os.stat(password_list_path)
+    key = f"{Path(password_list_path).resolve()}:{source.st_size}:{source.st_mtime_ns}"
+    digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+    return Path(settings.PASSWORD_TABLE_DIR) / f"common-passwords-{digest}.npy"
+
+
+def is_trusted(compiled_path):
+    """Owned by this user, writable by nobody else, and not just a header."""
+    try:
+        info = os.stat(compiled_path)
+    except FileNotFoundError:
+        return False
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        return False
+    if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        return False
+    # An .npy header is at least 64 bytes; a table needs entries after it.
+    return info.st_size > 64
+
+
+def compile_password_list(password_list_path, compiled_path):
+    hashes = np.array(
+        [
+            password_hash(password)
+            for password in read_password_list(password_list_path)
+        ],
+        dtype=np.uint64,
+    )
+    table = np.unique(hashes)
+    Path(compiled_path).parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    # Write then rename, so workers compiling at the same time never map a
+    # partial file.
+    fd, tmp_path = tempfile.mkstemp(dir=Path(compiled_path).parent, suffix=".npy")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, table)
+        os.replace(tmp_path, compiled_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_table(password_list_path, compiled_path=None):
+    compiled_path = Path(
+        compiled_path or default_compiled_path(password_list_path)
+    ).resolve()
+    table = _tables.get(compiled_path)
+    if table is None:
+        table = _map_table(compiled_path)
+        if table is None:
+            compile_password_list(password_list_path, compiled_path)
+            table = _map_table(compiled_path)
+        _tables[compiled_path] = table
+    return table
+
+
+def _map_table(compiled_path):
+    if not is_trusted(compiled_path):
+        return None
+    try:
+        table = np.load(compiled_path, mmap_mode="r")
+    except ValueError:
+        return None
+    if table.dtype != np.uint64 or table.ndim != 1 or not len(table):
+        return None
+    return table
+
+
+class CompiledCommonPasswordValidator(CommonPasswordValidator):
+    """
+    Drop-in for CommonPasswordValidator; the table is compiled on first use
+    unless ``compiled_path`` already exists.
+    """
+
+    def __init__(self, password_list_path=None, compiled_path=None):
+        self.password_list_path = password_list_path or self.DEFAULT_PASSWORD_LIST_PATH
+        self.compiled_path = compiled_path
+        self.table = None
+
+    def is_common(self, password):
+        if self.table is None:
+            self.table = load_table(self.password_list_path, self.compiled_path)
+        value = password_hash(password.lower().strip())
+        index = np.searchsorted(self.table, value)
+        return bool(index < len(self.table) and self.table[index] == value)
+
+    def validate(self, password, user=None):
+        if self.is_common(password):
+            raise ValidationError(
+                _("This password is too common."),
+                code="password_too_common",
+            )
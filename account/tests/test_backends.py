@@ -0,0 +1,114 @@
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from account.backends import CachedModelBackend
+
+
+class CachedModelBackendTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.backend = CachedModelBackend()
+        self.user = User.objects.create_user(username="testuser", password="pass")
+
+    def test_get_user_is_cached(self):
+        self.backend.get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            user = self.backend.get_user(str(self.user.pk))
+        self.assertEqual(user, self.user)
+
+    def test_password_change_invalidates_cached_user(self):
+        self.backend.get_user(self.user.pk)
+        self.user.set_password("new-pass")
+        self.user.save()
+        user = self.backend.get_user(self.user.pk)
+        self.assertEqual(user.password, self.user.password)
+
+    def test_inactive_user_is_not_returned(self):
+        self.backend.get_user(self.user.pk)
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    def test_invalid_user_id(self):
+        self.assertIsNone(self.backend.get_user("not-an-id"))
+        self.assertIsNone(self.backend.get_user(999))
+
+    async def test_aauthenticate(self):
+        user = await self.backend.aauthenticate(
+            None, username="testuser", password="pass"
+        )
+        self.assertEqual(user, self.user)
+        self.assertIsNone(
+            await self.backend.aauthenticate(None, username="testuser", password="x")
+        )
+        self.assertIsNone(
+            await self.backend.aauthenticate(None, username="nobody", password="pass")
+        )
+
+    @override_settings(
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+    )
+    async def test_aauthenticate_prefers_username_over_email(self):
+        await User.objects.acreate(
+            username="owner", email="shared@mail.com", password=make_password("x")
+        )
+        named = await User.objects.acreate(
+            username="shared@mail.com", password=make_password("pass")
+        )
+        user = await self.backend.aauthenticate(
+            None, username="shared@mail.com", password="pass"
+        )
+        self.assertEqual(user, named)
+
+    async def test_aauthenticate_resolves_email_in_any_case(self):
+        self.user.email = "test@mail.com"
+        await self.user.asave()
+        user = await self.backend.aauthenticate(
+            None, username="TEST@mail.com", password="pass"
+        )
+        self.assertEqual(user, self.user)
+
+    async def test_aauthenticate_upgrades_outdated_hash(self):
+        outdated = make_password("pass", salt="a", hasher="md5")
+        await User.objects.filter(pk=self.user.pk).aupdate(password=outdated)
+        user = await self.backend.aauthenticate(
+            None, username="testuser", password="pass"
+        )
+        self.assertNotEqual(user.password, outdated)
+        await self.user.arefresh_from_db()
+        self.assertEqual(self.user.password, user.password)
+
+
+@override_settings(
+    SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+    AUTHENTICATION_BACKENDS=["account.backends.CachedModelBackend"],
+)
+class AuthenticatedRequestTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(username="testuser", password="pass")
+        self.client = Client()
+        self.client.login(username="testuser", password="pass")
+
+    def test_repeat_request_skips_session_and_user_queries(self):
+        url = reverse("core:dashboard")
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        tables = " ".join(query["sql"] for query in queries.captured_queries)
+        self.assertNotIn("django_session", tables)
+        self.assertNotIn("auth_user", tables)
+
+    def test_password_change_logs_out_other_sessions(self):
+        user = User.objects.get(username="testuser")
+        self.client.get(reverse("core:dashboard"))
+        user.set_password("new-pass")
+        user.save()
+        response = self.client.get(reverse("core:dashboard"))
+        self.assertEqual(response.status_code, 302)
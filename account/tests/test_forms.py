@@ -78,6 +78,13 @@ class RegistrationFormTestCase(TestCase):
         self.assertIn("Passwords do not match", form.errors.get("password1"))
         self.assertIn("Passwords do not match", form.errors.get("password2"))
 
+    def test_registration_form_mismatch_skips_database(self):
+        self.data.update({"password2": "testpass1234"})
+        form = RegisterForm(self.data)
+        with self.assertNumQueries(0):
+            self.assertFalse(form.is_valid())
+        self.assertNotIn("email", form.errors)
+
     def test_registration_form_with_invalid_password(self):
         self.data.update({"password1": "password", "password2": "password"})
         form = RegisterForm(self.data)
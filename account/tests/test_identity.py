@@ -0,0 +1,127 @@
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from account import identity
+from account.backends import CachedModelBackend
+from account.forms import RegisterForm
+from account.models import EmailIdentity
+from customer.forms import CreateCustomerForm
+from customer.models import Customer
+
+
+class IdentityTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="mail@gmail.com", email="Mail@Gmail.com", password="pass"
+        )
+
+    def test_user_is_claimed(self):
+        owner = identity.resolve("  MAIL@gmail.COM ")
+        self.assertEqual(owner.user_id, self.user.pk)
+        self.assertIsNone(owner.customer_id)
+        self.assertTrue(EmailIdentity.objects.filter(email="mail@gmail.com").exists())
+
+    def test_resolve_is_cached(self):
+        identity.resolve("mail@gmail.com")
+        with self.assertNumQueries(0):
+            self.assertEqual(identity.resolve("mail@gmail.com").user_id, self.user.pk)
+
+    def test_unknown_email(self):
+        self.assertIsNone(identity.resolve("nobody@gmail.com"))
+        self.assertIsNone(identity.resolve(""))
+
+    def test_email_change_moves_identity(self):
+        identity.resolve("mail@gmail.com")
+        self.user.email = "new@gmail.com"
+        self.user.save()
+        self.assertIsNone(identity.resolve("mail@gmail.com"))
+        self.assertEqual(identity.resolve("new@gmail.com").user_id, self.user.pk)
+
+    def test_customer_shares_identity_with_user(self):
+        customer = Customer.objects.create(
+            user=self.user, name="Meta", email="mail@gmail.com"
+        )
+        owner = identity.resolve("mail@gmail.com")
+        self.assertEqual(owner, (self.user.pk, customer.pk, None))
+        self.assertEqual(EmailIdentity.objects.count(), 1)
+
+    def test_delete_releases_identity(self):
+        identity.resolve("mail@gmail.com")
+        self.user.delete()
+        self.assertIsNone(identity.resolve("mail@gmail.com"))
+        self.assertFalse(EmailIdentity.objects.exists())
+
+    def test_first_owner_keeps_address(self):
+        other = User.objects.create_user(username="other", email="MAIL@gmail.com")
+        self.assertEqual(identity.resolve("mail@gmail.com").user_id, self.user.pk)
+        self.user.delete()
+        other.save()
+        self.assertEqual(identity.resolve("mail@gmail.com").user_id, other.pk)
+
+    def test_claim_new(self):
+        users = User.objects.bulk_create(
+            [User(username="a", email="A@mail.com"), User(username="b", email="")]
+        )
+        identity.claim_new("user", [(user.pk, user.email) for user in users])
+        self.assertEqual(identity.resolve("a@mail.com").user_id, users[0].pk)
+        self.assertFalse(EmailIdentity.objects.filter(email="").exists())
+
+    def test_rebuild(self):
+        customer = Customer.objects.create(
+            user=self.user, name="Meta", email="meta@gmail.com"
+        )
+        EmailIdentity.objects.all().delete()
+        self.assertEqual(identity.rebuild(), 2)
+        self.assertEqual(identity.resolve("META@gmail.com").customer_id, customer.pk)
+
+
+class IdentityLookupTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="mail@gmail.com", email="mail@gmail.com", password="pass"
+        )
+
+    def test_register_rejects_case_variant(self):
+        form = RegisterForm(
+            {
+                "full_name": "Recyclor",
+                "email": "MAIL@gmail.com",
+                "password1": "k2#Jq9!vTz0w",
+                "password2": "k2#Jq9!vTz0w",
+            }
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn("User with this email exists", form.errors["email"])
+
+    def test_customer_form_rejects_case_variant(self):
+        Customer.objects.create(user=self.user, name="Meta", email="meta@gmail.com")
+        data = {"name": "Meta", "email": "META@gmail.com", "address": "Lagos"}
+        data.update({"phone": "0800", "schedule": "weekly"})
+        form = CreateCustomerForm(data)
+        self.assertFalse(form.is_valid())
+        self.assertIn("Customer with this Email already exists.", form.errors["email"])
+
+    def test_customer_form_accepts_own_email(self):
+        customer = Customer.objects.create(
+            user=self.user, name="Meta", email="meta@gmail.com"
+        )
+        data = {"name": "Meta", "email": "meta@gmail.com", "address": "Lagos"}
+        data.update({"phone": "0800", "schedule": "weekly"})
+        self.assertTrue(CreateCustomerForm(data, instance=customer).is_valid())
+
+    def test_password_reset_uses_identity(self):
+        response = Client().post(reverse("password_reset"), {"email": "MAIL@Gmail.com"})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["mail@gmail.com"])
+
+    async def test_login_with_email_in_any_case(self):
+        user = await CachedModelBackend().aauthenticate(
+            None, username="Mail@GMAIL.com", password="pass"
+        )
+        self.assertEqual(user, self.user)
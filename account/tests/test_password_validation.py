@@ -0,0 +1,76 @@
+import gzip
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from django.contrib.auth.password_validation import CommonPasswordValidator
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, override_settings
+
+from account.password_validation import (
+    CompiledCommonPasswordValidator,
+    default_compiled_path,
+)
+
+
+class CompiledCommonPasswordValidatorTestCase(SimpleTestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = Path(tmpdir.name)
+
+    def test_matches_django_list(self):
+        validator = CompiledCommonPasswordValidator(
+            compiled_path=self.tmpdir / "common.npy"
+        )
+        passwords = CommonPasswordValidator().passwords
+        self.assertIsNone(validator.table)
+        self.assertTrue(all(validator.is_common(p) for p in passwords))
+        self.assertEqual(len(validator.table), len(passwords))
+
+    def test_validate(self):
+        validator = CompiledCommonPasswordValidator(
+            compiled_path=self.tmpdir / "common.npy"
+        )
+        with self.assertRaisesMessage(ValidationError, "too common"):
+            validator.validate(" PassWord ")
+        validator.validate("k2#Jq9!vTz0w")
+
+    def test_custom_list_is_compiled_once(self):
+        source = self.tmpdir / "list.txt.gz"
+        with gzip.open(source, "wt") as f:
+            f.write("recyclor\nwastebin\n")
+        compiled = self.tmpdir / "list.npy"
+        validator = CompiledCommonPasswordValidator(source, compiled)
+        self.assertTrue(validator.is_common("Recyclor"))
+        self.assertFalse(validator.is_common("password"))
+        mtime = compiled.stat().st_mtime_ns
+        self.assertTrue(
+            CompiledCommonPasswordValidator(source, compiled).is_common("wastebin")
+        )
+        self.assertEqual(compiled.stat().st_mtime_ns, mtime)
+
+    def test_compiles_into_table_dir(self):
+        table_dir = self.tmpdir / "tables"
+        with override_settings(PASSWORD_TABLE_DIR=str(table_dir)):
+            validator = CompiledCommonPasswordValidator()
+            compiled = default_compiled_path(validator.password_list_path)
+            self.assertTrue(validator.is_common("password"))
+        self.assertEqual(compiled.parent, table_dir)
+        self.assertEqual(table_dir.stat().st_mode & 0o777, 0o700)
+        self.assertEqual(compiled.stat().st_mode & 0o777, 0o600)
+
+    def test_planted_empty_table_is_recompiled(self):
+        compiled = self.tmpdir / "common.npy"
+        np.save(compiled, np.empty(0, dtype=np.uint64))
+        validator = CompiledCommonPasswordValidator(compiled_path=compiled)
+        self.assertTrue(validator.is_common("password"))
+
+    def test_writable_table_is_recompiled(self):
+        compiled = self.tmpdir / "common.npy"
+        np.save(compiled, np.array([1], dtype=np.uint64))
+        os.chmod(compiled, 0o666)
+        validator = CompiledCommonPasswordValidator(compiled_path=compiled)
+        self.assertTrue(validator.is_common("password"))
+        self.assertEqual(compiled.stat().st_mode & 0o777, 0o600)
@@ -1,11 +1,14 @@
 from django.contrib.messages.api import get_messages
+from django.core.cache import cache
 from django.template.loader import render_to_string
 from django.test import TestCase, Client, RequestFactory
 from django.urls import reverse
 from django.contrib.auth.models import AnonymousUser, User
 from urllib.parse import urlencode, quote
 
+from account import hashing
 from account.forms import RegisterForm
+from account.views import BUSY_MESSAGE
 
 """
 CLIENT first
@@ -94,6 +97,31 @@ class LoginViewTestCase(TestCase):
         self.assertEqual(current_path, DASHBOARD_URL)
 
 
+class HashingBacklogTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user_data = get_user_data()
+        User.objects.create_user(**self.user_data)
+        _, slots = hashing.get_pool()
+        self.held = 0
+        while slots.acquire(blocking=False):
+            self.held += 1
+        self.addCleanup(lambda: [slots.release() for _ in range(self.held)])
+
+    def test_login_with_full_backlog(self):
+        response = self.client.post(LOGIN_URL, data=self.user_data)
+        self.assertEqual(response.status_code, 503)
+        messages = [msg.message for msg in get_messages(response.wsgi_request)]
+        self.assertIn(BUSY_MESSAGE, messages)
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+    def test_register_with_full_backlog(self):
+        response = self.client.post(REGISTRATION_URL, get_registration_data())
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(User.objects.filter(email="mail@gmail.com").exists())
+
+
 class LogoutTestCase(TestCase):
     def setUp(self):
         self.client = Client()
@@ -119,6 +147,7 @@ class LogoutTestCase(TestCase):
 
 class RegisterUserTestCase(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = Client()
         self.user_data = get_user_data()
         self.user = User.objects.create_user(**self.user_data)
@@ -6,6 +6,7 @@ from django.contrib.auth.views import (
     PasswordResetConfirmView,
 )
 from account import views
+from account.forms import IdentityPasswordResetForm
 
 # app_name = "account"
 
@@ -15,7 +16,10 @@ urlpatterns = [
     path("register", views.RegisterUserView.as_view(), name="register"),
     path(
         "password-reset",
-        PasswordResetView.as_view(template_name="account/password_reset.html"),
+        PasswordResetView.as_view(
+            template_name="account/password_reset.html",
+            form_class=IdentityPasswordResetForm,
+        ),
         name="password_reset",
     ),
     path(
@@ -1,32 +1,46 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.contrib.auth.views import reverse_lazy
 from django.shortcuts import render
 from django.http import HttpResponseRedirect
-from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth import login, logout
 from django.contrib import messages
 from django.urls import reverse
 from django.views.generic.edit import CreateView, FormView
 
 from account.forms import RegisterForm
+from account.hashing import HashingBusy, ahash_password
+from core.auth import aauthenticate
 
 
-def login_user(request):
-    if request.user.is_authenticated:
+BUSY_MESSAGE = "Too many requests right now, please try again in a moment."
+
+
+async def login_user(request):
+    # Hashing runs on account.hashing's pool, so a burst of logins does not
+    # hold up the thread every other (sync) view runs on.
+    if await sync_to_async(lambda: request.user.is_authenticated)():
         return HttpResponseRedirect(reverse("core:dashboard"))
     next = request.GET.get("next", "")
+    status = 200
     if request.method == "POST":
         username = request.POST.get("username", "")
         password = request.POST.get("password", "")
-        user = authenticate(username=username, password=password)
+        try:
+            user = await aauthenticate(request, username=username, password=password)
+        except HashingBusy:
+            messages.error(request, BUSY_MESSAGE)
+            user, status = None, 503
+        else:
+            if user is None:
+                messages.error(request, "Invalid username or password.")
         if user is not None:
-            login(request, user)
+            await sync_to_async(login)(request, user)
             if next:
                 return HttpResponseRedirect(next)
             return HttpResponseRedirect(reverse("core:dashboard"))
-        else:
-            messages.error(request, "Invalid username or password.")
-    return render(request, "account/login.html")
+    return await sync_to_async(render)(request, "account/login.html", status=status)
 
 
 def logout_user(request):
@@ -38,10 +52,29 @@ class RegisterUserView(FormView):
     template_name = "account/register.html"
     form_class = RegisterForm
     success_url = reverse_lazy("account:login")
+    password_hash = None
+
+    async def get(self, request, *args, **kwargs):
+        return await sync_to_async(super().get)(request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        form = self.get_form()
+        if not await sync_to_async(form.is_valid)():
+            return await sync_to_async(self.form_invalid)(form)
+        try:
+            self.password_hash = await ahash_password(form.cleaned_data["password1"])
+        except HashingBusy:
+            messages.error(request, BUSY_MESSAGE)
+            response = await sync_to_async(self.form_invalid)(form)
+            response.status_code = 503
+            return response
+        return await sync_to_async(self.form_valid)(form)
+
+    put = post
 
     def form_valid(self, form):
         if form.is_valid():
-            response = form.save()
+            response = form.save(password_hash=self.password_hash)
             info = response.get("info")
             if response.get("status") == "success":
                 messages.success(self.request, info)
@@ -0,0 +1,21 @@
+import os
+import time
+
+import django
+
+
+def setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "waste_mgt.settings")
+    django.setup()
+
+
+def timed(label, func, *args, repeat=5, **kwargs):
+    """Run ``func`` ``repeat`` times and print the best wall time."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<48} {best * 1000:10.2f} ms")
+    return result
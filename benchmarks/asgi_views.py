@@ -0,0 +1,236 @@
+"""
+Throughput and tail latency of the dashboard and customer pages under WSGI
+and ASGI as the number of concurrent clients grows.
+
+Each client logs in once, then requests the page ``--requests`` times with
+``--think`` seconds between requests, starting at a random point in the
+first think time, so at high client counts most connections sit idle. Both
+servers are driven in-process, without sockets:
+
+    python -m benchmarks.asgi_views --clients 10 100 1000 --think 10
+
+"wsgi" calls Django's WSGIHandler from a thread per client, as a threaded
+WSGI server does per keep-alive connection, using the previous sync views
+(benchmarks.urls). "asgi-sync" serves the same views under ASGI, where
+each one runs on a worker thread. "asgi-async" serves the current async
+views. Under ASGI a client is a task, so an idle connection costs no
+thread; Django 4.2 still hops to a thread for MiddlewareMixin hooks and
+the cache, so a busy request does. Peak threads and RSS are sampled while
+the run is in progress.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import threading
+import time
+
+from benchmarks import setup
+
+MODES = ("wsgi", "asgi-sync", "asgi-async")
+
+
+def rss_mb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+class Sampler(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.stopped = threading.Event()
+        self.threads = threading.active_count()
+        self.rss = rss_mb()
+
+    def run(self):
+        while not self.stopped.wait(0.01):
+            self.threads = max(self.threads, threading.active_count())
+            self.rss = max(self.rss, rss_mb())
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def wsgi_client(handler, path, cookie, requests, think, latencies):
+    from io import BytesIO
+
+    time.sleep(random.uniform(0, think))
+    for _ in range(requests):
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": "",
+            "SERVER_NAME": "testserver",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "HTTP_HOST": "testserver",
+            "HTTP_COOKIE": cookie,
+            "wsgi.input": BytesIO(),
+            "wsgi.errors": BytesIO(),
+            "wsgi.url_scheme": "http",
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+            "wsgi.version": (1, 0),
+        }
+        start = time.perf_counter()
+        response = handler(environ, lambda status, headers: None)
+        b"".join(response)
+        response.close()
+        latencies.append(time.perf_counter() - start)
+        time.sleep(think)
+
+
+def run_wsgi(path, cookie, clients, requests, think):
+    from django.core.wsgi import get_wsgi_application
+
+    handler = get_wsgi_application()
+    latencies = []
+    threads = [
+        threading.Thread(
+            target=wsgi_client,
+            args=(handler, path, cookie, requests, think, latencies),
+        )
+        for _ in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+async def asgi_request(app, path, cookie):
+    from asgiref.testing import ApplicationCommunicator
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"cookie", cookie.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    communicator = ApplicationCommunicator(app, scope)
+    await communicator.send_input({"type": "http.request", "body": b""})
+    start = await communicator.receive_output(120)
+    message = {"more_body": True}
+    while message.get("more_body"):
+        message = await communicator.receive_output(120)
+    await communicator.wait()
+    if start["status"] != 200:
+        raise RuntimeError(f"{path} returned {start['status']}")
+
+
+async def asgi_client(app, path, cookie, requests, think, latencies):
+    await asyncio.sleep(random.uniform(0, think))
+    for _ in range(requests):
+        start = time.perf_counter()
+        await asgi_request(app, path, cookie)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(think)
+
+
+def run_asgi(path, cookie, clients, requests, think):
+    from django.core.asgi import get_asgi_application
+
+    app = get_asgi_application()
+    latencies = []
+
+    async def main():
+        await asyncio.gather(
+            *(
+                asgi_client(app, path, cookie, requests, think, latencies)
+                for _ in range(clients)
+            )
+        )
+
+    asyncio.run(main())
+    return latencies
+
+
+def scenario(mode, page, path, cookie, clients, requests, think):
+    run = run_wsgi if mode == "wsgi" else run_asgi
+    sampler = Sampler()
+    sampler.start()
+    start = time.perf_counter()
+    latencies = run(path, cookie, clients, requests, think)
+    elapsed = time.perf_counter() - start
+    sampler.stop()
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    print(
+        f"{page:<9} {mode:<10} {clients:5d} clients  "
+        f"{len(latencies) / elapsed:8.1f} req/s  "
+        f"p50 {quantiles[49] * 1000:8.2f} ms  p99 {quantiles[98] * 1000:8.2f} ms  "
+        f"threads {sampler.threads:5d}  rss {sampler.rss:6.1f} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--requests", type=int, default=3)
+    parser.add_argument("--think", type=float, default=10.0)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    from customer.models import Customer
+
+    override_settings(
+        ALLOWED_HOSTS=["testserver"], DEBUG=False, ROOT_URLCONF="benchmarks.urls"
+    ).enable()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = User.objects.create_user(username="bench", password="bench-pass")
+        customer = Customer.objects.create(
+            user=user,
+            name="Bench Customer",
+            address="1 Bench Road",
+            phone="08000000000",
+            email="bench@example.com",
+        )
+        client = Client()
+        client.force_login(user)
+        session = client.cookies[settings.SESSION_COOKIE_NAME].value
+        cookie = f"{settings.SESSION_COOKIE_NAME}={session}"
+        pages = {
+            "dashboard": ("/sync-dashboard", "/"),
+            "customer": (
+                f"/sync-customer/{customer.pk}",
+                f"/customer/update/{customer.pk}",
+            ),
+        }
+        for page, (sync_path, async_path) in pages.items():
+            # Warm the caches so every mode serves the same cached page.
+            client.get(sync_path)
+            for clients in args.clients:
+                for mode in args.modes:
+                    path = async_path if mode == "asgi-async" else sync_path
+                    scenario(
+                        mode, page, path, cookie, clients, args.requests, args.think
+                    )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
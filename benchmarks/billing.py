@@ -0,0 +1,126 @@
+"""
+Billing-run throughput, sequential and on a process pool.
+
+Seeds subscribers into a throwaway SQLite file (the pool's workers need a
+database they can open), then bills one monthly cycle with each worker
+count and checks that resuming a half-finished run writes no duplicates:
+
+    python -m benchmarks.billing --subscribers 200000 --workers 1,4
+
+Runs use the "concurrent" SQLite profile so parallel writers wait for the
+lock instead of failing; on PostgreSQL, point local_settings at it instead.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+from benchmarks import setup
+
+MARCH = (date(2024, 3, 1), date(2024, 3, 31))
+
+
+def init_worker(database_name):
+    from core.workers import init_worker
+
+    init_worker()
+    from django.db import connections
+
+    connections["default"].settings_dict["NAME"] = database_name
+
+
+def seed(subscribers, batch_size=10_000):
+    from django.contrib.auth.models import User
+
+    from customer.models import Customer
+    from subscription.models import Subscription
+
+    for offset in range(0, subscribers, batch_size):
+        size = min(batch_size, subscribers - offset)
+        users = User.objects.bulk_create(
+            User(username=f"bench{offset + i}", password="!") for i in range(size)
+        )
+        customers = Customer.objects.bulk_create(
+            Customer(user=user, name=user.username, email=f"{user.username}@mail.com")
+            for user in users
+        )
+        Subscription.objects.bulk_create(
+            Subscription(customer=customer, billing="monthly", amount=Decimal(2500))
+            for customer in customers
+        )
+
+
+def bill(workers, partition_size, database_name):
+    from subscription.billing import run_billing, start_run
+    from subscription.models import BillingRun
+
+    BillingRun.objects.all().delete()
+    start = time.perf_counter()
+    run = start_run("monthly", *MARCH, partition_size=partition_size)
+    written = run_billing(
+        run, workers=workers, initializer=init_worker, initargs=(database_name,)
+    )
+    return written, time.perf_counter() - start
+
+
+def resume(partition_size):
+    """Bill half the partitions, then "restart" the run; count invoices."""
+    from subscription.billing import (
+        bill_partition,
+        pending_partitions,
+        run_billing,
+        start_run,
+    )
+    from subscription.models import BillingRun, Invoice
+
+    BillingRun.objects.all().delete()
+    run = start_run("monthly", *MARCH, partition_size=partition_size)
+    pending = pending_partitions(run)
+    for pk in pending[: len(pending) // 2]:
+        bill_partition(pk)
+    run_billing(start_run("monthly", *MARCH, partition_size=partition_size))
+    return Invoice.objects.count()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=200_000)
+    parser.add_argument("--workers", default="1,4")
+    parser.add_argument("--partition-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SQLITE_PROFILE", "concurrent")
+    setup()
+    from django.db import connection
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database_name = str(Path(tmpdir) / "billing.sqlite3")
+        connection.settings_dict["TEST"]["NAME"] = database_name
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            start = time.perf_counter()
+            seed(args.subscribers)
+            print(
+                f"Seeded {args.subscribers} subscribers "
+                f"in {time.perf_counter() - start:.1f}s"
+            )
+            for workers in (int(w) for w in args.workers.split(",")):
+                written, elapsed = bill(workers, args.partition_size, database_name)
+                rate = written / elapsed
+                print(
+                    f"{workers:>2} workers  {written} invoices in {elapsed:6.2f}s  "
+                    f"{rate:9.0f}/s  (1M subscribers: {1_000_000 / rate / 60:5.1f} min)"
+                )
+            invoices = resume(args.partition_size)
+            status = "ok" if invoices == args.subscribers else "DUPLICATES/MISSING"
+            print(f"resumed run: {invoices} invoices for {args.subscribers} [{status}]")
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
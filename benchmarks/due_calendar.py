@@ -0,0 +1,39 @@
+"""
+Pickup-calendar benchmark for customer.scheduling.DueDateIndex.
+
+    python -m benchmarks.due_calendar --customers 1000000 --days 90
+"""
+
+import argparse
+
+import numpy as np
+
+from benchmarks import setup, timed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--customers", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=90)
+    args = parser.parse_args()
+
+    setup()
+    from django.utils import timezone
+
+    from customer.scheduling import INTERVAL_DAYS, DueDateIndex
+
+    rng = np.random.default_rng(0)
+    today = timezone.now().date()
+    index = DueDateIndex(
+        ids=np.arange(1, args.customers + 1),
+        codes=rng.integers(0, len(INTERVAL_DAYS), args.customers),
+        last_service=today.toordinal() - rng.integers(0, 365, args.customers),
+    )
+    counts = timed("counts", index.counts, today, args.days)
+    timed("due_ids (one day)", index.due_ids, today)
+    timed("calendar (ids per day)", index.calendar, today, args.days, repeat=3)
+    print(f"{args.customers} customers, {counts.sum()} pickups over {args.days} days")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Bulk payment verification against a local mock gateway.
+
+Starts a keep-alive HTTP server that answers Paystack's verify endpoint
+after ``--latency`` ms, then verifies ``--references`` references:
+
+    python -m benchmarks.gateway_client --references 1000 --latency 50
+
+one blocking call on a fresh connection per reference (the naive loop),
+on a pooled sync connection, and with the async client at a few concurrency
+levels, unthrottled and under a 200 requests/s rate limit.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks import setup
+
+
+class MockPaystack(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't let Nagle hold the body.
+    disable_nagle_algorithm = True
+    latency = 0.05
+    connections = None
+
+    def setup(self):
+        super().setup()
+        with self.connections.get_lock():
+            self.connections.value += 1
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        reference = self.path.rsplit("/", 1)[-1]
+        body = json.dumps(
+            {
+                "status": True,
+                "data": {"status": "success", "reference": reference, "amount": 250000},
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class MockServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops bursts of new connections.
+    request_queue_size = 256
+    daemon_threads = True
+
+
+def run_server(latency, connections, port):
+    MockPaystack.latency = latency
+    MockPaystack.connections = connections
+    server = MockServer(("127.0.0.1", 0), MockPaystack)
+    port.put(server.server_port)
+    server.serve_forever()
+
+
+def serve(latency):
+    """Run the mock in its own process, off the client's GIL."""
+    connections = multiprocessing.Value("i", 0)
+    port = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=run_server, args=(latency, connections, port), daemon=True
+    )
+    process.start()
+    return process, port.get(timeout=10), connections
+
+
+def naive(base_url, references):
+    import httpx
+
+    for reference in references:
+        httpx.get(f"{base_url}/transaction/verify/{reference}").json()
+
+
+def pooled(references):
+    """One blocking call at a time on a shared keep-alive connection pool."""
+    import httpx
+    from django.conf import settings
+
+    from payment.gateways import GATEWAYS
+
+    gateway = GATEWAYS["paystack"]
+    with httpx.Client(
+        base_url=settings.PAYSTACK_API_URL,
+        headers=gateway.api_headers(),
+        timeout=settings.PAYMENT_GATEWAY_TIMEOUT,
+    ) as http:
+        for reference in references:
+            path, params = gateway.verify_request(reference)
+            gateway.verification(reference, 200, http.get(path, params=params).json())
+
+
+def concurrent(references, concurrency):
+    from payment.client import AsyncGatewayClient
+
+    async def run():
+        async with AsyncGatewayClient("paystack", concurrency=concurrency) as gateway:
+            return await gateway.verify_many(references)
+
+    results = asyncio.run(run())
+    assert all(result.status == "success" for result in results)
+
+
+def report(label, func, *args, count, connections):
+    from payment import client
+
+    client._rate_limits.clear()
+    connections.value = 0
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<34} {elapsed:7.2f}s  {count / elapsed:8.0f} refs/s  "
+        f"{connections.value:5} connections"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--references", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=50, help="ms")
+    parser.add_argument("--naive-sample", type=int, default=100)
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+
+    server, port, connections = serve(args.latency / 1000)
+    settings.PAYSTACK_API_URL = f"http://127.0.0.1:{port}"
+    settings.PAYSTACK_SECRET_KEY = "sk_bench"
+    settings.PAYSTACK_RATE_LIMIT = 0
+    references = [f"ref-{i}" for i in range(args.references)]
+    sample = references[: args.naive_sample]
+    try:
+        count = len(sample)
+        report(
+            f"naive, {count} refs",
+            naive,
+            settings.PAYSTACK_API_URL,
+            sample,
+            count=count,
+            connections=connections,
+        )
+        report(
+            f"pooled sync, {count} refs",
+            pooled,
+            sample,
+            count=count,
+            connections=connections,
+        )
+        for concurrency in (10, 50, 100):
+            report(
+                f"async x{concurrency}, {args.references} refs",
+                concurrent,
+                references,
+                concurrency,
+                count=args.references,
+                connections=connections,
+            )
+        settings.PAYSTACK_RATE_LIMIT = 200
+        report(
+            f"async x100 at 200/s, {args.references} refs",
+            concurrent,
+            references,
+            100,
+            count=args.references,
+            connections=connections,
+        )
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Latency of ordinary pages while a burst of logins is being hashed.
+
+Drives the ASGI application in-process (asgiref's ApplicationCommunicator,
+no server or sockets) and keeps requesting a cheap sync page, the password
+reset form, while a burst of logins runs:
+
+    python -m benchmarks.login_burst --logins 100
+
+"sync" posts to a copy of the previous sync login view (benchmarks.urls), which under ASGI
+hashes on a thread per request, so every login in the burst competes with
+the page for CPU at once. "async" posts to the current login view, which
+hashes on account.hashing's bounded pool. Real PBKDF2 is used whatever
+local_settings says.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+
+from benchmarks import setup
+
+CSRF_TOKEN = "benchmarkbenchmarkbenchmarkbench"
+
+
+async def call(app, method, path, body=b""):
+    from asgiref.testing import ApplicationCommunicator
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", b"application/x-www-form-urlencoded"),
+            (b"cookie", f"csrftoken={CSRF_TOKEN}".encode()),
+            (b"x-csrftoken", CSRF_TOKEN.encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    communicator = ApplicationCommunicator(app, scope)
+    await communicator.send_input({"type": "http.request", "body": body})
+    start = await communicator.receive_output(60)
+    message = {"more_body": True}
+    while message.get("more_body"):
+        message = await communicator.receive_output(60)
+    await communicator.wait()
+    return start["status"]
+
+
+async def probe(app, path, burst):
+    latencies = []
+    while True:
+        start = time.perf_counter()
+        await call(app, "GET", path)
+        latencies.append(time.perf_counter() - start)
+        if burst.done():
+            return latencies
+
+
+async def scenario(app, mode, logins, username, password):
+    from urllib.parse import urlencode
+
+    from django.urls import reverse
+
+    login_path = "/sync-login" if mode == "sync" else reverse("account:login")
+    body = urlencode({"username": username, "password": password}).encode()
+    if mode == "idle":
+        tasks = [asyncio.sleep(0.5)]
+    else:
+        tasks = [call(app, "POST", login_path, body) for _ in range(logins)]
+
+    start = time.perf_counter()
+    burst = asyncio.ensure_future(asyncio.gather(*tasks))
+    latencies = await probe(app, reverse("password_reset"), burst)
+    elapsed = time.perf_counter() - start
+    results = burst.result()
+    statuses = Counter(results) if mode != "idle" else {}
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    print(
+        f"{mode:<6} burst {elapsed:6.2f}s  {len(latencies):5d} probes  "
+        f"p50 {quantiles[49] * 1000:8.2f} ms  p99 {quantiles[98] * 1000:8.2f} ms  "
+        f"max {max(latencies) * 1000:8.2f} ms  {dict(statuses) or ''}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=100)
+    args = parser.parse_args()
+
+    setup()
+    from django.contrib.auth.models import User
+    from django.core.asgi import get_asgi_application
+    from django.db import connection
+    from django.test.utils import override_settings
+
+    override_settings(
+        ALLOWED_HOSTS=["testserver"],
+        DEBUG=False,
+        ROOT_URLCONF="benchmarks.urls",
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.PBKDF2PasswordHasher"],
+    ).enable()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        User.objects.create_user(username="bench", password="bench-pass")
+        app = get_asgi_application()
+        for mode in ("idle", "sync", "async"):
+            asyncio.run(scenario(app, mode, args.logins, "bench", "bench-pass"))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
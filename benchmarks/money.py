@@ -0,0 +1,83 @@
+"""
+Money formatting for a report column of ServiceHistory costs.
+
+    python -m benchmarks.money --rows 50000
+
+Compares the intcomma prototype in temp.py and
+django.contrib.humanize's intcomma (one value at a time, no currency)
+with core.money, per value and batched, against the time to query the
+column, and renders a report table with and without the money filters.
+"""
+
+import argparse
+import contextlib
+import io
+import random
+from decimal import Decimal
+
+from benchmarks import setup, timed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    setup()
+    from django.contrib.auth.models import User
+    from django.contrib.humanize.templatetags.humanize import intcomma
+    from django.db import connection
+    from django.template import Context, Template
+
+    from core.money import format_column, format_money
+    from customer.models import Customer, ServiceHistory
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        # temp.py prints its examples on import.
+        from temp import intcomma as prototype
+
+    rng = random.Random(0)
+    costs = [Decimal(rng.randrange(0, 50_000_000)) / 100 for _ in range(args.rows)]
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = User.objects.create_user(username="bench")
+        customer = Customer.objects.create(
+            user=user,
+            name="Bench",
+            email="bench@mail.com",
+        )
+        ServiceHistory.objects.bulk_create(
+            (
+                ServiceHistory(customer=customer, cost=cost, created_by=user)
+                for cost in costs
+            ),
+            batch_size=5000,
+        )
+        query = ServiceHistory.objects.values_list("cost", flat=True)
+        timed(f"query {args.rows} costs", lambda: list(query.all()))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    timed("temp.py intcomma", lambda: [prototype(c) for c in costs])
+    timed("humanize intcomma", lambda: [intcomma(c) for c in costs])
+    timed(
+        "core.money format_money (per value)", lambda: [format_money(c) for c in costs]
+    )
+    timed("core.money format_column", format_column, costs)
+    timed("core.money format_column (de)", format_column, costs, "EUR", "de")
+    timed("core.money format_column (en-in)", format_column, costs, "INR", "en-in")
+
+    rows = [{"cost": cost} for cost in costs]
+    table = "{%% load money %%}{%% for row in rows%s %%}<td>{{ row.cost%s }}</td>{%% endfor %%}"
+    for label, source in (
+        ("render table, raw", table % ("", "")),
+        ("render table, |money per cell", table % ("", "|money")),
+        ("render table, |money_columns", table % ('|money_columns:"cost"', "")),
+    ):
+        template = Template(source)
+        timed(label, template.render, Context({"rows": rows}), repeat=3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Seed large customer/service tables into a throwaway database, then check
+that every hot query is planned on the expected index and time it.
+
+    python -m benchmarks.query_plans --customers 100000 --services 20
+
+The database backend is whatever ``DATABASES["default"]`` is, so pointing
+waste_mgt/local_settings.py at PostgreSQL runs the same checks there. The
+script exits non-zero when a plan misses its index or a query is slower
+than ``--max-ms``, so it can guard index changes in CI.
+"""
+
+import argparse
+import random
+import sys
+import time
+from decimal import Decimal
+
+from benchmarks import setup
+
+
+def seed(customers, services_per_customer, batch_size=5000):
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+
+    from customer.enums import ScheduleChoices
+    from customer.models import Customer, ServiceHistory, compute_next_service_date
+
+    rng = random.Random(0)
+    password = make_password(None)
+    schedules = list(ScheduleChoices.values)
+    today = timezone.now().date()
+    staff = User.objects.create_user(username="bench-staff")
+    for offset in range(0, customers, batch_size):
+        size = min(batch_size, customers - offset)
+        users = User.objects.bulk_create(
+            User(username=f"bench{offset + i}", password=password) for i in range(size)
+        )
+        rows = []
+        for user in users:
+            schedule = rng.choice(schedules)
+            last_service_date = today - timezone.timedelta(days=rng.randint(0, 90))
+            rows.append(
+                Customer(
+                    user=user,
+                    name=user.username,
+                    email=f"{user.username}@mail.com",
+                    schedule=schedule,
+                    last_service_date=last_service_date,
+                    next_service_date=compute_next_service_date(
+                        schedule, last_service_date
+                    ),
+                )
+            )
+        Customer.objects.bulk_create(rows)
+        ServiceHistory.objects.bulk_create(
+            ServiceHistory(
+                customer=customer,
+                created_by=staff,
+                cost=Decimal(rng.randint(1000, 20000)),
+            )
+            for customer in rows
+            for _ in range(services_per_customer)
+        )
+
+
+def hot_queries():
+    from django.utils import timezone
+
+    from customer.models import Customer
+
+    customer = Customer.objects.order_by("?").first()
+    today = timezone.now().date()
+    return [
+        (
+            "last service for a customer",
+            customer.services.order_by("-created")[:1],
+            "service_customer_created_idx",
+        ),
+        (
+            "customers due today",
+            Customer.objects.due_on(today).order_by(),
+            "next_service_date",
+        ),
+        (
+            "schedule listing page",
+            Customer.objects.filter(schedule="weekly").order_by("-created")[:50],
+            "customer_schedule_created_idx",
+        ),
+        (
+            "listing page with service stats",
+            Customer.objects.with_service_stats()
+            .filter(schedule="weekly")
+            .order_by("-created")[:50],
+            "service_customer_created_idx",
+        ),
+    ]
+
+
+def run(max_ms, repeat):
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    failures = 0
+    for label, queryset, index_name in hot_queries():
+        plan = queryset.explain()
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(queryset.all())
+            best = min(best, time.perf_counter() - start)
+        ok = index_name in plan and best * 1000 <= max_ms
+        failures += not ok
+        status = "ok" if ok else "FAIL"
+        print(f"[{status:>4}] {label:<36} {best * 1000:8.2f} ms  ({index_name})")
+        if not ok:
+            print("       " + plan.replace("\n", "\n       "))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--customers", type=int, default=100_000)
+    parser.add_argument("--services", type=int, default=20)
+    parser.add_argument("--max-ms", type=float, default=50.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup()
+    from django.db import connection
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        start = time.perf_counter()
+        seed(args.customers, args.services)
+        print(
+            f"Seeded {args.customers} customers / "
+            f"{args.customers * args.services} services on {connection.vendor} "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+        failures = run(args.max_ms, args.repeat)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Settlement reconciliation throughput and memory.
+
+Seeds payments, writes a settlement report for them (with a few mismatched,
+unrecorded and unsettled references), then reconciles it with the chunked
+hash join and, on a sample, with the row-by-row lookups it replaces:
+
+    python -m benchmarks.reconciliation --payments 200000
+
+Peak memory is the tracemalloc peak of a reconcile() call, measured for the
+full report and for half of it; with a bounded join the two are close.
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from pathlib import Path
+
+from benchmarks import setup
+
+MARCH = (date(2024, 3, 1), date(2024, 3, 31))
+
+
+def seed(payments, batch_size=10_000):
+    from payment.models import Payment, WebhookEvent
+
+    event = WebhookEvent.objects.create(
+        gateway="paystack", event_key="bench", event_type="bench", body="{}"
+    )
+    created = datetime(2024, 3, 15, tzinfo=dt_timezone.utc)
+    for offset in range(0, payments, batch_size):
+        objs = Payment.objects.bulk_create(
+            Payment(
+                gateway="paystack",
+                reference=f"ref-{i}",
+                amount=Decimal(2500),
+                event=event,
+            )
+            for i in range(offset, min(offset + batch_size, payments))
+        )
+        Payment.objects.filter(pk__in=[p.pk for p in objs]).update(created=created)
+
+
+def write_report(path, lines):
+    """Every 100th payment is short, every 250th unsettled, plus extras."""
+    with open(path, "w", newline="") as f:
+        f.write("Reference,Amount,Settled At\n")
+        for i in range(lines):
+            if i % 250 == 0:
+                continue
+            amount = "2499.00" if i % 100 == 0 else "2500.00"
+            f.write(f"ref-{i},{amount},2024-03-31\n")
+        for i in range(lines // 1000):
+            f.write(f"unknown-{i},100.00,2024-03-31\n")
+
+
+def reconcile_file(path, period=MARCH, **kwargs):
+    from payment.reconciliation import reconcile
+
+    with open(path, newline="") as lines:
+        return reconcile("paystack", lines, source=str(path), period=period, **kwargs)
+
+
+def row_by_row(path, sample):
+    """The per-line ORM lookup, for ``sample`` lines of the report."""
+    from payment.enums import ReconciliationStatus
+    from payment.models import Payment, Reconciliation, ReconciliationItem
+    from payment.reconciliation import read_settlement
+
+    reconciliation = Reconciliation.objects.create(gateway="paystack")
+    with open(path, newline="") as lines:
+        for n, (reference, amount) in enumerate(read_settlement(lines, "paystack")):
+            if n == sample:
+                break
+            payment = Payment.objects.filter(
+                gateway="paystack", reference=reference
+            ).first()
+            status = ReconciliationStatus.MISSING_PAYMENT
+            if payment is not None:
+                status = (
+                    ReconciliationStatus.MATCHED
+                    if payment.amount == amount
+                    else ReconciliationStatus.AMOUNT_MISMATCH
+                )
+            ReconciliationItem.objects.create(
+                reconciliation=reconciliation,
+                status=status,
+                reference=reference,
+                settled_amount=amount,
+                payment=payment,
+            )
+
+
+def peak_kb(func, *args, **kwargs):
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--payments", type=int, default=200_000)
+    parser.add_argument("--sample", type=int, default=5_000)
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.db import connection
+
+    # DEBUG keeps every query's SQL, which would dominate the peak.
+    settings.DEBUG = False
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            full = Path(tmpdir) / "full.csv"
+            half = Path(tmpdir) / "half.csv"
+            write_report(full, args.payments)
+            write_report(half, args.payments // 2)
+            start = time.perf_counter()
+            seed(args.payments)
+            print(
+                f"Seeded {args.payments} payments in {time.perf_counter() - start:.1f}s"
+            )
+
+            start = time.perf_counter()
+            reconciliation = reconcile_file(full)
+            elapsed = time.perf_counter() - start
+            print(
+                f"chunked join   {args.payments} lines in {elapsed:6.2f}s  "
+                f"{args.payments / elapsed:9.0f} lines/s  "
+                f"matched={reconciliation.matched} "
+                f"mismatched={reconciliation.amount_mismatches} "
+                f"unrecorded={reconciliation.missing_payments} "
+                f"unsettled={reconciliation.missing_settlements}"
+            )
+
+            start = time.perf_counter()
+            row_by_row(full, args.sample)
+            rate = args.sample / (time.perf_counter() - start)
+            print(
+                f"row by row     {args.sample} lines in "
+                f"{args.sample / rate:6.2f}s  {rate:9.0f} lines/s  "
+                f"({args.payments} lines: {args.payments / rate:.0f}s)"
+            )
+
+            for label, path in (("half report", half), ("full report", full)):
+                # Without a period: the anti-join's pages are bounded too,
+                # but this isolates the streaming side.
+                print(
+                    f"peak memory, {label:<12} {peak_kb(reconcile_file, path, period=None):8} KB"
+                )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
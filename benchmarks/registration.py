@@ -0,0 +1,114 @@
+"""
+Registration validation throughput and per-worker memory for the
+common-password validators.
+
+    python -m benchmarks.registration --registrations 2000
+
+Throughput is RegisterForm.is_valid() per second (password hashing is
+excluded, see benchmarks.login_burst), for valid sign-ups and for
+mismatched passwords, which now stop before the database and validators.
+Memory is measured in a fresh spawned process per validator, the way a new
+worker starts: the RSS and private (unshared) memory it gains by loading the
+validator and checking one password.
+"""
+
+import argparse
+import multiprocessing
+import time
+
+from benchmarks import setup
+
+VALIDATORS = {
+    "django": "django.contrib.auth.password_validation.CommonPasswordValidator",
+    "compiled": "account.password_validation.CompiledCommonPasswordValidator",
+}
+
+
+def memory_kb():
+    """(rss, private) in KB for this process, from /proc/self/smaps_rollup."""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return fields["Rss"], fields["Private_Clean"] + fields["Private_Dirty"]
+
+
+def measure_worker(validator_path, results):
+    setup()
+    from django.utils.module_loading import import_string
+
+    validator_class = import_string(validator_path)
+    rss, private = memory_kb()
+    start = time.perf_counter()
+    validator_class().validate("k2#Jq9!vTz0w")
+    elapsed = time.perf_counter() - start
+    after_rss, after_private = memory_kb()
+    results.put((after_rss - rss, after_private - private, elapsed))
+
+
+def throughput(label, count, mismatch=False, repeat=5):
+    from account.forms import RegisterForm
+
+    def build():
+        return [
+            RegisterForm(
+                {
+                    "full_name": "Bench User",
+                    "email": f"bench{i}@mail.com",
+                    "password1": "k2#Jq9!vTz0w",
+                    "password2": "k2#Jq9!vTz0x" if mismatch else "k2#Jq9!vTz0w",
+                }
+            )
+            for i in range(count)
+        ]
+
+    best = float("inf")
+    for _ in range(repeat):
+        forms = build()
+        start = time.perf_counter()
+        for form in forms:
+            form.is_valid()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<36} {count / best:10.0f} forms/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--registrations", type=int, default=2000)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    for name, path in VALIDATORS.items():
+        results = context.Queue()
+        process = context.Process(target=measure_worker, args=(path, results))
+        process.start()
+        rss, private, elapsed = results.get()
+        process.join()
+        print(
+            f"{name + ' worker':<36} +{rss:6d} KB rss  +{private:6d} KB private  "
+            f"first check {elapsed * 1000:7.2f} ms"
+        )
+
+    setup()
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import override_settings
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        for name, path in VALIDATORS.items():
+            validators = [
+                {"NAME": path} if "CommonPassword" in entry["NAME"] else entry
+                for entry in settings.AUTH_PASSWORD_VALIDATORS
+            ]
+            with override_settings(AUTH_PASSWORD_VALIDATORS=validators):
+                throughput(f"{name}: valid sign-ups", args.registrations)
+                throughput(f"{name}: mismatched passwords", args.registrations, True)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Concurrent-writer benchmark for the SQLite profiles.
+
+Several processes each run short read-then-write transactions, the shape
+of recording a collection, against a fresh database file, once with the
+stock backend and once with core.backends.sqlite3:
+
+    python -m benchmarks.sqlite_writes --processes 8 --transactions 300
+
+For each profile it reports committed transactions per second, failed
+("database is locked") transactions and the latency tail, which is mostly
+time spent waiting for the write lock.
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+ENGINES = {
+    "stock": "django.db.backends.sqlite3",
+    "concurrent": "core.backends.sqlite3",
+}
+
+
+def worker(engine, path, transactions, results):
+    from django.conf import settings
+
+    settings.configure(
+        DATABASES={"default": {"ENGINE": engine, "NAME": path}},
+        INSTALLED_APPS=[],
+        USE_TZ=True,
+    )
+    import django
+
+    django.setup()
+    from django.db import OperationalError, connection, transaction
+
+    latencies, errors = [], 0
+    for _ in range(transactions):
+        start = time.perf_counter()
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute("SELECT COALESCE(MAX(total), 0) FROM ledger")
+                total = cursor.fetchone()[0]
+                cursor.execute(
+                    "INSERT INTO ledger (pid, total) VALUES (%s, %s)",
+                    [os.getpid(), total + 1],
+                )
+        except OperationalError:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+    results.put((latencies, errors))
+
+
+def run(profile, processes, transactions):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = str(Path(tmpdir) / "bench.sqlite3")
+        import sqlite3
+
+        with sqlite3.connect(path) as db:
+            db.execute(
+                "CREATE TABLE ledger (id INTEGER PRIMARY KEY, pid INTEGER, total INTEGER)"
+            )
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        workers = [
+            context.Process(
+                target=worker, args=(ENGINES[profile], path, transactions, results)
+            )
+            for _ in range(processes)
+        ]
+        start = time.perf_counter()
+        for process in workers:
+            process.start()
+        collected = [results.get() for _ in workers]
+        elapsed = time.perf_counter() - start
+        for process in workers:
+            process.join()
+
+    latencies = sorted(latency for result, _ in collected for latency in result)
+    errors = sum(errors for _, errors in collected)
+    committed = len(latencies) - errors
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{profile:<11} {committed / elapsed:9.0f} tx/s  {errors:6d} failed  "
+        f"p50 {quantiles[49] * 1000:7.2f} ms  p99 {quantiles[98] * 1000:7.2f} ms  "
+        f"max {latencies[-1] * 1000:7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--transactions", type=int, default=300)
+    parser.add_argument("--profile", choices=list(ENGINES), action="append")
+    args = parser.parse_args()
+    for profile in args.profile or list(ENGINES):
+        run(profile, args.processes, args.transactions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Per-company query times as another tenant grows.
+
+Seeds a small company, times its hot queries, then grows a second company
+step by step and times the small company's queries again:
+
+    python -m benchmarks.tenant_scaling --small 1000 --big 20000,100000,300000
+
+With the company-leading indexes the small tenant's times stay flat
+however large the big tenant gets. Each row also names the index every
+query was planned on, so a plan that falls back to a scan shows up.
+"""
+
+import argparse
+import random
+import time
+from decimal import Decimal
+
+from benchmarks import setup
+
+
+def create_company(name):
+    from company.models import Company
+
+    return Company.objects.create(
+        name=name,
+        email=f"{name}@mail.com",
+        address="Lagos",
+        phone="0800",
+        description="Waste collection",
+        website=f"https://{name}.com",
+        established_date="2020-01-01",
+    )
+
+
+def seed(company, customers, services_per_customer, staff, batch_size=5000):
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+
+    from customer.enums import ScheduleChoices
+    from customer.models import Customer, ServiceHistory
+
+    rng = random.Random(company.pk)
+    schedules = list(ScheduleChoices.values)
+    now = timezone.now()
+    start = Customer.objects.filter(company=company).count()
+    for offset in range(start, start + customers, batch_size):
+        size = min(batch_size, start + customers - offset)
+        users = User.objects.bulk_create(
+            User(username=f"{company.name}{offset + i}", password="!")
+            for i in range(size)
+        )
+        rows = Customer.objects.bulk_create(
+            Customer(
+                user=user,
+                company=company,
+                name=user.username,
+                email=f"{user.username}@mail.com",
+                schedule=rng.choice(schedules),
+            )
+            for user in users
+        )
+        ServiceHistory.objects.bulk_create(
+            ServiceHistory(
+                customer=customer,
+                company=company,
+                created_by=staff,
+                cost=Decimal(rng.randint(1000, 20000)),
+                created=now - timezone.timedelta(days=rng.randint(0, 365)),
+            )
+            for customer in rows
+            for _ in range(services_per_customer)
+        )
+
+
+def hot_queries(company):
+    from customer.models import Customer, ServiceHistory
+
+    customers = Customer.objects.for_company(company)
+    customer = customers.order_by("pk").first()
+    services = ServiceHistory.objects.for_company(company)
+    return [
+        (
+            "schedule listing",
+            customers.filter(schedule="weekly").order_by("-created")[:50],
+            "customer_company_schedule_idx",
+        ),
+        (
+            "recent customers",
+            customers.order_by("-created")[:50],
+            "customer_company_created_idx",
+        ),
+        (
+            "last service",
+            services.filter(customer=customer).order_by("-created")[:1],
+            "service_company_customer_idx",
+        ),
+        (
+            "recent services",
+            services.order_by("-created")[:50],
+            "service_company_created_idx",
+        ),
+    ]
+
+
+def measure(company, repeat):
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    results = []
+    for label, queryset, index_name in hot_queries(company):
+        planned = index_name in queryset.explain()
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(queryset.all())
+            best = min(best, time.perf_counter() - start)
+        results.append((label, best, planned))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--small", type=int, default=1000)
+    parser.add_argument("--big", default="20000,100000,300000")
+    parser.add_argument("--services", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    from django.contrib.auth.models import User
+    from django.db import connection
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        staff = User.objects.create_user(username="bench-staff")
+        small = create_company("small")
+        big = create_company("big")
+        seed(small, args.small, args.services, staff)
+        steps = [0] + [int(size) for size in args.big.split(",")]
+        print(
+            f"{'big tenant':>12}  "
+            + "  ".join(f"{q[0]:>18}" for q in hot_queries(small))
+        )
+        grown = 0
+        for size in steps:
+            seed(big, size - grown, args.services, staff)
+            grown = size
+            cells = [
+                f"{best * 1000:8.3f} ms {'idx' if planned else 'SCAN':>4}"
+                for _, best, planned in measure(small, args.repeat)
+            ]
+            print(f"{size:>12}  " + "  ".join(f"{cell:>18}" for cell in cells))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
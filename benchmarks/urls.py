@@ -0,0 +1,82 @@
+"""
+URLconf for the benchmarks: the site plus previous sync views, kept as
+baselines (login for benchmarks.login_burst, dashboard and customer update
+for benchmarks.asgi_views). The site itself only has the async versions.
+"""
+
+from braces.views import LoginRequiredMixin
+from django.contrib.auth import authenticate, login
+from django.core.cache import cache as django_cache
+from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.urls import include, path
+from django.utils import timezone
+from django.views.generic import TemplateView, UpdateView
+
+from core import cache, metrics
+from core.db_routers import use_replica
+from core.mixins import ReplicaReadMixin
+from customer.forms import CreateCustomerForm
+from customer.models import Customer
+
+
+def get_dashboard_metrics():
+    """Sync core.metrics.aget_dashboard_metrics."""
+    today = timezone.now().date()
+    key = metrics._dashboard_key(today)
+    result = django_cache.get(key)
+    if result is None:
+        periods, due = metrics._dashboard_querysets(today)
+        with use_replica(False):
+            result = {
+                name: metrics._totals(queryset.aggregate(**metrics.TOTALS))
+                for name, queryset in periods.items()
+            }
+            result["due_today"] = due.count()
+        django_cache.set(key, result, metrics.DASHBOARD_CACHE_TIMEOUT)
+    return result
+
+
+def sync_login(request):
+    user = authenticate(
+        username=request.POST.get("username", ""),
+        password=request.POST.get("password", ""),
+    )
+    if user is None:
+        return HttpResponse(status=200)
+    login(request, user)
+    return HttpResponseRedirect("/")
+
+
+class SyncDashboardView(LoginRequiredMixin, ReplicaReadMixin, TemplateView):
+    template_name = "core/dashboard.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["title"] = "Dashboard"
+        context["metrics"] = get_dashboard_metrics()
+        return context
+
+
+class SyncUpdateCustomerView(LoginRequiredMixin, UpdateView):
+    model = Customer
+    template_name = "customer/update.html"
+    form_class = CreateCustomerForm
+
+    def get_object(self, queryset=None):
+        customer = cache.get_object(Customer, self.kwargs["pk"])
+        if customer is None:
+            raise Http404("No customer found matching the query")
+        return customer
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["title"] = "Update Customer Information"
+        return context
+
+
+urlpatterns = [
+    path("sync-login", sync_login),
+    path("sync-dashboard", SyncDashboardView.as_view()),
+    path("sync-customer/<int:pk>", SyncUpdateCustomerView.as_view()),
+    path("", include("waste_mgt.urls")),
+]
@@ -1,9 +1,12 @@
 from django import forms
 
+from account.forms import IdentityEmailMixin
 from company.models import Company
 
 
-class CompanyCreateForm(forms.ModelForm):
+class CompanyCreateForm(IdentityEmailMixin, forms.ModelForm):
+    identity_owner = "company"
+
     class Meta:
         model = Company
         fields = [
@@ -3,6 +3,12 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
+from tenant.managers import TenantManager
+
+
+class CompanyManager(TenantManager):
+    tenant_field = "pk"
+
 
 class Company(models.Model):
     name = models.CharField(max_length=155)
@@ -13,6 +19,8 @@ class Company(models.Model):
     website = models.URLField()
     established_date = models.DateField()
 
+    objects = CompanyManager()
+
     def clean(self):
         super().clean()
         value = self.established_date
@@ -1,16 +1,18 @@
+from django.http import Http404
 from django.shortcuts import render
-from braces.views import LoginRequiredMixin as BracesLoginRequiredMixin
 from django.urls import reverse_lazy
 from django.views.generic.edit import UpdateView, CreateView
 from django.contrib import messages
 
 from company.forms import CompanyCreateForm
 from company.models import Company
+from core import cache
+from core.mixins import AsyncLoginRequiredMixin, AsyncModelFormMixin
 
 # Create your views here.
 
 
-class CreateCompanyView(BracesLoginRequiredMixin, CreateView):
+class CreateCompanyView(AsyncLoginRequiredMixin, AsyncModelFormMixin, CreateView):
     model = Company
     form_class = CompanyCreateForm
     template_name = "company/create_company.html"
@@ -27,18 +29,29 @@ class CreateCompanyView(BracesLoginRequiredMixin, CreateView):
         return context
 
 
-class UpdateCompanyView(BracesLoginRequiredMixin, UpdateView):
+class UpdateCompanyView(AsyncLoginRequiredMixin, AsyncModelFormMixin, UpdateView):
     model = Company
     form_class = CompanyCreateForm
     template_name = "company/update_company.html"
     success_url = reverse_lazy("core:dashboard")
 
+    async def aget_object(self):
+        pk = self.kwargs["pk"]
+        # Writes always read the row from the database.
+        if self.request.method == "GET":
+            company = await cache.aget_object(Company, pk)
+        else:
+            company = await self.get_queryset().filter(pk=pk).afirst()
+        if company is None:
+            raise Http404("No company found matching the query")
+        return company
+
     def get_success_url(self):
-        obj = self.get_object()
+        obj = self.object
         messages.success(self.request, f"{obj.name} has been updated successfully")
         return self.success_url
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["title"] = f"Update {self.get_object().name}"
+        context["title"] = f"Update {self.object.name}"
         return context
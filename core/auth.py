@@ -0,0 +1,118 @@
+"""
+Async counterparts of session loading and of ``django.contrib.auth``'s
+``authenticate`` and ``get_user``, which Django 4.2 only provides in sync
+form. Async views call ``aget_user`` first, so the session and user are
+fetched through the async cache (and the async ORM on a miss) instead of
+lazily, synchronously, the first time the view or template touches
+``request.user``.
+"""
+
+import inspect
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import (
+    BACKEND_SESSION_KEY,
+    HASH_SESSION_KEY,
+    SESSION_KEY,
+    get_user,
+    get_user_model,
+    load_backend,
+)
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.auth.signals import user_login_failed
+from django.contrib.sessions.backends import cached_db
+from django.core.exceptions import PermissionDenied
+from django.utils.crypto import constant_time_compare
+
+# The credentials django.contrib.auth masks in user_login_failed.
+SENSITIVE_CREDENTIALS = re.compile("api|token|key|secret|password|signature", re.I)
+CLEANSED_SUBSTITUTE = "********************"
+
+
+async def aauthenticate(request=None, **credentials):
+    """
+    ``authenticate()`` for async callers: try each configured backend in
+    turn, awaiting its ``aauthenticate`` when it has one, and send
+    ``user_login_failed`` when none accepts the credentials.
+    """
+    for backend_path in settings.AUTHENTICATION_BACKENDS:
+        backend = load_backend(backend_path)
+        try:
+            inspect.signature(backend.authenticate).bind(request, **credentials)
+        except TypeError:
+            # This backend does not accept these credentials.
+            continue
+        try:
+            if hasattr(backend, "aauthenticate"):
+                user = await backend.aauthenticate(request, **credentials)
+            else:
+                user = await sync_to_async(backend.authenticate)(request, **credentials)
+        except PermissionDenied:
+            # This backend says to stop in our tracks.
+            break
+        if user is None:
+            continue
+        user.backend = backend_path
+        return user
+    cleaned = {
+        key: CLEANSED_SUBSTITUTE if SENSITIVE_CREDENTIALS.search(key) else value
+        for key, value in credentials.items()
+    }
+    await sync_to_async(user_login_failed.send)(
+        sender=__name__, credentials=cleaned, request=request
+    )
+    return None
+
+
+async def aload_session(session):
+    """
+    Load ``session``'s data now. The cached_db engine (SESSION_ENGINE) is read
+    through the async cache, which relies on its internals; other engines
+    load on a thread through the public mapping API.
+    """
+    if not isinstance(session, cached_db.SessionStore):
+        await sync_to_async(session.keys)()
+        return
+    if hasattr(session, "_session_cache"):
+        return
+    if session.session_key is None:
+        # A new session: no I/O to do.
+        session._get_session()
+        return
+    data = None
+    cache = getattr(session, "_cache", None)
+    if cache is not None:
+        data = await cache.aget(session.cache_key)
+    if data is None:
+        await sync_to_async(session._get_session)()
+    else:
+        session._session_cache = data
+        session.accessed = True
+
+
+async def aget_user(request):
+    """The user the request's session belongs to, or AnonymousUser."""
+    await aload_session(request.session)
+    try:
+        user_id = get_user_model()._meta.pk.to_python(request.session[SESSION_KEY])
+        backend_path = request.session[BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return AnonymousUser()
+    backend = load_backend(backend_path)
+    if hasattr(backend, "aget_user"):
+        user = await backend.aget_user(user_id)
+    else:
+        user = await sync_to_async(backend.get_user)(user_id)
+    if user is None:
+        return AnonymousUser()
+    session_hash = request.session.get(HASH_SESSION_KEY)
+    if session_hash and constant_time_compare(
+        session_hash, user.get_session_auth_hash()
+    ):
+        return user
+    # Fallback secrets, key rotation or a flush: rare, let Django do it.
+    return await sync_to_async(get_user)(request)
@@ -0,0 +1,43 @@
+"""
+SQLite backend tuned for concurrent writers.
+
+Use it with ``SQLITE_PROFILE=concurrent`` (see settings). On top of the
+stock backend it:
+
+- applies the pragmas in SQLITE_PRAGMAS to every new connection: WAL so
+  readers never block the writer, a busy timeout so writers queue instead
+  of failing, synchronous=NORMAL (safe with WAL), and larger mmap and page
+  caches;
+- starts every transaction with BEGIN IMMEDIATE. A deferred BEGIN only
+  takes the write lock on its first write, and if another connection got
+  there first SQLite cannot wait for it (both would hold a read snapshot),
+  so it fails at once with "database is locked" regardless of the busy
+  timeout. Taking the lock up front turns that into an ordinary wait.
+"""
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.backends.sqlite3 import base
+from django.dispatch import receiver
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "busy_timeout": 5000,
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute("BEGIN IMMEDIATE")
+
+
+@receiver(connection_created, sender=DatabaseWrapper)
+def apply_pragmas(sender, connection, **kwargs):
+    pragmas = {**DEFAULT_PRAGMAS, **getattr(settings, "SQLITE_PRAGMAS", {})}
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
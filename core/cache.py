@@ -0,0 +1,135 @@
+"""
+Versioned per-object caching.
+
+Every cached value for an object lives under a key that includes the
+object's current version, e.g. ``customer.customer:12:v1718000000000000:object``.
+Writes never delete cached values: the post_save/post_delete receivers in
+core.signals bump the version instead, so every older key simply stops
+being read and ages out on its own. Version counters start from the
+current time in microseconds rather than 1, so a version key that has been
+evicted cannot come back at a value whose data is still cached.
+
+Writes that bypass model signals (queryset.update, bulk_update) must call
+``bump`` themselves.
+
+Values are also keyed on the current tenant (tenant.context), since the
+tenant-scoped managers give each tenant, and callers with no tenant, a
+different view of the same pk; get_object re-checks a cached row against
+the tenant before returning it. The version is per object, so a write
+under any tenant invalidates every tenant's copy.
+
+The ``a``-prefixed functions are the reads for async views, through
+Django's async cache API and async ORM.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from tenant.context import get_current_tenant
+from tenant.managers import TenantManager
+
+OBJECT_CACHE_TIMEOUT = 60 * 60
+
+
+def _version_key(model, pk):
+    return f"v:{model._meta.label_lower}:{pk}"
+
+
+def _tenant_id():
+    tenant = get_current_tenant()
+    return "-" if tenant is None else tenant.pk
+
+
+def _owned(model, obj):
+    manager = model._default_manager
+    return not isinstance(manager, TenantManager) or manager.owns(obj)
+
+
+def get_version(model, pk):
+    key = _version_key(model, pk)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns() // 1_000, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump(model, pk):
+    """Invalidate everything cached for this object."""
+
+    def _bump():
+        key = _version_key(model, pk)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns() // 1_000, timeout=None)
+
+    # Once now, and once the write is visible to other connections, so a
+    # reader racing the transaction cannot cache the old row under the new
+    # version.
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def object_key(model, pk, name):
+    version = get_version(model, pk)
+    return f"{model._meta.label_lower}:{pk}:t{_tenant_id()}:v{version}:{name}"
+
+
+def get_or_set(model, pk, name, compute, timeout=OBJECT_CACHE_TIMEOUT):
+    """Cached ``compute()`` for a value derived from one object."""
+    key = object_key(model, pk, name)
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        if value is not None:
+            cache.set(key, value, timeout)
+    return value
+
+
+def get_object(model, pk, queryset=None):
+    """Cached ``queryset.get(pk=pk)``; None when the object does not exist."""
+    queryset = model._default_manager.all() if queryset is None else queryset
+
+    def compute():
+        return queryset.filter(pk=pk).first()
+
+    obj = get_or_set(model, pk, "object", compute)
+    return obj if obj is not None and _owned(model, obj) else None
+
+
+async def aget_version(model, pk):
+    key = _version_key(model, pk)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns() // 1_000, timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+async def aobject_key(model, pk, name):
+    version = await aget_version(model, pk)
+    return f"{model._meta.label_lower}:{pk}:t{_tenant_id()}:v{version}:{name}"
+
+
+async def aget_or_set(model, pk, name, acompute, timeout=OBJECT_CACHE_TIMEOUT):
+    """get_or_set() for async callers; ``acompute`` is a coroutine function."""
+    key = await aobject_key(model, pk, name)
+    value = await cache.aget(key)
+    if value is None:
+        value = await acompute()
+        if value is not None:
+            await cache.aset(key, value, timeout)
+    return value
+
+
+async def aget_object(model, pk, queryset=None):
+    queryset = model._default_manager.all() if queryset is None else queryset
+
+    async def acompute():
+        return await queryset.filter(pk=pk).afirst()
+
+    obj = await aget_or_set(model, pk, "object", acompute)
+    return obj if obj is not None and _owned(model, obj) else None
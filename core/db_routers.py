@@ -0,0 +1,48 @@
+"""
+Read-replica routing.
+
+Reads go to the primary unless code opts in with ``use_replica()`` (or the
+ReplicaReadMixin view mixin, which wraps it). Writes always go to the
+primary. When no "replica" database is configured everything resolves to
+"default", so opting in is always safe.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY = "default"
+REPLICA = "replica"
+
+_read_alias = ContextVar("read_alias", default=None)
+
+
+def replica_alias():
+    return REPLICA if REPLICA in settings.DATABASES else PRIMARY
+
+
+@contextmanager
+def use_replica(enabled=True):
+    token = _read_alias.set(replica_alias() if enabled else PRIMARY)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {PRIMARY, REPLICA}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary; only the primary is migrated.
+        return db == PRIMARY
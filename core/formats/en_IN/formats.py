@@ -0,0 +1,5 @@
+# Indian English: Django ships no en_IN formats, so en would group lakhs
+# and crores in threes.
+DECIMAL_SEPARATOR = "."
+THOUSAND_SEPARATOR = ","
+NUMBER_GROUPING = (3, 2, 0)
@@ -0,0 +1,26 @@
+"""
+rq job helpers.
+"""
+
+from rq.exceptions import NoSuchJobError
+from rq.job import Job, JobStatus
+
+RETRY_STATUSES = (JobStatus.FAILED, JobStatus.STOPPED, JobStatus.CANCELED)
+
+
+def enqueue_once(queue, func, *args, job_id):
+    """
+    Enqueue ``func(*args)`` as ``job_id`` unless that job is already queued,
+    running or done. A failed, stopped or canceled job is replaced: it still
+    exists (in the failed registry), but it will never run again on its own.
+    """
+    try:
+        job = Job.fetch(job_id, connection=queue.connection)
+    except NoSuchJobError:
+        job = None
+    if job is not None and job.get_status() in RETRY_STATUSES:
+        job.delete()
+        job = None
+    if job is None:
+        job = queue.enqueue(func, *args, job_id=job_id)
+    return job
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core import metrics
+
+
+class Command(BaseCommand):
+    help = "Rebuild the dashboard DailyMetric rows from service and customer data"
+
+    def handle(self, *args, **options):
+        days = metrics.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt metrics for {days} days"))
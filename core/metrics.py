@@ -0,0 +1,146 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.db_routers import use_replica
+from core.models import DailyMetric
+from tenant.context import get_current_tenant
+
+# Per tenant: each company's dashboard shows its own counters, and "-" (no
+# tenant) the totals over all of them.
+DASHBOARD_CACHE_KEY = "dashboard:metrics:{tenant}:{date}"
+DASHBOARD_CACHE_TIMEOUT = 300
+
+
+def record(date, schedule, company_id, collections=0, revenue=0, new_customers=0):
+    """
+    Add the given deltas to the counters for ``company_id``, ``date`` and
+    ``schedule``.
+    """
+    # Unscoped, since the row's company need not be the current tenant.
+    metrics = DailyMetric._base_manager
+    metrics.get_or_create(company_id=company_id, date=date, schedule=schedule)
+    metrics.filter(company_id=company_id, date=date, schedule=schedule).update(
+        collections=F("collections") + collections,
+        revenue=F("revenue") + revenue,
+        new_customers=F("new_customers") + new_customers,
+    )
+    # Drop the cached metrics now, and again once the write is visible to
+    # other connections, so a concurrent reader cannot re-cache stale data.
+    invalidate([company_id])
+    transaction.on_commit(lambda: invalidate([company_id]))
+
+
+def invalidate(company_ids):
+    """Drop today's cached dashboards for these companies and the total."""
+    today = timezone.now().date()
+    cache.delete_many(
+        [
+            DASHBOARD_CACHE_KEY.format(tenant=tenant, date=today)
+            for tenant in {"-", *(pk for pk in company_ids if pk is not None)}
+        ]
+    )
+
+
+def _dashboard_key(today):
+    tenant = get_current_tenant()
+    return DASHBOARD_CACHE_KEY.format(
+        tenant="-" if tenant is None else tenant.pk, date=today
+    )
+
+
+def _dashboard_querysets(today):
+    from customer.models import Customer
+
+    return {
+        "today": DailyMetric.objects.filter(date=today),
+        "month": DailyMetric.objects.filter(
+            date__gte=today.replace(day=1), date__lte=today
+        ),
+        "all_time": DailyMetric.objects.all(),
+    }, Customer.objects.due_on(today)
+
+
+TOTALS = {
+    "collections": Sum("collections"),
+    "revenue": Sum("revenue"),
+    "new_customers": Sum("new_customers"),
+}
+
+
+def _totals(result):
+    return {
+        "collections": result["collections"] or 0,
+        "revenue": result["revenue"] or Decimal(0),
+        "new_customers": result["new_customers"] or 0,
+    }
+
+
+async def aget_dashboard_metrics():
+    today = timezone.now().date()
+    key = _dashboard_key(today)
+    metrics = await cache.aget(key)
+    if metrics is None:
+        # Always from the primary: the result is shared through the cache,
+        # and a lagging replica would re-cache totals that record() has just
+        # invalidated. The rows are precomputed, so the read is cheap.
+        with use_replica(False):
+            metrics = await acompute_dashboard_metrics(today)
+        await cache.aset(key, metrics, DASHBOARD_CACHE_TIMEOUT)
+    return metrics
+
+
+async def acompute_dashboard_metrics(today):
+    periods, due = _dashboard_querysets(today)
+    metrics = {
+        name: _totals(await queryset.aaggregate(**TOTALS))
+        for name, queryset in periods.items()
+    }
+    metrics["due_today"] = await due.acount()
+    return metrics
+
+
+@transaction.atomic
+def rebuild():
+    """Recompute every DailyMetric row from ServiceHistory and Customer."""
+    from company.models import Company
+    from customer.models import Customer, ServiceHistory
+
+    rows = {}
+    services = (
+        ServiceHistory.objects.annotate(
+            date=TruncDate("created"), schedule=F("customer__schedule")
+        )
+        .order_by()
+        .values("company", "date", "schedule")
+        .annotate(collections=Count("pk"), revenue=Sum("cost"))
+    )
+    for row in services:
+        rows[row["company"], row["date"], row["schedule"]] = DailyMetric(
+            company_id=row["company"],
+            date=row["date"],
+            schedule=row["schedule"],
+            collections=row["collections"],
+            revenue=row["revenue"],
+        )
+    customers = (
+        Customer.objects.annotate(date=TruncDate("created"))
+        .order_by()
+        .values("company", "date", "schedule")
+        .annotate(new_customers=Count("pk"))
+    )
+    for row in customers:
+        key = row["company"], row["date"], row["schedule"]
+        metric = rows.setdefault(
+            key, DailyMetric(company_id=key[0], date=key[1], schedule=key[2])
+        )
+        metric.new_customers = row["new_customers"]
+    DailyMetric.objects.all().delete()
+    DailyMetric.objects.bulk_create(rows.values(), batch_size=1000)
+    company_ids = list(Company._base_manager.values_list("pk", flat=True))
+    transaction.on_commit(lambda: invalidate(company_ids))
+    return len({date for _, date, _ in rows})
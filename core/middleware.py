@@ -0,0 +1,81 @@
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from core.auth import aload_session
+
+PIN_SESSION_KEY = "_db_pinned_until"
+
+
+def is_pinned_to_primary(request):
+    session = getattr(request, "session", None)
+    return session is not None and session.get(PIN_SESSION_KEY, 0) > time.time()
+
+
+def primary_pin_exempt(view_func):
+    """Mark a view whose writes never pin the session, e.g. a webhook."""
+
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        return view_func(*args, **kwargs)
+
+    wrapper.primary_pin_exempt = True
+    return wrapper
+
+
+class PrimaryPinningMiddleware:
+    """
+    After a write request, pin the session's reads to the primary for
+    REPLICA_PIN_SECONDS so users read their own writes despite replica lag.
+
+    Only sessions that already exist (which includes every signed-in user's)
+    are pinned, so an anonymous form post or a webhook delivery does not
+    create a session row and cookie.
+    """
+
+    unsafe_methods = {"POST", "PUT", "PATCH", "DELETE"}
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.writes(request):
+            user = getattr(request, "user", None)
+            if (user is not None and user.is_authenticated) or (
+                request.session.session_key is not None
+            ):
+                self.pin(request.session)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.writes(request):
+            # Loading drops a key that no longer exists; a signed-in user
+            # always has one, so the user need not be loaded as well.
+            await aload_session(request.session)
+            if request.session.session_key is not None:
+                self.pin(request.session)
+        return response
+
+    def writes(self, request):
+        match = request.resolver_match
+        return (
+            request.method in self.unsafe_methods
+            and hasattr(request, "session")
+            and not getattr(match and match.func, "primary_pin_exempt", False)
+        )
+
+    def pin(self, session):
+        session[PIN_SESSION_KEY] = time.time() + getattr(
+            settings, "REPLICA_PIN_SECONDS", 5
+        )
@@ -0,0 +1,82 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.utils.functional import SimpleLazyObject
+
+from core.auth import aget_user
+from core.db_routers import replica_alias, use_replica
+from core.middleware import is_pinned_to_primary
+
+
+def _render(response):
+    if hasattr(response, "render") and not response.is_rendered:
+        response.render()
+    return response
+
+
+class ReplicaReadMixin:
+    """
+    Serve a read-heavy view from the replica, unless the session wrote
+    recently. The response is rendered inside the replica block so lazy
+    querysets in templates are routed too. Streaming views should bind
+    their querysets with ``.using(self.read_db)``, since their content is
+    produced after dispatch returns.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self._adispatch(request, *args, **kwargs)
+        pinned = is_pinned_to_primary(request)
+        self.read_db = "default" if pinned else replica_alias()
+        with use_replica(not pinned):
+            return _render(super().dispatch(request, *args, **kwargs))
+
+    async def _adispatch(self, request, *args, **kwargs):
+        pinned = is_pinned_to_primary(request)
+        self.read_db = "default" if pinned else replica_alias()
+        with use_replica(not pinned):
+            return _render(await super().dispatch(request, *args, **kwargs))
+
+
+class AsyncLoginRequiredMixin:
+    """
+    LoginRequiredMixin for views whose handlers are all async.
+
+    The session and user are loaded through core.auth before the handler
+    runs, so nothing later touches them synchronously, and template
+    responses are rendered here rather than by Django's handler, which
+    renders them on a worker thread.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        # Replace AuthenticationMiddleware's lazy user; keep one that was
+        # set explicitly.
+        if isinstance(getattr(request, "user", None), (SimpleLazyObject, type(None))):
+            request.user = await aget_user(request)
+        if not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return _render(await super().dispatch(request, *args, **kwargs))
+
+
+class AsyncModelFormMixin:
+    """
+    Async get/post for CreateView and UpdateView. The object is fetched in
+    the event loop by ``aget_object``; validating and saving the form run
+    sync Django code (unique checks, save signals) and go to a thread.
+    """
+
+    async def aget_object(self):
+        return None
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return self.render_to_response(self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        form = self.get_form()
+        if await sync_to_async(form.is_valid)():
+            return await sync_to_async(self.form_valid)(form)
+        return self.form_invalid(form)
+
+    async def put(self, request, *args, **kwargs):
+        return await self.post(request, *args, **kwargs)
@@ -1,3 +1,45 @@
 from django.db import models
 
-# Create your models here.
+from customer.enums import ScheduleChoices
+from tenant.managers import TenantManager
+
+
+class DailyMetric(models.Model):
+    """
+    Per-company, per-day and per-schedule counters for the dashboard and the
+    revenue reports, maintained incrementally as services and customers are
+    recorded (see core.metrics).
+    """
+
+    company = models.ForeignKey(
+        "company.Company",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+    date = models.DateField()
+    schedule = models.CharField(max_length=255, choices=ScheduleChoices.choices)
+    collections = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    new_customers = models.IntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = TenantManager()
+
+    def __str__(self):
+        return f"{self.date} - {self.schedule} - {self.collections} - {self.revenue}"
+
+    class Meta:
+        ordering = ["-date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["company", "date", "schedule"], name="unique_daily_metric"
+            ),
+            # NULLs are distinct in the constraint above.
+            models.UniqueConstraint(
+                fields=["date", "schedule"],
+                condition=models.Q(company__isnull=True),
+                name="unique_daily_metric_no_company",
+            ),
+        ]
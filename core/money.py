@@ -0,0 +1,120 @@
+"""
+Money formatting for report tables.
+
+``format_column`` formats a whole column at once: every value goes through
+one C-level ``format(value, ",.2f")`` for grouping and rounding, and the
+column is then re-punctuated for the locale with a single ``str.translate``
+over the joined text, so there is no per-value regex or string reversal.
+``format_money`` is the one-value form used by the ``money`` template
+filter.
+
+Separators and grouping are Django's THOUSAND_SEPARATOR, DECIMAL_SEPARATOR
+and NUMBER_GROUPING for the language, so project format modules
+(FORMAT_MODULE_PATH, e.g. core.formats.en_IN) apply here too.
+"""
+
+from collections import namedtuple
+from decimal import ROUND_HALF_UP, localcontext
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils import formats, translation
+
+# group: thousands separator; secondary: size of the groups above the first
+# three digits when it is not three (Indian lakh/crore grouping).
+Format = namedtuple("Format", ["group", "decimal", "secondary", "symbol_first"])
+
+# Languages that write the currency symbol after the amount; Django's
+# formats have no currency conventions.
+SYMBOL_AFTER = {"de", "es", "fr", "it", "pl", "ru", "sv"}
+
+CURRENCY_SYMBOLS = {
+    "EUR": "€",
+    "GBP": "£",
+    "GHS": "GH₵",
+    "INR": "₹",
+    "KES": "KSh",
+    "NGN": "₦",
+    "USD": "$",
+    "ZAR": "R",
+}
+
+# Joins a column for the translate pass; never produced by format().
+_SEPARATOR = "\n"
+
+
+def get_format(locale=None):
+    locale = (locale or translation.get_language() or settings.LANGUAGE_CODE).lower()
+    grouping = formats.get_format("NUMBER_GROUPING", lang=locale, use_l10n=True)
+    secondary = None
+    # A sequence such as (3, 2, 0): three digits, then groups of two.
+    if not isinstance(grouping, int) and len(grouping) > 1 and grouping[1] != 3:
+        secondary = grouping[1] or None
+    return Format(
+        formats.get_format("THOUSAND_SEPARATOR", lang=locale, use_l10n=True),
+        formats.get_format("DECIMAL_SEPARATOR", lang=locale, use_l10n=True),
+        secondary,
+        locale.split("-")[0] not in SYMBOL_AFTER,
+    )
+
+
+@lru_cache
+def _column_format(fmt, currency, places):
+    """(number spec, translate table or None, prefix, suffix)."""
+    table = None
+    if (fmt.group, fmt.decimal) != (",", "."):
+        table = str.maketrans({",": fmt.group, ".": fmt.decimal})
+    symbol = CURRENCY_SYMBOLS.get(currency, currency)
+    if not fmt.symbol_first:
+        return f",.{places}f", table, "", f"\u00a0{symbol}"
+    # ISO codes need a space: "₦1,000.00" but "XOF 1,000.00".
+    prefix = symbol if currency in CURRENCY_SYMBOLS else f"{symbol}\u00a0"
+    return f",.{places}f", table, prefix, ""
+
+
+def _regroup(text, size):
+    """Re-group "1,234,567.89" into groups of ``size`` above the first three."""
+    sign = "-" if text.startswith("-") else ""
+    whole, dot, fraction = text.lstrip("-").partition(".")
+    digits = whole.replace(",", "")
+    head, tail = digits[:-3], digits[-3:]
+    groups = []
+    while head:
+        groups.append(head[-size:])
+        head = head[:-size]
+    groups.reverse()
+    groups.append(tail)
+    return f"{sign}{','.join(groups)}{dot}{fraction}"
+
+
+def format_column(values, currency=None, locale=None, places=2):
+    """
+    Format ``values`` (Decimals, ints or floats) as money; None becomes "".
+    Decimals are rounded half up to ``places``.
+    """
+    fmt = get_format(locale)
+    spec, table, prefix, suffix = _column_format(
+        fmt, currency or settings.DEFAULT_CURRENCY, places
+    )
+    with localcontext() as ctx:
+        ctx.rounding = ROUND_HALF_UP
+        texts = [format(v, spec) if v is not None else "" for v in values]
+    # A value that rounds to zero keeps its sign ("-0.00"); drop it.
+    texts = [
+        text[1:] if text[:1] == "-" and not text.strip("-0,.") else text
+        for text in texts
+    ]
+    if fmt.secondary:
+        texts = [_regroup(text, fmt.secondary) if text else text for text in texts]
+    if table:
+        texts = _SEPARATOR.join(texts).translate(table).split(_SEPARATOR)
+    if suffix:
+        return [f"{text}{suffix}" if text else "" for text in texts]
+    return [
+        f"-{prefix}{text[1:]}" if text[:1] == "-" else f"{prefix}{text}" if text else ""
+        for text in texts
+    ]
+
+
+def format_money(value, currency=None, locale=None, places=2):
+    return format_column([value], currency, locale, places)[0]
@@ -0,0 +1,141 @@
+from collections import Counter, defaultdict
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from account import identity
+from company.models import Company
+from core import cache, metrics
+from customer.models import Customer, ServiceHistory
+from customer.signals import customers_created, services_recorded
+from tenant.models import Domain
+from tenant.resolver import tenants
+
+
+@receiver(post_save, sender=ServiceHistory)
+def record_service(sender, instance, created, **kwargs):
+    if created:
+        metrics.record(
+            instance.created.date(),
+            instance.customer.schedule,
+            instance.company_id,
+            collections=1,
+            revenue=instance.cost,
+        )
+
+
+@receiver(post_delete, sender=ServiceHistory)
+def remove_service(sender, instance, **kwargs):
+    metrics.record(
+        instance.created.date(),
+        instance.customer.schedule,
+        instance.company_id,
+        collections=-1,
+        revenue=-instance.cost,
+    )
+
+
+# A receiver rather than ServiceHistory.delete(), so queryset deletes and
+# cascades refresh the dates too.
+@receiver(post_delete, sender=ServiceHistory)
+def refresh_service_dates(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Customer) and origin.pk == instance.customer_id:
+        # The customer is being deleted along with its history.
+        return
+    instance.customer.refresh_service_dates()
+
+
+@receiver(post_save, sender=Customer)
+def record_customer(sender, instance, created, **kwargs):
+    if created:
+        metrics.record(
+            instance.created.date(),
+            instance.schedule,
+            instance.company_id,
+            new_customers=1,
+        )
+
+
+@receiver(customers_created)
+def record_customers(sender, customers, **kwargs):
+    counts = Counter(
+        (customer.created.date(), customer.schedule, customer.company_id)
+        for customer in customers
+    )
+    for (date, schedule, company_id), count in counts.items():
+        metrics.record(date, schedule, company_id, new_customers=count)
+
+
+@receiver(services_recorded)
+def record_services(sender, services, **kwargs):
+    totals = defaultdict(lambda: [0, 0])
+    for service in services:
+        day = totals[
+            service.created.date(), service.customer.schedule, service.company_id
+        ]
+        day[0] += 1
+        day[1] += service.cost
+    for (date, schedule, company_id), (collections, revenue) in totals.items():
+        metrics.record(
+            date, schedule, company_id, collections=collections, revenue=revenue
+        )
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_object(sender, instance, **kwargs):
+    cache.bump(sender, instance.pk)
+
+
+# The cached auth user depends on the customer's company; see
+# account.backends.TenantModelBackend.
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+def invalidate_customer_user(sender, instance, **kwargs):
+    cache.bump(User, instance.user_id)
+
+
+# Single services bump their customer in Customer.record_service_date and
+# refresh_service_dates, once the customer's row has been updated.
+@receiver(services_recorded)
+def invalidate_service_customers(sender, services, **kwargs):
+    for customer_id in {service.customer_id for service in services}:
+        cache.bump(Customer, customer_id)
+
+
+IDENTITY_OWNERS = {User: "user", Customer: "customer", Company: "company"}
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Customer)
+@receiver(post_save, sender=Company)
+def claim_identity(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and "email" not in update_fields:
+        return
+    identity.claim(IDENTITY_OWNERS[sender], instance.pk, instance.email)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Customer)
+@receiver(post_delete, sender=Company)
+def release_identity(sender, instance, **kwargs):
+    identity.release(instance.email)
+
+
+@receiver(customers_created)
+def claim_customer_identities(sender, customers, **kwargs):
+    identity.claim_new("user", [(c.user_id, c.user.email) for c in customers])
+    identity.claim_new("customer", [(c.pk, c.email) for c in customers])
+
+
+@receiver(post_save, sender=Domain)
+@receiver(post_delete, sender=Domain)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_tenants(sender, **kwargs):
+    tenants.invalidate()
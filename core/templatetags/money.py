@@ -0,0 +1,29 @@
+from django import template
+
+from core.money import format_column, format_money
+
+register = template.Library()
+
+
+@register.filter
+def money(value, currency=None):
+    """{{ payment.amount|money:payment.currency }}"""
+    if value in (None, ""):
+        return ""
+    return format_money(value, currency)
+
+
+@register.filter
+def money_columns(rows, columns):
+    """
+    {% for row in rows|money_columns:"revenue,cost" %}: copies of the
+    mapping ``rows`` (e.g. a values() queryset) with the named columns
+    formatted as money, one batch per column.
+    """
+    rows = [dict(row) for row in rows]
+    for column in columns.split(","):
+        column = column.strip()
+        formatted = format_column([row[column] for row in rows])
+        for row, text in zip(rows, formatted):
+            row[column] = text
+    return rows
@@ -0,0 +1,97 @@
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_login_failed
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+
+from core.auth import aauthenticate, aget_user
+
+
+# The settings used with a shared cache (CACHE_URL).
+@override_settings(
+    SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+    AUTHENTICATION_BACKENDS=["account.backends.CachedModelBackend"],
+)
+class AsyncGetUserTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="pass")
+        self.client.force_login(self.user)
+
+    def get_user(self, session=None):
+        request = RequestFactory().get("/")
+        request.session = session or self.client.session
+        return async_to_sync(aget_user)(request), request
+
+    def test_user_from_session(self):
+        user, _ = self.get_user()
+        self.assertEqual(user, self.user)
+
+    def test_other_session_engine(self):
+        session = SessionStore(self.client.session.session_key)
+        user, _ = self.get_user(session)
+        self.assertEqual(user, self.user)
+
+    def test_cached_session_and_user(self):
+        self.get_user()
+        with self.assertNumQueries(0):
+            user, _ = self.get_user()
+        self.assertEqual(user, self.user)
+
+    def test_session_without_user(self):
+        self.client.logout()
+        user, _ = self.get_user()
+        self.assertFalse(user.is_authenticated)
+
+    def test_password_change_ends_session(self):
+        self.user.set_password("changed")
+        self.user.save()
+        user, request = self.get_user()
+        self.assertFalse(user.is_authenticated)
+        self.assertIsNone(request.session.session_key)
+
+    def test_inactive_user(self):
+        self.user.is_active = False
+        self.user.save()
+        user, _ = self.get_user()
+        self.assertFalse(user.is_authenticated)
+
+
+class AsyncAuthenticateTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="pass")
+        self.failures = []
+        user_login_failed.connect(self.record_failure)
+        self.addCleanup(user_login_failed.disconnect, self.record_failure)
+
+    def record_failure(self, sender, credentials, **kwargs):
+        self.failures.append(credentials)
+
+    def authenticate(self, **credentials):
+        return async_to_sync(aauthenticate)(None, **credentials)
+
+    def test_sets_backend(self):
+        user = self.authenticate(username="testuser", password="pass")
+        self.assertEqual(user, self.user)
+        self.assertEqual(user.backend, "account.backends.TenantModelBackend")
+        self.assertListEqual(self.failures, [])
+
+    def test_failure_sends_user_login_failed(self):
+        self.assertIsNone(self.authenticate(username="testuser", password="wrong"))
+        self.assertListEqual(
+            self.failures, [{"username": "testuser", "password": "*" * 20}]
+        )
+
+    @override_settings(
+        AUTHENTICATION_BACKENDS=[
+            "django.contrib.auth.backends.RemoteUserBackend",
+            "django.contrib.auth.backends.ModelBackend",
+        ]
+    )
+    def test_other_backends(self):
+        # RemoteUserBackend does not take a password, so it is skipped; the
+        # sync ModelBackend runs on a thread.
+        user = self.authenticate(username="testuser", password="pass")
+        self.assertEqual(user.backend, "django.contrib.auth.backends.ModelBackend")
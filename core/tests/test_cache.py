@@ -0,0 +1,154 @@
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache as django_cache
+from django.db.models.signals import post_save
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from company.models import Company
+from core import cache
+from customer.models import Customer, ServiceHistory
+from tenant.context import use_tenant
+from tenant.tests.test_middleware import create_company
+
+
+class ObjectCacheTestCase(TestCase):
+    def setUp(self):
+        django_cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="pass")
+        self.customer = Customer.objects.create(
+            user=self.user, name="Meta", email="mail@gmail.com"
+        )
+
+    def test_get_object_is_cached(self):
+        cache.get_object(Customer, self.customer.pk)
+        with self.assertNumQueries(0):
+            customer = cache.get_object(Customer, self.customer.pk)
+        self.assertEqual(customer, self.customer)
+
+    def test_missing_object_is_not_cached(self):
+        self.assertIsNone(cache.get_object(Customer, 999))
+        with self.assertNumQueries(1):
+            cache.get_object(Customer, 999)
+
+    def test_save_bumps_version(self):
+        version = cache.get_version(Customer, self.customer.pk)
+        cache.get_object(Customer, self.customer.pk)
+        self.customer.name = "Facebook"
+        self.customer.save()
+        self.assertGreater(cache.get_version(Customer, self.customer.pk), version)
+        self.assertEqual(cache.get_object(Customer, self.customer.pk).name, "Facebook")
+
+    def test_service_bumps_customer_version(self):
+        version = cache.get_version(Customer, self.customer.pk)
+        ServiceHistory.objects.create(
+            customer=self.customer, cost=Decimal(5000), created_by=self.user
+        )
+        self.assertGreater(cache.get_version(Customer, self.customer.pk), version)
+        customer = cache.get_object(Customer, self.customer.pk)
+        self.assertEqual(customer.last_service_date, timezone.now().date())
+
+    def test_reader_during_service_save_does_not_cache_old_dates(self):
+        def read(sender, instance, **kwargs):
+            cache.get_object(Customer, instance.customer_id)
+
+        # A reader that runs after the service insert and before the
+        # customer's dates are moved forward.
+        post_save.connect(read, sender=ServiceHistory)
+        self.addCleanup(post_save.disconnect, read, sender=ServiceHistory)
+        ServiceHistory.objects.create(
+            customer=self.customer, cost=Decimal(5000), created_by=self.user
+        )
+        customer = cache.get_object(Customer, self.customer.pk)
+        self.assertEqual(customer.last_service_date, timezone.now().date())
+
+    def test_sync_service_dates_bumps_customer_version(self):
+        self.assertIsNone(
+            cache.get_object(Customer, self.customer.pk).last_service_date
+        )
+        ServiceHistory.objects.bulk_create(
+            [ServiceHistory(customer=self.customer, cost=100, created_by=self.user)]
+        )
+        Customer.objects.sync_service_dates()
+        customer = cache.get_object(Customer, self.customer.pk)
+        self.assertEqual(customer.last_service_date, timezone.now().date())
+
+    def test_batch_services_bump_customer_version(self):
+        version = cache.get_version(Customer, self.customer.pk)
+        ServiceHistory.objects.record_batch(
+            [ServiceHistory(customer=self.customer, cost=100, created_by=self.user)]
+        )
+        self.assertGreater(cache.get_version(Customer, self.customer.pk), version)
+
+    def test_delete_bumps_version(self):
+        pk = self.customer.pk
+        cache.get_object(Customer, pk)
+        self.customer.delete()
+        self.assertIsNone(cache.get_object(Customer, pk))
+
+    def test_evicted_version_does_not_resurrect_old_values(self):
+        cache.get_or_set(Customer, self.customer.pk, "summary", lambda: "old")
+        version = cache.get_version(Customer, self.customer.pk)
+        django_cache.delete(f"v:customer.customer:{self.customer.pk}")
+        self.assertNotEqual(cache.get_version(Customer, self.customer.pk), version)
+        value = cache.get_or_set(Customer, self.customer.pk, "summary", lambda: "new")
+        self.assertEqual(value, "new")
+
+
+class CachedUpdateViewTestCase(TestCase):
+    def setUp(self):
+        django_cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username="testuser", password="pass")
+        self.client.login(username="testuser", password="pass")
+        self.company = Company.objects.create(
+            name="Meta",
+            email="company@mail.com",
+            address="Nigeria",
+            phone="08105505056",
+            description="Waste company",
+            website="https://meta.com",
+            established_date="2020-01-01",
+        )
+
+    def test_company_update_view_reads_from_cache(self):
+        url = reverse("company:update_company", args=[self.company.pk])
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertEqual(response.context.get("title"), "Update Meta")
+        self.company.name = "Meta Platforms"
+        self.company.save()
+        response = self.client.get(url)
+        self.assertEqual(response.context.get("title"), "Update Meta Platforms")
+
+
+class TenantObjectCacheTestCase(TestCase):
+    def setUp(self):
+        django_cache.clear()
+        self.acme = create_company("acme")
+        self.other = create_company("other")
+        self.customer = Customer.objects.create(
+            user=User.objects.create_user(username="acme"),
+            company=self.acme,
+            name="Meta",
+            email="mail@gmail.com",
+        )
+
+    def test_cached_object_is_not_served_to_other_tenant(self):
+        with use_tenant(self.acme):
+            self.assertEqual(
+                cache.get_object(Customer, self.customer.pk), self.customer
+            )
+        with use_tenant(self.other):
+            self.assertIsNone(cache.get_object(Customer, self.customer.pk))
+            self.assertIsNone(
+                async_to_sync(cache.aget_object)(Customer, self.customer.pk)
+            )
+
+    def test_unscoped_queryset_is_rechecked_against_tenant(self):
+        queryset = Customer._base_manager.all()
+        with use_tenant(self.other):
+            self.assertIsNone(cache.get_object(Customer, self.customer.pk, queryset))
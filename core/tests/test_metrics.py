@@ -0,0 +1,154 @@
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from core import metrics
+from core.models import DailyMetric
+from customer.models import Customer, ServiceHistory
+from tenant.context import use_tenant
+from tenant.tests.test_middleware import create_company
+
+get_dashboard_metrics = async_to_sync(metrics.aget_dashboard_metrics)
+
+
+class DashboardMetricsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.now().date()
+        self.user = User.objects.create_user(username="testuser", password="pass")
+        self.customer = Customer.objects.create(
+            user=self.user, name="Meta", email="mail@gmail.com", schedule="daily"
+        )
+
+    def record_service(self, cost):
+        return ServiceHistory.objects.create(
+            customer=self.customer, cost=Decimal(cost), created_by=self.user
+        )
+
+    def test_services_update_daily_metric(self):
+        self.record_service(5000)
+        self.record_service(12000)
+        metric = DailyMetric.objects.get(date=self.today)
+        self.assertEqual(metric.collections, 2)
+        self.assertEqual(metric.revenue, Decimal(17000))
+        self.assertEqual(metric.new_customers, 1)
+
+    def test_batch_recorded_services_update_daily_metric(self):
+        ServiceHistory.objects.record_batch(
+            ServiceHistory(
+                customer=self.customer, cost=Decimal(cost), created_by=self.user
+            )
+            for cost in (1000, 2500)
+        )
+        metric = DailyMetric.objects.get(date=self.today)
+        self.assertEqual(metric.collections, 2)
+        self.assertEqual(metric.revenue, Decimal(3500))
+
+    def test_service_deletion_updates_daily_metric(self):
+        self.record_service(5000).delete()
+        metric = DailyMetric.objects.get(date=self.today)
+        self.assertEqual(metric.collections, 0)
+        self.assertEqual(metric.revenue, Decimal(0))
+
+    def test_metrics_are_kept_per_schedule(self):
+        self.record_service(5000)
+        weekly = Customer.objects.create(
+            user=User.objects.create_user(username="other", password="pass"),
+            name="Alphabet",
+            email="alphabet@mail.com",
+            schedule="weekly",
+        )
+        ServiceHistory.objects.create(
+            customer=weekly, cost=Decimal(700), created_by=self.user
+        )
+        self.assertDictEqual(
+            {
+                metric.schedule: (metric.collections, metric.revenue)
+                for metric in DailyMetric.objects.filter(date=self.today)
+            },
+            {"daily": (1, Decimal(5000)), "weekly": (1, Decimal(700))},
+        )
+        result = get_dashboard_metrics()
+        self.assertEqual(result["today"]["collections"], 2)
+        self.assertEqual(result["today"]["new_customers"], 2)
+
+    def test_dashboard_metrics_are_cached(self):
+        self.record_service(5000)
+        get_dashboard_metrics()
+        with self.assertNumQueries(0):
+            result = get_dashboard_metrics()
+        self.assertEqual(result["today"]["collections"], 1)
+        self.assertEqual(result["all_time"]["revenue"], Decimal(5000))
+
+    def test_recording_service_invalidates_cache(self):
+        self.record_service(5000)
+        self.assertEqual(get_dashboard_metrics()["today"]["collections"], 1)
+        self.record_service(12000)
+        result = get_dashboard_metrics()
+        self.assertEqual(result["today"]["collections"], 2)
+        self.assertEqual(result["month"]["revenue"], Decimal(17000))
+
+    def test_due_today(self):
+        self.customer.record_service_date(self.today - timezone.timedelta(days=1))
+        metrics.invalidate([self.customer.company_id])
+        self.assertEqual(get_dashboard_metrics()["due_today"], 1)
+
+    def test_rebuild(self):
+        self.record_service(5000)
+        DailyMetric.objects.all().delete()
+        self.assertEqual(metrics.rebuild(), 1)
+        metric = DailyMetric.objects.get(date=self.today)
+        self.assertEqual(metric.collections, 1)
+        self.assertEqual(metric.revenue, Decimal(5000))
+        self.assertEqual(metric.new_customers, 1)
+
+
+class TenantDashboardMetricsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.acme = create_company("acme")
+        self.other = create_company("other")
+        staff = User.objects.create_user(username="staff")
+        self.customer = Customer.objects.create(
+            user=User.objects.create_user(username="acme"),
+            company=self.acme,
+            name="Meta",
+            email="mail@gmail.com",
+            schedule="daily",
+        )
+        ServiceHistory.objects.create(
+            customer=self.customer, cost=Decimal(5000), created_by=staff
+        )
+
+    def test_dashboard_is_per_tenant(self):
+        with use_tenant(self.acme):
+            acme = get_dashboard_metrics()
+        with use_tenant(self.other):
+            other = get_dashboard_metrics()
+        self.assertEqual(acme["today"]["collections"], 1)
+        self.assertEqual(acme["due_today"], 0)
+        self.assertEqual(other["today"]["collections"], 0)
+        self.assertEqual(other["all_time"]["new_customers"], 0)
+        self.assertEqual(get_dashboard_metrics()["today"]["collections"], 1)
+
+    def test_recording_invalidates_tenant_and_total(self):
+        with use_tenant(self.acme):
+            get_dashboard_metrics()
+        get_dashboard_metrics()
+        metrics.record(timezone.now().date(), "daily", self.acme.pk, collections=1)
+        with use_tenant(self.acme):
+            acme = get_dashboard_metrics()
+        self.assertEqual(acme["today"]["collections"], 2)
+        self.assertEqual(get_dashboard_metrics()["today"]["collections"], 2)
+
+    def test_rebuild_keeps_companies_apart(self):
+        DailyMetric.objects.all().delete()
+        metrics.rebuild()
+        metric = DailyMetric.objects.get(date=timezone.now().date())
+        self.assertEqual(metric.company, self.acme)
+        with use_tenant(self.other):
+            self.assertFalse(DailyMetric.objects.exists())
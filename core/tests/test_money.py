@@ -0,0 +1,76 @@
+from decimal import Decimal
+
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+from django.utils import translation
+
+from core.money import format_column, format_money
+
+
+@override_settings(DEFAULT_CURRENCY="NGN")
+class FormatColumnTestCase(SimpleTestCase):
+    def test_grouping_and_rounding(self):
+        self.assertEqual(
+            format_column([Decimal("1234567.895"), Decimal("0.005"), 45000000, 3000.0]),
+            ["₦1,234,567.90", "₦0.01", "₦45,000,000.00", "₦3,000.00"],
+        )
+
+    def test_negative_and_missing(self):
+        self.assertEqual(format_column([Decimal("-1500"), None]), ["-₦1,500.00", ""])
+
+    def test_negative_zero(self):
+        self.assertEqual(
+            format_column([Decimal("-0.004"), -0.0, Decimal("-0.005")]),
+            ["₦0.00", "₦0.00", "-₦0.01"],
+        )
+
+    def test_locale_separators_and_symbol_position(self):
+        self.assertEqual(
+            format_column([Decimal("1234.5"), Decimal("-2")], "EUR", "de"),
+            ["1.234,50 €", "-2,00 €"],
+        )
+        self.assertEqual(format_money(1234.5, "EUR", "fr-ca"), "1 234,50 €")
+        # Any language Django has formats for, not only a fixed list.
+        self.assertEqual(format_money(1234.5, "EUR", "it"), "1.234,50 €")
+
+    def test_secondary_grouping(self):
+        self.assertEqual(
+            format_column([Decimal("12345678"), 999], "INR", "en-in"),
+            ["₹1,23,45,678.00", "₹999.00"],
+        )
+
+    def test_code_without_symbol(self):
+        self.assertEqual(format_money(10, "XOF", "en"), "XOF 10.00")
+
+    def test_active_language(self):
+        with translation.override("de"):
+            self.assertEqual(format_money(1000), "1.000,00 ₦")
+
+    def test_places(self):
+        self.assertEqual(format_money(Decimal("1234.5"), places=0), "₦1,235")
+
+
+@override_settings(DEFAULT_CURRENCY="NGN")
+class MoneyFilterTestCase(SimpleTestCase):
+    def render(self, source, **context):
+        return Template("{% load money %}" + source).render(Context(context))
+
+    def test_money(self):
+        self.assertEqual(
+            self.render("{{ amount|money }} {{ amount|money:'USD' }}", amount=2500),
+            "₦2,500.00 $2,500.00",
+        )
+        self.assertEqual(self.render("{{ amount|money }}", amount=None), "")
+
+    def test_money_columns(self):
+        rows = [
+            {"period": "Jan", "cost": Decimal("1000"), "revenue": Decimal("1500.5")},
+            {"period": "Feb", "cost": None, "revenue": Decimal("20")},
+        ]
+        output = self.render(
+            "{% for row in rows|money_columns:'cost, revenue' %}"
+            "{{ row.period }} {{ row.cost }} {{ row.revenue }};{% endfor %}",
+            rows=rows,
+        )
+        self.assertEqual(output, "Jan ₦1,000.00 ₦1,500.50;Feb  ₦20.00;")
+        self.assertEqual(rows[0]["cost"], Decimal("1000"))
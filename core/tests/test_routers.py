@@ -0,0 +1,129 @@
+import time
+from unittest import skipIf, skipUnless
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.views import View
+
+from core import metrics
+from core.db_routers import REPLICA, ReplicaRouter, replica_alias, use_replica
+from core.middleware import (
+    PIN_SESSION_KEY,
+    PrimaryPinningMiddleware,
+    is_pinned_to_primary,
+)
+from core.mixins import ReplicaReadMixin
+from core.models import DailyMetric
+from customer.models import Customer
+
+HAS_REPLICA = REPLICA in settings.DATABASES
+
+
+class ReadAliasView(ReplicaReadMixin, View):
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(Customer.objects.all().db)
+
+
+def get_request(method="get"):
+    request = getattr(RequestFactory(), method)("/")
+    request.session = SessionStore()
+    return request
+
+
+@skipUnless(HAS_REPLICA, "set REPLICA_DATABASE_NAME to test against a replica")
+class ReplicaRouterTestCase(TransactionTestCase):
+    """
+    Runs against a real "replica" connection, configured as a test mirror
+    of the primary. A TransactionTestCase, so rows written through the
+    primary are committed and visible to it.
+    """
+
+    databases = "__all__"
+
+    def test_reads_default_to_primary(self):
+        with self.assertNumQueries(0, using="replica"):
+            self.assertListEqual(list(Customer.objects.all()), [])
+
+    def test_use_replica(self):
+        with use_replica():
+            with self.assertNumQueries(1, using="replica"):
+                self.assertListEqual(list(Customer.objects.all()), [])
+            with self.assertNumQueries(0, using="replica"):
+                DailyMetric.objects.create(date="2024-01-01", schedule="daily")
+        self.assertEqual(DailyMetric.objects.using("replica").count(), 1)
+
+    def test_mixin_reads_from_replica(self):
+        response = ReadAliasView.as_view()(get_request())
+        self.assertEqual(response.content, b"replica")
+
+    def test_mixin_reads_from_primary_after_write(self):
+        request = get_request("post")
+        request.session.create()
+        PrimaryPinningMiddleware(lambda request: HttpResponse())(request)
+        follow_up = get_request()
+        follow_up.session = request.session
+        response = ReadAliasView.as_view()(follow_up)
+        self.assertEqual(response.content, b"default")
+
+    def test_dashboard_metrics_are_computed_on_primary(self):
+        cache.clear()
+        with use_replica(), self.assertNumQueries(0, using="replica"):
+            async_to_sync(metrics.aget_dashboard_metrics)()
+
+
+class ReplicaFallbackTestCase(TestCase):
+    @skipIf(HAS_REPLICA, "a replica is configured")
+    def test_replica_alias_without_replica(self):
+        self.assertEqual(replica_alias(), "default")
+        with use_replica():
+            self.assertEqual(Customer.objects.all().db, "default")
+
+    def test_only_primary_is_migrated(self):
+        router = ReplicaRouter()
+        self.assertTrue(router.allow_migrate("default", "customer"))
+        self.assertFalse(router.allow_migrate("replica", "customer"))
+        self.assertEqual(router.db_for_write(Customer), "default")
+
+    def test_write_pins_session_to_primary(self):
+        request = get_request("post")
+        request.session.create()
+        PrimaryPinningMiddleware(lambda request: HttpResponse())(request)
+        self.assertGreater(request.session[PIN_SESSION_KEY], time.time())
+        self.assertTrue(is_pinned_to_primary(request))
+
+    def test_write_pins_signed_in_user(self):
+        request = get_request("post")
+        request.user = User.objects.create_user(username="testuser")
+        PrimaryPinningMiddleware(lambda request: HttpResponse())(request)
+        self.assertTrue(is_pinned_to_primary(request))
+
+    def test_anonymous_write_creates_no_session(self):
+        request = get_request("post")
+        PrimaryPinningMiddleware(lambda request: HttpResponse())(request)
+        self.assertNotIn(PIN_SESSION_KEY, request.session)
+        self.assertFalse(request.session.modified)
+
+    def test_async_anonymous_write_creates_no_session(self):
+        async def view(request):
+            return HttpResponse()
+
+        request = get_request("post")
+        request.session = SessionStore("stale-session-key")
+        async_to_sync(PrimaryPinningMiddleware(view))(request)
+        self.assertFalse(request.session.modified)
+
+    def test_pin_expires(self):
+        request = get_request()
+        request.session[PIN_SESSION_KEY] = time.time() - 1
+        self.assertFalse(is_pinned_to_primary(request))
+
+    def test_dashboard_served(self):
+        User.objects.create_user(username="testuser", password="pass")
+        self.client.login(username="testuser", password="pass")
+        response = self.client.get("/")
+        self.assertEqual(response.status_code, 200)
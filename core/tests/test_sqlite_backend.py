@@ -0,0 +1,50 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+
+class ConcurrentSQLiteBackendTestCase(SimpleTestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.handler = ConnectionHandler(
+            {
+                "default": {
+                    "ENGINE": "core.backends.sqlite3",
+                    "NAME": str(Path(tmpdir.name) / "db.sqlite3"),
+                }
+            }
+        )
+        self.connection = self.handler["default"]
+        self.addCleanup(self.handler.close_all)
+
+    def pragma(self, name):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_on_connect(self):
+        self.assertEqual(self.pragma("journal_mode"), "wal")
+        self.assertEqual(self.pragma("busy_timeout"), 5000)
+        self.assertEqual(self.pragma("synchronous"), 1)
+        self.assertEqual(self.pragma("cache_size"), -64 * 1024)
+
+    @override_settings(SQLITE_PRAGMAS={"busy_timeout": 100})
+    def test_pragmas_overridable_in_settings(self):
+        self.assertEqual(self.pragma("busy_timeout"), 100)
+
+    def test_transactions_begin_immediate(self):
+        self.connection.ensure_connection()
+        with CaptureQueriesContext(self.connection) as queries:
+            self.connection._start_transaction_under_autocommit()
+        self.addCleanup(self.connection.connection.execute, "ROLLBACK")
+        self.assertEqual(queries.captured_queries[-1]["sql"], "BEGIN IMMEDIATE")
+        # The write lock is held from the start of the transaction.
+        other = sqlite3.connect(self.connection.settings_dict["NAME"], timeout=0)
+        self.addCleanup(other.close)
+        with self.assertRaisesMessage(sqlite3.OperationalError, "database is locked"):
+            other.execute("BEGIN IMMEDIATE")
@@ -1,6 +1,8 @@
+from asgiref.sync import async_to_sync
 from django.conf.global_settings import LOGIN_URL
 from django.contrib.auth.models import AnonymousUser, User
-from django.test import TestCase, Client, RequestFactory
+from django.core.cache import cache
+from django.test import TestCase, Client, RequestFactory, override_settings
 from django.urls import reverse
 from core.views import DashboardView
 
@@ -69,7 +71,7 @@ class DashboardViewRequestFactoryTestCase(TestCase):
     def test_dashboard_view_without_authentication(self):
         request = self.factory.get(DASHBOARD_URL)
         request.user = AnonymousUser()
-        response = DashboardView.as_view()(request)
+        response = async_to_sync(DashboardView.as_view())(request)
         self.assertEqual(response.status_code, 302)
         redirect_to = f"{LOGIN_URL}?next={DASHBOARD_URL}"
         self.assertEqual(response.get("location"), redirect_to)
@@ -77,14 +79,14 @@ class DashboardViewRequestFactoryTestCase(TestCase):
     def test_dashboard_view_with_authentication(self):
         request = self.factory.get(DASHBOARD_URL)
         request.user = self.user
-        response = DashboardView.as_view()(request)
+        response = async_to_sync(DashboardView.as_view())(request)
         self.assertEqual(response.status_code, 200)
 
     #
     def test_dashboard_view_context(self):
         request = self.factory.get(DASHBOARD_URL)
         request.user = self.user
-        response = DashboardView.as_view()(request)
+        response = async_to_sync(DashboardView.as_view())(request)
         self.assertIn("title", response.context_data)
         self.assertEqual(response.context_data.get("title"), "Dashboard")
 
@@ -92,12 +94,59 @@ class DashboardViewRequestFactoryTestCase(TestCase):
         request = self.factory.get(DASHBOARD_URL)
         request.user = self.user
 
-        response = DashboardView.as_view()(request)
+        response = async_to_sync(DashboardView.as_view())(request)
         context = response.context_data
         self.assertNotIn("invalidcontext", context)
 
     def test_dashboard_view_template(self):
         request = self.factory.get(DASHBOARD_URL)
         request.user = self.user
-        response = DashboardView.as_view()(request)
+        response = async_to_sync(DashboardView.as_view())(request)
         self.assertIn("core/dashboard.html", response.template_name)
+
+
+class DashboardViewMetricsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user_data = get_user()
+        self.user = User.objects.create_user(**self.user_data)
+
+    def test_dashboard_view_metrics_context(self):
+        self.client.login(**self.user_data)
+        response = self.client.get(DASHBOARD_URL)
+        metrics = response.context.get("metrics")
+        self.assertIsNotNone(metrics)
+        self.assertEqual(metrics["today"]["collections"], 0)
+        self.assertEqual(metrics["due_today"], 0)
+
+
+@override_settings(
+    SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+    AUTHENTICATION_BACKENDS=["account.backends.CachedModelBackend"],
+)
+class AsyncDashboardViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(**get_user())
+        self.client.force_login(self.user)
+        self.async_client.cookies = self.client.cookies
+
+    async def test_async_client(self):
+        response = await self.async_client.get(DASHBOARD_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["user"], self.user)
+        self.assertIn("metrics", response.context)
+
+    async def test_async_client_without_authentication(self):
+        self.async_client.cookies.clear()
+        response = await self.async_client.get(DASHBOARD_URL)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, f"{LOGIN_URL}?next={DASHBOARD_URL}")
+
+    def test_warm_request_makes_no_queries(self):
+        self.client.get(DASHBOARD_URL)
+        # Session, user and metrics all come from the cache.
+        with self.assertNumQueries(0):
+            response = self.client.get(DASHBOARD_URL)
+        self.assertEqual(response.status_code, 200)
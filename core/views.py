@@ -1,13 +1,17 @@
-from django.shortcuts import render
-from braces.views import LoginRequiredMixin as BracesLoginRequiredMixin
 from django.views.generic import TemplateView
 
-# Create your views here.
+from core.metrics import aget_dashboard_metrics
+from core.mixins import AsyncLoginRequiredMixin, ReplicaReadMixin
 
 
-class DashboardView(BracesLoginRequiredMixin, TemplateView):
+class DashboardView(AsyncLoginRequiredMixin, ReplicaReadMixin, TemplateView):
     template_name = "core/dashboard.html"
 
+    async def get(self, request, *args, **kwargs):
+        context = self.get_context_data(**kwargs)
+        context["metrics"] = await aget_dashboard_metrics()
+        return self.render_to_response(context)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["title"] = "Dashboard"
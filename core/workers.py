@@ -0,0 +1,16 @@
+"""
+Process-pool worker setup.
+
+Importable before ``django.setup()``, because "spawn" workers (the default
+on macOS and Windows) import the initializer from scratch.
+"""
+
+import django
+
+
+def init_worker():
+    """Process-pool initializer: set Django up in a freshly spawned worker."""
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
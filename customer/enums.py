@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from django.db.models import TextChoices
 
 
@@ -8,3 +10,12 @@ class ScheduleChoices(TextChoices):
     YEARLY = "yearly", "Yearly"
     QUARTERLY = "quarterly", "Quarterly"
     # CUSTOM = "custom", "Custom"
+
+
+SCHEDULE_INTERVALS = {
+    ScheduleChoices.DAILY: timedelta(days=1),
+    ScheduleChoices.WEEKLY: timedelta(weeks=1),
+    ScheduleChoices.MONTHLY: timedelta(days=30),
+    ScheduleChoices.QUARTERLY: timedelta(days=90),
+    ScheduleChoices.YEARLY: timedelta(days=365),
+}
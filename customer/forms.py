@@ -1,9 +1,13 @@
 from django import forms
+from django.utils import timezone
 
+from account.forms import IdentityEmailMixin
 from customer.models import Customer, ServiceHistory
 
 
-class CreateCustomerForm(forms.ModelForm):
+class CreateCustomerForm(IdentityEmailMixin, forms.ModelForm):
+    identity_owner = "customer"
+
     class Meta:
         model = Customer
         fields = [
@@ -39,3 +43,27 @@ class CreateServiceHistory(forms.ModelForm):
         if cost <= 0:
             self.add_error("cost", "Cost cannot be negative")
         return cleaned_data
+
+
+class ImportCustomerForm(CreateCustomerForm):
+    """
+    Row validation for bulk imports. Email uniqueness is checked for a whole
+    batch at once by the import, rather than with one query per row here.
+    """
+
+    def validate_unique(self):
+        pass
+
+
+class ServiceBatchEntryForm(CreateServiceHistory):
+    """One entry of a batch upload; cost rules come from CreateServiceHistory."""
+
+    customer = forms.IntegerField(min_value=1)
+    created = forms.DateTimeField(required=False)
+
+    def clean_created(self):
+        # A future time would move the customer's service dates ahead.
+        created = self.cleaned_data["created"]
+        if created is not None and created > timezone.now():
+            raise forms.ValidationError("Service time cannot be in the future")
+        return created
@@ -0,0 +1,169 @@
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from account.hashing import hash_password
+from account.identity import normalize_email
+from account.models import EmailIdentity
+from company.models import Company
+from core.workers import init_worker
+from customer.forms import ImportCustomerForm
+from customer.models import Customer
+from customer.signals import customers_created
+
+FIELDS = ImportCustomerForm.Meta.fields
+
+
+class Command(BaseCommand):
+    help = (
+        "Import one company's customers from a CSV or JSON Lines file. Each "
+        f"row needs {', '.join(FIELDS)} and may carry a password; rows without "
+        "one get an unusable password."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path)
+        parser.add_argument(
+            "--company",
+            type=int,
+            required=True,
+            help="Id of the company the customers subscribe to",
+        )
+        parser.add_argument("--format", choices=["csv", "jsonl"])
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not path.exists():
+            raise CommandError(f"{path} does not exist")
+        self.company_id = options["company"]
+        if not Company._base_manager.filter(pk=self.company_id).exists():
+            raise CommandError(f"Company {self.company_id} does not exist")
+        fmt = options["format"] or ("jsonl" if path.suffix == ".jsonl" else "csv")
+        self.imported = 0
+        self.failed = 0
+        with path.open(newline="", encoding="utf-8") as handle, ProcessPoolExecutor(
+            max_workers=options["workers"], initializer=init_worker
+        ) as pool:
+            rows = self.read_rows(handle, fmt)
+            pending = None
+            for batch in self.validated_batches(rows, options["batch_size"]):
+                # Hash this batch in the pool while the previous one is written.
+                passwords = [password for _, _, password in batch]
+                chunksize = max(1, len(passwords) // (options["workers"] * 4))
+                hashed = pool.map(hash_password, passwords, chunksize=chunksize)
+                if pending:
+                    self.write_batch(*pending)
+                pending = (batch, hashed)
+            if pending:
+                self.write_batch(*pending)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {self.imported} customers, {self.failed} rows failed"
+            )
+        )
+
+    def read_rows(self, handle, fmt):
+        if fmt == "csv":
+            # Line 1 is the header.
+            yield from enumerate(csv.DictReader(handle), start=2)
+            return
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                self.report(line_number, {"__all__": [f"Invalid JSON: {e}"]})
+                continue
+            if not isinstance(row, dict):
+                self.report(line_number, {"__all__": ["Expected a JSON object"]})
+                continue
+            yield line_number, row
+
+    def report(self, line_number, errors):
+        self.failed += 1
+        for field, messages in errors.items():
+            for message in messages:
+                self.stderr.write(f"line {line_number}: {field}: {message}")
+
+    def validated_batches(self, rows, batch_size):
+        seen = set()
+        batch = []
+        for line_number, row in rows:
+            form = ImportCustomerForm(data={field: row.get(field) for field in FIELDS})
+            if not form.is_valid():
+                self.report(line_number, form.errors)
+                continue
+            email = form.cleaned_data["email"].lower()
+            if email in seen:
+                self.report(line_number, {"email": ["Duplicate email in file"]})
+                continue
+            seen.add(email)
+            batch.append((line_number, form.cleaned_data, row.get("password") or None))
+            if len(batch) >= batch_size:
+                yield self.drop_existing(batch)
+                batch = []
+        if batch:
+            yield self.drop_existing(batch)
+
+    def drop_existing(self, batch):
+        # Match addresses case-insensitively, as the identity table does;
+        # usernames are checked too, since imported users are named by email.
+        emails = {normalize_email(data["email"]) for _, data, _ in batch}
+        usernames = emails | {data["email"] for _, data, _ in batch}
+        taken = set(
+            EmailIdentity.objects.filter(email__in=emails)
+            .filter(Q(user__isnull=False) | Q(customer__isnull=False))
+            .values_list("email", flat=True)
+        ) | {
+            normalize_email(username)
+            for username in User.objects.filter(username__in=usernames).values_list(
+                "username", flat=True
+            )
+        }
+        kept = []
+        for line_number, data, password in batch:
+            if normalize_email(data["email"]) in taken:
+                self.report(line_number, {"email": ["Email already exists"]})
+            else:
+                kept.append((line_number, data, password))
+        return kept
+
+    def write_batch(self, batch, hashed):
+        if not batch:
+            return
+        rows = list(zip(batch, hashed))
+        try:
+            customers = self.insert(rows)
+        except IntegrityError:
+            # Another writer took some of these emails after drop_existing
+            # checked them; retry row by row so only those rows fail.
+            customers = []
+            for row in rows:
+                try:
+                    customers += self.insert([row])
+                except IntegrityError as e:
+                    self.report(row[0][0], {"__all__": [str(e)]})
+        if customers:
+            customers_created.send(sender=Customer, customers=customers)
+        self.imported += len(customers)
+
+    def insert(self, rows):
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                User(username=data["email"], email=data["email"], password=password)
+                for (_, data, _), password in rows
+            )
+            return Customer.objects.bulk_create(
+                Customer(user=user, company_id=self.company_id, **data)
+                for user, ((_, data, _), _) in zip(users, rows)
+            )
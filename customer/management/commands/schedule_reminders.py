@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from customer.reminders import CHUNK_SIZE, NOTICE_DAYS, schedule_reminders
+
+
+class Command(BaseCommand):
+    help = "Enqueue advance-notice reminders for upcoming collections"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--notice-days", type=int, default=NOTICE_DAYS)
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        job_ids = schedule_reminders(
+            notice_days=options["notice_days"], chunk_size=options["chunk_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Enqueued {len(job_ids)} jobs"))
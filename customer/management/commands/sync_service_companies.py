@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from customer.models import ServiceHistory
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy ServiceHistory.company from each row's customer, e.g. to backfill "
+        "rows without one, which no tenant can see. Run rebuild_metrics after."
+    )
+
+    def handle(self, *args, **options):
+        updated = ServiceHistory.objects.sync_companies()
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} services"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from customer.models import Customer
+
+
+class Command(BaseCommand):
+    help = "Recompute Customer.last_service_date/next_service_date from history"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        updated = Customer.objects.sync_service_dates(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} customers"))
@@ -1,13 +1,120 @@
+from contextlib import nullcontext
+
 from django.contrib.auth.models import User
-from django.db import models
-from django.utils.timezone import timedelta
+from django.db import models, transaction
+from django.db.models import (
+    Count,
+    DecimalField,
+    F,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core import cache
+from customer.enums import SCHEDULE_INTERVALS, ScheduleChoices
+from customer.signals import services_recorded
+from tenant.managers import TenantManager
+
+
+def compute_next_service_date(schedule, last_service_date):
+    interval = SCHEDULE_INTERVALS.get(schedule)
+    if last_service_date is None or interval is None:
+        return None
+    return last_service_date + interval
+
+
+class CustomerQuerySet(models.QuerySet):
+    def for_company(self, company):
+        return self.filter(company=company)
 
-from customer.enums import ScheduleChoices
+    def due_on(self, date):
+        return self.filter(next_service_date=date)
+
+    def due_between(self, start, end):
+        return self.filter(next_service_date__range=(start, end))
+
+    def with_service_stats(self):
+        """
+        Annotate last service time and cost, service count and total spend
+        in the same statement, so the get_* properties need no extra queries.
+        """
+        services = ServiceHistory.objects.filter(customer=OuterRef("pk"))
+        latest = services.order_by("-created")
+        totals = services.order_by().values("customer")
+        return self.annotate(
+            last_service_at=Subquery(latest.values("created")[:1]),
+            last_service_cost=Subquery(latest.values("cost")[:1]),
+            service_count=Coalesce(
+                Subquery(totals.annotate(count=Count("pk")).values("count")), 0
+            ),
+            total_spend=Coalesce(
+                Subquery(totals.annotate(total=Sum("cost")).values("total")),
+                0,
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            ),
+        )
+
+    def sync_service_dates(self, batch_size=1000):
+        """
+        Recompute the persisted service dates from ServiceHistory, e.g. to
+        backfill existing rows. Returns the number of customers updated.
+        """
+        rows = (
+            self.annotate(latest=Max("services__created"))
+            .order_by()
+            .values_list("pk", "schedule", "latest")
+        )
+        batch = []
+        updated = 0
+        for pk, schedule, latest in rows.iterator(chunk_size=batch_size):
+            last_service_date = latest.date() if latest else None
+            batch.append(
+                Customer(
+                    pk=pk,
+                    last_service_date=last_service_date,
+                    next_service_date=compute_next_service_date(
+                        schedule, last_service_date
+                    ),
+                )
+            )
+            if len(batch) >= batch_size:
+                updated += self._update_service_dates(batch)
+                batch = []
+        if batch:
+            updated += self._update_service_dates(batch)
+        return updated
+
+    def _update_service_dates(self, customers):
+        updated = Customer.objects.bulk_update(
+            customers, ["last_service_date", "next_service_date"]
+        )
+        # bulk_update sends no post_save, so invalidate the cached rows here.
+        for customer in customers:
+            cache.bump(Customer, customer.pk)
+        return updated
 
 
 # Create your models here.
+class CustomerManager(TenantManager.from_queryset(CustomerQuerySet)):
+    tenant_field = "company"
+
+
 class Customer(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
+    # Indexed through the company-leading composite indexes in Meta.
+    company = models.ForeignKey(
+        "company.Company",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="customers",
+        db_index=False,
+    )
     name = models.CharField(max_length=255)
     address = models.TextField()
     phone = models.CharField(max_length=33)
@@ -15,14 +122,96 @@ class Customer(models.Model):
     schedule = models.CharField(
         max_length=255, choices=ScheduleChoices.choices, default=ScheduleChoices.WEEKLY
     )
+    last_service_date = models.DateField(
+        null=True, blank=True, editable=False, db_index=True
+    )
+    next_service_date = models.DateField(
+        null=True, blank=True, editable=False, db_index=True
+    )
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
 
+    objects = CustomerManager()
+
     def __str__(self):
         return self.name
 
     class Meta:
         ordering = ["-created"]
+        indexes = [
+            models.Index(
+                fields=["schedule", "created"], name="customer_schedule_created_idx"
+            ),
+            models.Index(
+                fields=["company", "schedule", "created"],
+                name="customer_company_schedule_idx",
+            ),
+            models.Index(
+                fields=["company", "created"], name="customer_company_created_idx"
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_company_id = instance.__dict__.get("company_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        # next_service_date is derived from the schedule, so keep it in step
+        # whenever the schedule is (re)saved.
+        self.next_service_date = compute_next_service_date(
+            self.schedule, self.last_service_date
+        )
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "schedule" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "next_service_date"}
+        # ServiceHistory.company is a copy, so history moves with the customer;
+        # unscoped, since the current tenant may be the one it moves to.
+        moved = getattr(self, "_loaded_company_id", self.company_id) != self.company_id
+        with transaction.atomic() if moved else nullcontext():
+            super().save(*args, **kwargs)
+            if moved:
+                ServiceHistory._base_manager.filter(customer=self).update(
+                    company_id=self.company_id
+                )
+        self._loaded_company_id = self.company_id
+
+    def record_service_date(self, service_date):
+        """
+        Move the persisted service dates forward to ``service_date``. Older
+        dates are ignored, both here and in the database, so out-of-order
+        writes cannot move the dates backwards.
+        """
+        if (
+            self.last_service_date is not None
+            and self.last_service_date >= service_date
+        ):
+            return
+        self.last_service_date = service_date
+        self.next_service_date = compute_next_service_date(self.schedule, service_date)
+        Customer.objects.filter(
+            Q(last_service_date__isnull=True) | Q(last_service_date__lt=service_date),
+            pk=self.pk,
+        ).update(
+            last_service_date=self.last_service_date,
+            next_service_date=self.next_service_date,
+        )
+        # After the update, so a reader cannot cache the old dates under the
+        # new version.
+        cache.bump(Customer, self.pk)
+
+    def refresh_service_dates(self):
+        latest = self.services.aggregate(latest=Max("created"))["latest"]
+        self.last_service_date = latest.date() if latest else None
+        self.next_service_date = compute_next_service_date(
+            self.schedule, self.last_service_date
+        )
+        Customer.objects.filter(pk=self.pk).update(
+            last_service_date=self.last_service_date,
+            next_service_date=self.next_service_date,
+        )
+        cache.bump(Customer, self.pk)
 
     @property
     def get_schedule(self):
@@ -34,35 +223,131 @@ class Customer(models.Model):
 
     @property
     def get_last_service_date(self):
+        last_service_at = getattr(self, "last_service_at", None)
+        if last_service_at is not None:
+            return last_service_at.date()
+        if self.last_service_date is not None:
+            return self.last_service_date
         return self.get_last_service.created.date()
 
+    @property
+    def get_last_service_cost(self):
+        if hasattr(self, "last_service_cost"):
+            return self.last_service_cost
+        return self.get_last_service.cost
+
+    @property
+    def get_service_count(self):
+        if hasattr(self, "service_count"):
+            return self.service_count
+        return self.services.count()
+
+    @property
+    def get_total_spend(self):
+        if hasattr(self, "total_spend"):
+            return self.total_spend
+        return self.services.aggregate(total=Sum("cost"))["total"] or 0
+
     @property
     def get_next_service_date(self):
-        if self.schedule == ScheduleChoices.DAILY:
-            return self.get_last_service_date + timedelta(days=1)
-        elif self.schedule == ScheduleChoices.WEEKLY:
-            return self.get_last_service_date + timedelta(weeks=1)
-        elif self.schedule == ScheduleChoices.MONTHLY:
-            return self.get_last_service_date + timedelta(days=30)
-        elif self.schedule == ScheduleChoices.QUARTERLY:
-            return self.get_last_service_date + timedelta(days=90)
-        elif self.schedule == ScheduleChoices.YEARLY:
-            return self.get_last_service_date + timedelta(days=365)
-        return None
+        if self.next_service_date is not None:
+            return self.next_service_date
+        return compute_next_service_date(self.schedule, self.get_last_service_date)
+
+
+class ServiceHistoryQuerySet(models.QuerySet):
+    def for_company(self, company):
+        return self.filter(company=company)
+
+    def sync_companies(self):
+        """
+        Copy each row's company from its customer where the two differ, e.g.
+        to backfill rows written before ServiceHistory.company existed.
+        Returns the number of rows updated.
+        """
+        stale = Q(company__isnull=True, customer__company__isnull=False) | (
+            Q(company__isnull=False) & ~Q(company=F("customer__company"))
+        )
+        return self.filter(stale).update(
+            company_id=Subquery(
+                Customer._base_manager.filter(pk=OuterRef("customer_id")).values(
+                    "company_id"
+                )[:1]
+            )
+        )
+
+    def record_batch(self, services, batch_size=1000):
+        """
+        Insert unsaved ServiceHistory objects with one bulk_create and bring
+        the affected customers' service dates forward in bulk. bulk_create
+        bypasses save() and post_save, so listeners are told through
+        ``services_recorded`` instead.
+        """
+        services = list(services)
+        latest = {}
+        for service in services:
+            service_date = service.created.date()
+            if latest.get(service.customer_id, service_date) <= service_date:
+                latest[service.customer_id] = service_date
+        with transaction.atomic():
+            customers = Customer.objects.select_for_update().in_bulk(list(latest))
+            for service in services:
+                # Also gives services_recorded listeners the customer.
+                service.customer = customers[service.customer_id]
+                service.company_id = service.customer.company_id
+            created = self.bulk_create(services, batch_size=batch_size)
+            changed = []
+            for pk, service_date in latest.items():
+                customer = customers[pk]
+                if (
+                    customer.last_service_date is None
+                    or customer.last_service_date < service_date
+                ):
+                    customer.last_service_date = service_date
+                    customer.next_service_date = compute_next_service_date(
+                        customer.schedule, service_date
+                    )
+                    changed.append(customer)
+            Customer.objects.bulk_update(
+                changed,
+                ["last_service_date", "next_service_date"],
+                batch_size=batch_size,
+            )
+            services_recorded.send(sender=ServiceHistory, services=created)
+        return created
+
+
+class ServiceHistoryManager(TenantManager.from_queryset(ServiceHistoryQuerySet)):
+    tenant_field = "company"
 
 
 class ServiceHistory(models.Model):
     customer = models.ForeignKey(
         Customer, on_delete=models.CASCADE, related_name="services"
     )
+    # Copied from the customer so tenant-scoped queries need no join.
+    company = models.ForeignKey(
+        "company.Company",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        editable=False,
+        db_index=False,
+    )
     created_by = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
     )
     cost = models.DecimalField(max_digits=10, decimal_places=2)
-    created = models.DateTimeField(auto_now_add=True)
+    # Not auto_now_add, so batch uploads can carry the time of collection.
+    created = models.DateTimeField(default=timezone.now, editable=False)
+    # When the row was written, by the server's clock; created can be set
+    # by the client, so incremental jobs (report.rollups) go by this one.
+    recorded_at = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
 
+    objects = ServiceHistoryManager()
+
     def __str__(self):
         return f"{self.customer.name} - {self.created.date()} - {self.cost}"
 
@@ -70,3 +355,48 @@ class ServiceHistory(models.Model):
         verbose_name_plural = "Service History"
         ordering = ["-created"]
         get_latest_by = "created"
+        indexes = [
+            models.Index(
+                fields=["customer", "-created"], name="service_customer_created_idx"
+            ),
+            models.Index(
+                fields=["company", "customer", "-created"],
+                name="service_company_customer_idx",
+            ),
+            models.Index(
+                fields=["company", "-created"], name="service_company_created_idx"
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        if adding and self.customer_id is not None:
+            self.company_id = self.customer.company_id
+        super().save(*args, **kwargs)
+        if adding:
+            self.customer.record_service_date(self.created.date())
+
+
+class Reminder(models.Model):
+    """
+    One advance-notice reminder per customer and due date. The unique
+    constraint is what keeps reruns from notifying a customer twice.
+    """
+
+    customer = models.ForeignKey(
+        Customer, on_delete=models.CASCADE, related_name="reminders"
+    )
+    due_date = models.DateField()
+    job_id = models.CharField(max_length=100)
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.customer_id} - {self.due_date}"
+
+    class Meta:
+        ordering = ["-created"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["customer", "due_date"], name="unique_customer_reminder"
+            ),
+        ]
@@ -0,0 +1,99 @@
+"""
+Advance-notice reminders, sent through django-rq.
+
+``schedule_reminders`` runs once per evening (see the schedule_reminders
+command). It walks the customers due inside the notice window by id,
+using the next_service_date index, and enqueues one ``send_reminders``
+job per fixed-size chunk. Each job id is derived from the run date and the
+chunk's id range, so rerunning the schedule does not enqueue a chunk
+whose job is still queued, running or done; a failed chunk is enqueued
+again. Each customer is claimed through Reminder's (customer, due_date)
+unique constraint before any mail is sent, so overlapping or repeated jobs
+never notify the same customer twice. Claims commit with the send, so a
+send that fails releases them for the retry.
+"""
+
+import uuid
+from datetime import timedelta
+
+import django_rq
+from django.conf import settings
+from django.core.mail import get_connection, EmailMessage
+from django.db import transaction
+from django.utils import timezone
+
+from core.jobs import enqueue_once
+from customer.models import Customer, Reminder
+
+NOTICE_DAYS = 1
+CHUNK_SIZE = 500
+
+
+def schedule_reminders(
+    notice_days=NOTICE_DAYS, chunk_size=CHUNK_SIZE, today=None, queue=None
+):
+    """Enqueue reminder jobs for the notice window. Returns the job ids."""
+    today = today or timezone.now().date()
+    queue = queue or django_rq.get_queue("default")
+    customers = (
+        Customer.objects.due_between(
+            today + timedelta(days=1), today + timedelta(days=notice_days)
+        )
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    job_ids = []
+    chunk = []
+    for pk in customers.iterator(chunk_size=chunk_size):
+        chunk.append(pk)
+        if len(chunk) == chunk_size:
+            job_ids.append(_enqueue_chunk(queue, today, chunk))
+            chunk = []
+    if chunk:
+        job_ids.append(_enqueue_chunk(queue, today, chunk))
+    return job_ids
+
+
+def _enqueue_chunk(queue, today, customer_ids):
+    job_id = f"reminders:{today.isoformat()}:{customer_ids[0]}-{customer_ids[-1]}"
+    enqueue_once(queue, send_reminders, customer_ids, job_id=job_id)
+    return job_id
+
+
+def send_reminders(customer_ids):
+    """Claim and notify every listed customer not yet reminded for their date."""
+    claim = uuid.uuid4().hex
+    customers = list(
+        Customer.objects.filter(pk__in=customer_ids, next_service_date__isnull=False)
+    )
+    with transaction.atomic():
+        Reminder.objects.bulk_create(
+            [
+                Reminder(
+                    customer=customer,
+                    due_date=customer.next_service_date,
+                    job_id=claim,
+                )
+                for customer in customers
+            ],
+            ignore_conflicts=True,
+        )
+        claimed = set(
+            Reminder.objects.filter(job_id=claim).values_list("customer_id", flat=True)
+        )
+        messages = [
+            EmailMessage(
+                subject="Upcoming waste collection",
+                body=(
+                    f"Hello {customer.name}, your next waste collection is "
+                    f"scheduled for {customer.next_service_date:%A, %d %B %Y}."
+                ),
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[customer.email],
+            )
+            for customer in customers
+            if customer.pk in claimed
+        ]
+        if messages:
+            get_connection().send_messages(messages)
+    return len(messages)
@@ -0,0 +1,9 @@
+from django.dispatch import Signal
+
+# Sent after customers are written in bulk (bulk_create skips post_save),
+# with ``customers``: the list of created Customer instances.
+customers_created = Signal()
+
+# Sent after services are written in bulk, with ``services``: the list of
+# created ServiceHistory instances.
+services_recorded = Signal()
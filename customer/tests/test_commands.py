@@ -0,0 +1,144 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db.models import Sum
+from django.test import TestCase
+
+from core.models import DailyMetric
+from customer.management.commands import import_customers
+from customer.models import Customer
+from tenant.tests.test_middleware import create_company
+
+
+def get_row(index, **kwargs):
+    row = {
+        "name": f"Customer {index}",
+        "email": f"customer{index}@mail.com",
+        "address": "Nigeria",
+        "phone": "08105505056",
+        "schedule": "weekly",
+    }
+    row.update(kwargs)
+    return row
+
+
+class RacingImportCommand(import_customers.Command):
+    """Skips the existing-email check, as if another writer won the race."""
+
+    def drop_existing(self, batch):
+        return batch
+
+
+class ImportCustomersCommandTestCase(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.company = create_company("acme")
+
+    def write_file(self, name, content):
+        path = Path(self.tmpdir.name) / name
+        path.write_text(content)
+        return path
+
+    def run_import(self, path, command="import_customers", **options):
+        stdout, stderr = StringIO(), StringIO()
+        options.setdefault("company", self.company.pk)
+        call_command(
+            command,
+            str(path),
+            workers=2,
+            stdout=stdout,
+            stderr=stderr,
+            **options,
+        )
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_csv(self):
+        header = "name,email,address,phone,schedule,password\n"
+        lines = [
+            "Meta,meta@mail.com,Lagos,0810,weekly,secretpass1\n",
+            "Alphabet,alphabet@mail.com,Abuja,0811,daily,\n",
+        ]
+        stdout, stderr = self.run_import(
+            self.write_file("customers.csv", header + "".join(lines)), batch_size=1
+        )
+        self.assertIn("Imported 2 customers, 0 rows failed", stdout)
+        self.assertEqual(stderr, "")
+        meta = Customer.objects.get(email="meta@mail.com")
+        self.assertEqual(meta.user.username, "meta@mail.com")
+        self.assertTrue(meta.user.check_password("secretpass1"))
+        alphabet = Customer.objects.get(email="alphabet@mail.com")
+        self.assertFalse(alphabet.user.has_usable_password())
+        self.assertEqual(
+            set(Customer.objects.values_list("company", flat=True)), {self.company.pk}
+        )
+        self.assertEqual(
+            DailyMetric.objects.aggregate(total=Sum("new_customers"))["total"], 2
+        )
+
+    def test_import_requires_an_existing_company(self):
+        path = self.write_file("customers.jsonl", json.dumps(get_row(0)))
+        with self.assertRaisesMessage(CommandError, "Company 0 does not exist"):
+            self.run_import(path, company=0)
+        self.assertFalse(Customer.objects.exists())
+
+    def test_import_jsonl_reports_row_errors(self):
+        Customer.objects.create(
+            user=User.objects.create_user(username="existing"), **get_row(0)
+        )
+        rows = [
+            json.dumps(get_row(0)),
+            json.dumps(get_row(1, email="invalid_email")),
+            json.dumps(get_row(2, schedule="hourly")),
+            "{not json",
+            json.dumps(get_row(3)),
+            json.dumps(get_row(3)),
+            json.dumps(get_row(4)),
+        ]
+        stdout, stderr = self.run_import(
+            self.write_file("customers.jsonl", "\n".join(rows))
+        )
+        self.assertIn("Imported 2 customers, 5 rows failed", stdout)
+        self.assertIn("line 1: email: Email already exists", stderr)
+        self.assertIn("line 2: email: Enter a valid email address.", stderr)
+        self.assertIn("line 3: schedule:", stderr)
+        self.assertIn("line 4: __all__: Invalid JSON", stderr)
+        self.assertIn("line 6: email: Duplicate email in file", stderr)
+        self.assertEqual(Customer.objects.count(), 3)
+
+    def test_existing_email_is_matched_case_insensitively(self):
+        Customer.objects.create(
+            user=User.objects.create_user(username="existing"), **get_row(0)
+        )
+        rows = [json.dumps(get_row(0, email="Customer0@Mail.com"))]
+        stdout, stderr = self.run_import(
+            self.write_file("customers.jsonl", "\n".join(rows))
+        )
+        self.assertIn("Imported 0 customers, 1 rows failed", stdout)
+        self.assertIn("line 1: email: Email already exists", stderr)
+
+    def test_import_jsonl_reports_non_object_rows(self):
+        rows = ["[1]", '"x"', json.dumps(get_row(0))]
+        stdout, stderr = self.run_import(
+            self.write_file("customers.jsonl", "\n".join(rows))
+        )
+        self.assertIn("Imported 1 customers, 2 rows failed", stdout)
+        self.assertIn("line 1: __all__: Expected a JSON object", stderr)
+        self.assertIn("line 2: __all__: Expected a JSON object", stderr)
+
+    def test_import_reports_concurrent_inserts_per_row(self):
+        Customer.objects.create(
+            user=User.objects.create_user(username="existing"), **get_row(0)
+        )
+        rows = [json.dumps(get_row(index)) for index in range(3)]
+        stdout, stderr = self.run_import(
+            self.write_file("customers.jsonl", "\n".join(rows)),
+            command=RacingImportCommand(),
+        )
+        self.assertIn("Imported 2 customers, 1 rows failed", stdout)
+        self.assertIn("line 1: __all__:", stderr)
+        self.assertEqual(Customer.objects.count(), 3)
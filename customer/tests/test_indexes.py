@@ -0,0 +1,78 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from customer.models import Customer, ServiceHistory
+from tenant.tests.test_middleware import create_company
+
+
+class CustomerIndexPlanTestCase(TestCase):
+    """The hot customer/service queries must be answered from an index."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="pass")
+        self.customer = Customer.objects.create(
+            user=self.user, name="Meta", email="mail@gmail.com"
+        )
+        ServiceHistory.objects.create(
+            customer=self.customer, cost=Decimal(5000), created_by=self.user
+        )
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        if connection.vendor == "sqlite":
+            self.assertNotIn("USE TEMP B-TREE FOR ORDER BY", plan)
+
+    def test_last_service_uses_customer_created_index(self):
+        queryset = self.customer.services.order_by("-created")[:1]
+        self.assertUsesIndex(queryset, "service_customer_created_idx")
+
+    def test_schedule_listing_uses_schedule_created_index(self):
+        queryset = Customer.objects.filter(schedule="weekly").order_by("-created")
+        self.assertUsesIndex(queryset[:50], "customer_schedule_created_idx")
+
+    def test_due_on_uses_next_service_date_index(self):
+        queryset = Customer.objects.due_on(timezone.now().date())
+        self.assertUsesIndex(queryset.order_by(), "next_service_date")
+
+
+class TenantIndexPlanTestCase(TestCase):
+    """Tenant-scoped versions of the hot queries lead on the company."""
+
+    assertUsesIndex = CustomerIndexPlanTestCase.assertUsesIndex
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="pass")
+        self.company = create_company("acme")
+        self.customer = Customer.objects.create(
+            user=self.user, company=self.company, name="Meta", email="mail@gmail.com"
+        )
+        ServiceHistory.objects.create(
+            customer=self.customer, cost=Decimal(5000), created_by=self.user
+        )
+
+    def test_tenant_schedule_listing(self):
+        queryset = Customer.objects.for_company(self.company).filter(schedule="weekly")
+        self.assertUsesIndex(
+            queryset.order_by("-created")[:50], "customer_company_schedule_idx"
+        )
+
+    def test_tenant_recent_customers(self):
+        queryset = Customer.objects.for_company(self.company).order_by("-created")
+        self.assertUsesIndex(queryset[:50], "customer_company_created_idx")
+
+    def test_tenant_last_service(self):
+        queryset = ServiceHistory.objects.for_company(self.company).filter(
+            customer=self.customer
+        )
+        self.assertUsesIndex(
+            queryset.order_by("-created")[:1], "service_company_customer_idx"
+        )
+
+    def test_tenant_recent_services(self):
+        queryset = ServiceHistory.objects.for_company(self.company).order_by("-created")
+        self.assertUsesIndex(queryset[:50], "service_company_created_idx")
@@ -6,6 +6,8 @@ from django.db import IntegrityError
 from django.test import TestCase, Client
 from django.utils import timezone
 from customer.models import Customer, ServiceHistory
+from tenant.context import use_tenant
+from tenant.tests.test_middleware import create_company
 
 
 def get_user_data(username="testuser", password="testpass123"):
@@ -192,3 +194,199 @@ class CustomerServiceHistoryTestCase(TestCase):
         )
         self.assertListEqual(list(ServiceHistory.objects.all()), [history2, history1])
         self.assertEqual(ServiceHistory.objects.first(), history2)
+
+
+class CustomerServiceDatesTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(**get_user_data(random_username()))
+        self.customer = Customer.objects.create(**get_customer_data())
+
+    def test_service_dates_empty_without_services(self):
+        self.assertIsNone(self.customer.last_service_date)
+        self.assertIsNone(self.customer.next_service_date)
+
+    def test_service_dates_updated_on_service_creation(self):
+        ServiceHistory.objects.create(
+            customer=self.customer, cost=Decimal(5000), created_by=self.user
+        )
+        self.customer.refresh_from_db()
+        today = timezone.now().date()
+        self.assertEqual(self.customer.last_service_date, today)
+        self.assertEqual(
+            self.customer.next_service_date, today + timezone.timedelta(weeks=1)
+        )
+
+    def test_older_service_does_not_move_dates_backwards(self):
+        today = timezone.now().date()
+        self.customer.record_service_date(today)
+        stale = Customer.objects.get(pk=self.customer.pk)
+        stale.last_service_date = None
+        stale.record_service_date(today - timezone.timedelta(days=10))
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.last_service_date, today)
+
+    def test_next_service_date_follows_schedule_change(self):
+        self.customer.record_service_date(timezone.now().date())
+        self.customer.schedule = "monthly"
+        self.customer.save(update_fields=["schedule"])
+        self.customer.refresh_from_db()
+        self.assertEqual(
+            self.customer.next_service_date,
+            self.customer.last_service_date + timezone.timedelta(days=30),
+        )
+
+    def test_service_dates_refreshed_on_service_deletion(self):
+        service = ServiceHistory.objects.create(
+            customer=self.customer, cost=Decimal(5000), created_by=self.user
+        )
+        service.delete()
+        self.customer.refresh_from_db()
+        self.assertIsNone(self.customer.last_service_date)
+        self.assertIsNone(self.customer.next_service_date)
+
+    def test_service_dates_refreshed_on_queryset_deletion(self):
+        today = timezone.now()
+        for days in (0, 10):
+            ServiceHistory.objects.create(
+                customer=self.customer,
+                cost=Decimal(5000),
+                created_by=self.user,
+                created=today - timezone.timedelta(days=days),
+            )
+        self.customer.services.filter(
+            created__gt=today - timezone.timedelta(days=1)
+        ).delete()
+        self.customer.refresh_from_db()
+        last = (today - timezone.timedelta(days=10)).date()
+        self.assertEqual(self.customer.last_service_date, last)
+        self.assertEqual(
+            self.customer.next_service_date, last + timezone.timedelta(weeks=1)
+        )
+
+    def test_customer_deletion_cascades_history(self):
+        ServiceHistory.objects.create(
+            customer=self.customer, cost=Decimal(5000), created_by=self.user
+        )
+        self.customer.delete()
+        self.assertFalse(ServiceHistory.objects.exists())
+
+    def test_due_on(self):
+        ServiceHistory.objects.create(
+            customer=self.customer, cost=Decimal(5000), created_by=self.user
+        )
+        due_date = timezone.now().date() + timezone.timedelta(weeks=1)
+        with self.assertNumQueries(1):
+            self.assertListEqual(
+                list(Customer.objects.due_on(due_date)), [self.customer]
+            )
+        self.assertFalse(Customer.objects.due_on(timezone.now().date()).exists())
+
+    def test_sync_service_dates(self):
+        ServiceHistory.objects.create(
+            customer=self.customer, cost=Decimal(5000), created_by=self.user
+        )
+        Customer.objects.update(last_service_date=None, next_service_date=None)
+        self.assertEqual(Customer.objects.sync_service_dates(), 1)
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.last_service_date, timezone.now().date())
+
+
+class CustomerServiceStatsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(**get_user_data(random_username()))
+        self.customer = Customer.objects.create(**get_customer_data())
+        for cost in (5000, 12000):
+            ServiceHistory.objects.create(
+                customer=self.customer, cost=Decimal(cost), created_by=self.user
+            )
+        self.idle = Customer.objects.create(
+            user=User.objects.create_user(**get_user_data(random_username())),
+            name="Idle",
+            email=random_mail(),
+        )
+
+    def test_with_service_stats_single_query(self):
+        with self.assertNumQueries(1):
+            stats = {
+                customer.pk: (
+                    customer.get_last_service_cost,
+                    customer.get_service_count,
+                    customer.get_total_spend,
+                )
+                for customer in Customer.objects.with_service_stats()
+            }
+        self.assertEqual(stats[self.customer.pk], (Decimal(12000), 2, Decimal(17000)))
+        self.assertEqual(stats[self.idle.pk], (None, 0, Decimal(0)))
+
+    def test_with_service_stats_last_service_date(self):
+        customer = Customer.objects.with_service_stats().get(pk=self.customer.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(customer.get_last_service_date, timezone.now().date())
+
+    def test_properties_without_annotations(self):
+        self.assertEqual(self.customer.get_last_service_cost, Decimal(12000))
+        self.assertEqual(self.customer.get_service_count, 2)
+        self.assertEqual(self.customer.get_total_spend, Decimal(17000))
+        self.assertEqual(self.idle.get_total_spend, 0)
+
+
+class ServiceHistoryCompanyTestCase(TestCase):
+    def setUp(self):
+        self.acme = create_company("acme")
+        self.other = create_company("other")
+        self.user = User.objects.create_user(**get_user_data())
+        self.customer = Customer.objects.create(
+            user=self.user, company=self.acme, name="Meta", email=random_mail()
+        )
+
+    def test_company_copied_on_create(self):
+        service = ServiceHistory.objects.create(
+            customer=self.customer, cost=Decimal(100), created_by=self.user
+        )
+        self.assertEqual(service.company, self.acme)
+
+    def test_company_copied_in_batch(self):
+        (service,) = ServiceHistory.objects.record_batch(
+            [ServiceHistory(customer=self.customer, cost=100, created_by=self.user)]
+        )
+        self.assertEqual(service.company_id, self.acme.pk)
+
+    def test_history_moves_with_customer(self):
+        ServiceHistory.objects.create(
+            customer=self.customer, cost=Decimal(100), created_by=self.user
+        )
+        customer = Customer.objects.get(pk=self.customer.pk)
+        customer.company = self.other
+        customer.save()
+        self.assertEqual(
+            list(ServiceHistory.objects.values_list("company", flat=True)),
+            [self.other.pk],
+        )
+
+    def test_history_moves_under_destination_tenant(self):
+        ServiceHistory.objects.create(
+            customer=self.customer, cost=Decimal(100), created_by=self.user
+        )
+        customer = Customer.objects.get(pk=self.customer.pk)
+        customer.company = self.other
+        with use_tenant(self.other):
+            customer.save()
+            self.assertEqual(ServiceHistory.objects.count(), 1)
+
+    def test_sync_companies(self):
+        ServiceHistory.objects.create(
+            customer=self.customer, cost=Decimal(100), created_by=self.user
+        )
+        other_user = User.objects.create_user(**get_user_data(random_username()))
+        unassigned = Customer.objects.create(
+            user=other_user, name="Alphabet", email=random_mail()
+        )
+        ServiceHistory.objects.create(
+            customer=unassigned, cost=Decimal(100), created_by=self.user
+        )
+        ServiceHistory.objects.update(company=None)
+        self.assertEqual(ServiceHistory.objects.sync_companies(), 1)
+        self.assertEqual(
+            ServiceHistory.objects.get(customer=self.customer).company, self.acme
+        )
+        self.assertEqual(ServiceHistory.objects.sync_companies(), 0)
@@ -0,0 +1,87 @@
+from decimal import Decimal
+
+import django_rq
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from fakeredis import FakeStrictRedis
+
+from customer.models import Customer, Reminder
+from customer.reminders import schedule_reminders, send_reminders
+
+
+def get_queue(is_async=False):
+    return django_rq.get_queue(
+        "default", connection=FakeStrictRedis(), is_async=is_async
+    )
+
+
+class FailingEmailBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise OSError("Connection refused")
+
+
+class ReminderTestCase(TestCase):
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.tomorrow = self.today + timezone.timedelta(days=1)
+        self.customers = []
+        for i in range(5):
+            customer = Customer.objects.create(
+                user=User.objects.create_user(username=f"testuser{i}", password="pass"),
+                name=f"Customer {i}",
+                email=f"customer{i}@mail.com",
+                schedule="daily",
+            )
+            customer.record_service_date(self.today)
+            self.customers.append(customer)
+        # Due next week, outside the default one-day notice window.
+        self.customers[-1].schedule = "weekly"
+        self.customers[-1].save()
+
+    def test_schedule_reminders_enqueues_chunks(self):
+        queue = get_queue(is_async=True)
+        job_ids = schedule_reminders(chunk_size=2, today=self.today, queue=queue)
+        self.assertEqual(len(job_ids), 2)
+        self.assertEqual(queue.count, 2)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_rerun_does_not_enqueue_twice(self):
+        queue = get_queue(is_async=True)
+        first = schedule_reminders(chunk_size=2, today=self.today, queue=queue)
+        second = schedule_reminders(chunk_size=2, today=self.today, queue=queue)
+        self.assertListEqual(first, second)
+        self.assertEqual(queue.count, 2)
+
+    def test_reminders_sent_once(self):
+        queue = get_queue()
+        schedule_reminders(chunk_size=2, today=self.today, queue=queue)
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertEqual(Reminder.objects.filter(due_date=self.tomorrow).count(), 4)
+        # A rerun with different chunking still finds every customer claimed.
+        schedule_reminders(chunk_size=3, today=self.today, queue=queue)
+        self.assertEqual(len(mail.outbox), 4)
+
+    def test_send_reminders_message(self):
+        customer = self.customers[0]
+        self.assertEqual(send_reminders([customer.pk]), 1)
+        self.assertEqual(send_reminders([customer.pk]), 0)
+        self.assertListEqual(mail.outbox[0].to, [customer.email])
+        self.assertIn(customer.name, mail.outbox[0].body)
+
+    def test_wider_notice_window(self):
+        schedule_reminders(notice_days=7, today=self.today, queue=get_queue())
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_failed_send_is_retried_on_rerun(self):
+        queue = get_queue()
+        backend = "customer.tests.test_reminders.FailingEmailBackend"
+        with override_settings(EMAIL_BACKEND=backend):
+            schedule_reminders(chunk_size=2, today=self.today, queue=queue)
+        self.assertEqual(queue.failed_job_registry.count, 2)
+        self.assertFalse(Reminder.objects.exists())
+        schedule_reminders(chunk_size=2, today=self.today, queue=queue)
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertEqual(Reminder.objects.count(), 4)
@@ -0,0 +1,85 @@
+import random
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from customer.enums import ScheduleChoices
+from customer.models import Customer, ServiceHistory, compute_next_service_date
+from customer.scheduling import SCHEDULE_CODES, DueDateIndex
+
+
+def brute_force_calendar(customers, start, days):
+    calendar = {start + timezone.timedelta(days=day): [] for day in range(days)}
+    for pk, schedule, last_service_date in customers:
+        due = max(compute_next_service_date(schedule, last_service_date), start)
+        while due < start + timezone.timedelta(days=days):
+            calendar[due].append(pk)
+            due = compute_next_service_date(schedule, due)
+    return calendar
+
+
+class DueDateIndexTestCase(TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.today = timezone.now().date()
+        self.customers = [
+            (
+                pk,
+                rng.choice(list(ScheduleChoices)).value,
+                self.today - timezone.timedelta(days=rng.randint(0, 400)),
+            )
+            for pk in range(1, 301)
+        ]
+        self.index = DueDateIndex(
+            ids=[pk for pk, _, _ in self.customers],
+            codes=[SCHEDULE_CODES[schedule] for _, schedule, _ in self.customers],
+            last_service=[last.toordinal() for _, _, last in self.customers],
+        )
+
+    def test_calendar_matches_schedule_intervals(self):
+        expected = brute_force_calendar(self.customers, self.today, 90)
+        calendar = self.index.calendar(self.today, 90)
+        self.assertEqual(len(calendar), 90)
+        for day, ids in calendar:
+            self.assertListEqual(sorted(ids.tolist()), sorted(expected[day]))
+
+    def test_counts_match_calendar(self):
+        calendar = self.index.calendar(self.today, 90)
+        counts = self.index.counts(self.today, 90)
+        self.assertListEqual(counts.tolist(), [len(ids) for _, ids in calendar])
+
+    def test_due_ids_includes_overdue_customers(self):
+        expected = [
+            pk
+            for pk, schedule, last in self.customers
+            if compute_next_service_date(schedule, last) <= self.today
+        ]
+        self.assertListEqual(self.index.due_ids(self.today).tolist(), expected)
+
+    def test_empty_index(self):
+        index = DueDateIndex([], [], [])
+        self.assertEqual(index.counts(self.today, 10).sum(), 0)
+        self.assertEqual(len(index.calendar(self.today, 10)), 10)
+
+
+class DueDateIndexFromQuerysetTestCase(TestCase):
+    def test_from_queryset_skips_customers_without_services(self):
+        user = User.objects.create_user(username="testuser", password="testpass123")
+        served = Customer.objects.create(
+            user=user, name="Meta", email="meta@mail.com", schedule="daily"
+        )
+        Customer.objects.create(
+            user=User.objects.create_user(username="other", password="testpass123"),
+            name="Alphabet",
+            email="alphabet@mail.com",
+        )
+        ServiceHistory.objects.create(
+            customer=served, cost=Decimal(5000), created_by=user
+        )
+        with self.assertNumQueries(1):
+            index = DueDateIndex.from_queryset()
+        self.assertEqual(len(index), 1)
+        tomorrow = timezone.now().date() + timezone.timedelta(days=1)
+        self.assertListEqual(index.due_ids(tomorrow).tolist(), [served.pk])
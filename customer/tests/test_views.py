@@ -1,8 +1,12 @@
+import json
 import random
+from django.db import connection
 from django.template.loader import render_to_string
 from django.test import TestCase, Client
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.utils.encoding import force_str
 
 from customer.forms import CreateCustomerForm
@@ -173,3 +177,112 @@ class UpdateCustomerViewTestCase(TestCase):
         self.assertEqual(self.customer.email, data["email"])
         self.assertEqual(self.customer.phone, data["phone"])
         self.assertEqual(self.customer.schedule, data["schedule"])
+
+
+class RecordServiceBatchViewTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user_data = get_user_data()
+        self.user = User.objects.create_user(**self.user_data)
+        self.customer = Customer.objects.create(user=self.user, **get_customer_data())
+        self.other = Customer.objects.create(
+            user=User.objects.create_user(**get_user_data("otheruser")),
+            **{**get_customer_data(), "email": "other@mail.com", "schedule": "daily"},
+        )
+        self.url = reverse("customer:record_services")
+
+    def post(self, services):
+        return self.client.post(
+            self.url,
+            data=json.dumps({"services": services}),
+            content_type="application/json",
+        )
+
+    def test_batch_requires_authentication(self):
+        response = self.post([])
+        self.assertEqual(response.status_code, 302)
+
+    def test_batch_records_services(self):
+        self.client.login(**self.user_data)
+        yesterday = timezone.now() - timezone.timedelta(days=1)
+        response = self.post(
+            [
+                {"customer": self.customer.pk, "cost": "1500.00"},
+                {
+                    "customer": self.customer.pk,
+                    "cost": 2000,
+                    "created": yesterday.isoformat(),
+                },
+                {"customer": self.other.pk, "cost": 700},
+            ]
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {"created": 3})
+        self.assertEqual(ServiceHistory.objects.count(), 3)
+        self.assertTrue(
+            ServiceHistory.objects.filter(created__date=yesterday.date()).exists()
+        )
+        today = timezone.now().date()
+        self.customer.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual(self.customer.last_service_date, today)
+        self.assertEqual(
+            self.other.next_service_date, today + timezone.timedelta(days=1)
+        )
+
+    def test_batch_is_all_or_nothing(self):
+        self.client.login(**self.user_data)
+        response = self.post(
+            [
+                {"customer": self.customer.pk, "cost": 1500},
+                {"customer": self.customer.pk, "cost": -100},
+                {"customer": 999, "cost": 100},
+            ]
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertListEqual(sorted(errors), ["1", "2"])
+        self.assertIn("Cost cannot be negative", errors["1"]["cost"])
+        self.assertIn("Customer does not exist", errors["2"]["customer"])
+        self.assertEqual(ServiceHistory.objects.count(), 0)
+
+    def test_batch_rejects_future_times(self):
+        self.client.login(**self.user_data)
+        tomorrow = timezone.now() + timezone.timedelta(days=1)
+        response = self.post(
+            [
+                {
+                    "customer": self.customer.pk,
+                    "cost": 1500,
+                    "created": tomorrow.isoformat(),
+                }
+            ]
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(
+            "Service time cannot be in the future",
+            response.json()["errors"]["0"]["created"],
+        )
+        self.customer.refresh_from_db()
+        self.assertIsNone(self.customer.next_service_date)
+
+    def test_batch_invalid_body(self):
+        self.client.login(**self.user_data)
+        response = self.client.post(
+            self.url, data="not json", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.post([]).status_code, 400)
+
+    def test_batch_writes_in_bulk(self):
+        self.client.login(**self.user_data)
+        services = [{"customer": self.customer.pk, "cost": 100}] * 50
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(services)
+        self.assertEqual(response.status_code, 201)
+        inserts = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('INSERT INTO "customer_servicehistory"')
+        ]
+        self.assertEqual(len(inserts), 1)
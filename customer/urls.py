@@ -6,4 +6,9 @@ app_name = "customer"
 urlpatterns = [
     path("create", views.CreateCustomerView.as_view(), name="create"),
     path("update/<int:pk>", views.UpdateCustomerView.as_view(), name="update"),
+    path(
+        "services/batch",
+        views.RecordServiceBatchView.as_view(),
+        name="record_services",
+    ),
 ]
@@ -1,13 +1,20 @@
+import json
+
 from braces.views import LoginRequiredMixin
+from django.http import Http404, JsonResponse
 from django.shortcuts import render
 from django.urls import reverse_lazy
+from django.utils import timezone
+from django.views import View
 from django.views.generic import CreateView, UpdateView
 
-from customer.forms import CreateCustomerForm
-from customer.models import Customer
+from core import cache
+from core.mixins import AsyncLoginRequiredMixin, AsyncModelFormMixin
+from customer.forms import CreateCustomerForm, ServiceBatchEntryForm
+from customer.models import Customer, ServiceHistory
 
 
-class CreateCustomerView(LoginRequiredMixin, CreateView):
+class CreateCustomerView(AsyncLoginRequiredMixin, AsyncModelFormMixin, CreateView):
     template_name = "customer/create.html"
     model = Customer
     form_class = CreateCustomerForm
@@ -20,16 +27,86 @@ class CreateCustomerView(LoginRequiredMixin, CreateView):
 
     def form_valid(self, form):
         form.instance.user = self.request.user
+        form.instance.company = self.request.tenant
         return super().form_valid(form)
 
 
-class UpdateCustomerView(LoginRequiredMixin, UpdateView):
+class UpdateCustomerView(AsyncLoginRequiredMixin, AsyncModelFormMixin, UpdateView):
     model = Customer
     template_name = "customer/update.html"
     form_class = CreateCustomerForm
     success_url = reverse_lazy("core:dashboard")
 
+    async def aget_object(self):
+        pk = self.kwargs["pk"]
+        # Writes always read the row from the database.
+        if self.request.method == "GET":
+            customer = await cache.aget_object(Customer, pk)
+        else:
+            customer = await self.get_queryset().filter(pk=pk).afirst()
+        if customer is None:
+            raise Http404("No customer found matching the query")
+        return customer
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["title"] = "Update Customer Information"
         return context
+
+
+class RecordServiceBatchView(LoginRequiredMixin, View):
+    """
+    Record a whole route in one request. The body is JSON of the form
+    ``{"services": [{"customer": 1, "cost": "1500.00", "created": "..."}]}``.
+    The batch is all-or-nothing: any invalid entry rejects the request with
+    per-entry errors, otherwise every entry is written in one transaction.
+    """
+
+    max_entries = 1000
+
+    def post(self, request, *args, **kwargs):
+        try:
+            entries = json.loads(request.body).get("services")
+        except (ValueError, AttributeError):
+            return JsonResponse({"error": "Invalid JSON body"}, status=400)
+        if not isinstance(entries, list) or not entries:
+            return JsonResponse(
+                {"error": "services must be a non-empty list"}, status=400
+            )
+        if len(entries) > self.max_entries:
+            return JsonResponse(
+                {"error": f"A batch holds at most {self.max_entries} services"},
+                status=400,
+            )
+
+        errors = {}
+        forms = []
+        for index, entry in enumerate(entries):
+            form = ServiceBatchEntryForm(data=entry if isinstance(entry, dict) else {})
+            if form.is_valid():
+                forms.append((index, form))
+            else:
+                errors[index] = {
+                    field: list(messages) for field, messages in form.errors.items()
+                }
+        customer_ids = {form.cleaned_data["customer"] for _, form in forms}
+        known = set(
+            Customer.objects.filter(pk__in=customer_ids).values_list("pk", flat=True)
+        )
+        for index, form in forms:
+            if form.cleaned_data["customer"] not in known:
+                errors[index] = {"customer": ["Customer does not exist"]}
+        if errors:
+            return JsonResponse({"errors": errors}, status=400)
+
+        now = timezone.now()
+        services = ServiceHistory.objects.record_batch(
+            ServiceHistory(
+                customer_id=form.cleaned_data["customer"],
+                cost=form.cleaned_data["cost"],
+                created=form.cleaned_data["created"] or now,
+                created_by=request.user,
+            )
+            for _, form in forms
+        )
+        return JsonResponse({"created": len(services)}, status=201)
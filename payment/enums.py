@@ -0,0 +1,8 @@
+from django.db.models import TextChoices
+
+
+class ReconciliationStatus(TextChoices):
+    MATCHED = "matched", "Matched"
+    AMOUNT_MISMATCH = "amount_mismatch", "Amount Mismatch"
+    MISSING_PAYMENT = "missing_payment", "Settled, No Payment Recorded"
+    MISSING_SETTLEMENT = "missing_settlement", "Recorded, Not Settled"
@@ -0,0 +1,158 @@
+"""
+Webhook and API formats of the supported payment gateways.
+
+Both gateways sign the raw webhook body with HMAC-SHA512 under the
+merchant's secret key and send the hex digest in a header. Amounts arrive
+in kobo and are converted to naira here. payment.client makes the HTTP
+calls; this module only builds requests and reads responses.
+"""
+
+import hashlib
+import hmac
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from decimal import Decimal
+from urllib.parse import quote
+
+from django.conf import settings
+
+Charge = namedtuple("Charge", ["reference", "amount", "currency", "email", "metadata"])
+# status is "success", the gateway's own status for other outcomes, or
+# "error" when the gateway could not be asked (see payment.client).
+Verification = namedtuple(
+    "Verification", ["reference", "status", "amount", "currency", "error"]
+)
+
+
+class Gateway(ABC):
+    name = None
+    signature_header = None
+    secret_setting = None
+    # Reference and amount (in naira) headers of the settlement report.
+    settlement_columns = ("reference", "amount")
+    api_url_setting = None
+    rate_limit_setting = None
+
+    def verify(self, body, signature):
+        secret = getattr(settings, self.secret_setting, "")
+        if not secret or not signature:
+            return False
+        expected = hmac.new(secret.encode(), body, hashlib.sha512).hexdigest()
+        return hmac.compare_digest(expected, signature.strip().lower())
+
+    def event_type(self, payload):
+        return payload["event"]
+
+    @abstractmethod
+    def event_key(self, payload):
+        """The gateway's unique id for this delivery's event."""
+
+    @abstractmethod
+    def charge(self, payload):
+        """The successful Charge this event reports, or None."""
+
+    def api_headers(self):
+        return {}
+
+    @abstractmethod
+    def verify_request(self, reference):
+        """(path, query params) of the transaction verify endpoint."""
+
+    @abstractmethod
+    def verification(self, reference, status_code, payload):
+        """Verification from the verify endpoint's response."""
+
+
+class Paystack(Gateway):
+    name = "paystack"
+    signature_header = "X-Paystack-Signature"
+    secret_setting = "PAYSTACK_SECRET_KEY"
+    api_url_setting = "PAYSTACK_API_URL"
+    rate_limit_setting = "PAYSTACK_RATE_LIMIT"
+
+    def event_key(self, payload):
+        return f"{payload['event']}:{payload['data']['id']}"
+
+    def charge(self, payload):
+        data = payload["data"]
+        if payload["event"] != "charge.success" or data.get("status") != "success":
+            return None
+        return Charge(
+            reference=data["reference"],
+            amount=Decimal(data["amount"]) / 100,
+            currency=data.get("currency", "NGN"),
+            email=(data.get("customer") or {}).get("email", ""),
+            metadata=data.get("metadata") or {},
+        )
+
+    def api_headers(self):
+        if not settings.PAYSTACK_SECRET_KEY:
+            return {}
+        return {"Authorization": f"Bearer {settings.PAYSTACK_SECRET_KEY}"}
+
+    def verify_request(self, reference):
+        return f"/transaction/verify/{quote(reference, safe='')}", {}
+
+    def verification(self, reference, status_code, payload):
+        data = payload.get("data") or {}
+        if status_code != 200 or not isinstance(data, dict):
+            return Verification(reference, "failed", None, None, payload.get("message"))
+        return Verification(
+            reference,
+            data.get("status", "failed"),
+            Decimal(data["amount"]) / 100 if "amount" in data else None,
+            data.get("currency"),
+            None,
+        )
+
+
+class Interswitch(Gateway):
+    name = "interswitch"
+    signature_header = "X-Interswitch-Signature"
+    secret_setting = "INTERSWITCH_SECRET_KEY"
+    settlement_columns = ("merchant reference", "amount")
+    api_url_setting = "INTERSWITCH_API_URL"
+    rate_limit_setting = "INTERSWITCH_RATE_LIMIT"
+    currencies = {"566": "NGN"}
+
+    def event_key(self, payload):
+        return payload.get("uuid") or (
+            f"{payload['event']}:{payload['data']['paymentReference']}"
+        )
+
+    def charge(self, payload):
+        data = payload["data"]
+        if (
+            payload["event"] != "TRANSACTION.COMPLETED"
+            or data.get("responseCode") != "00"
+        ):
+            return None
+        currency = str(data.get("currencyCode", "566"))
+        return Charge(
+            reference=data["merchantReference"],
+            amount=Decimal(data["amount"]) / 100,
+            currency=self.currencies.get(currency, currency),
+            email=data.get("customerEmail", ""),
+            metadata=data.get("metadata") or {},
+        )
+
+    def verify_request(self, reference):
+        return "/collections/api/v1/gettransaction.json", {
+            "merchantcode": settings.INTERSWITCH_MERCHANT_CODE,
+            "transactionreference": reference,
+        }
+
+    def verification(self, reference, status_code, payload):
+        if status_code != 200:
+            return Verification(reference, "failed", None, None, str(payload))
+        code = payload.get("ResponseCode")
+        return Verification(
+            reference,
+            "success" if code == "00" else code or "failed",
+            Decimal(payload["Amount"]) / 100 if "Amount" in payload else None,
+            "NGN",
+            payload.get("ResponseDescription") if code != "00" else None,
+        )
+
+
+GATEWAYS = {gateway.name: gateway for gateway in (Paystack(), Interswitch())}
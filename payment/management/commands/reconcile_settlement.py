@@ -0,0 +1,57 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payment.gateways import GATEWAYS
+from payment.reconciliation import CHUNK_SIZE, reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconcile a gateway settlement report (CSV) against the recorded "
+        "payments and store the matched, mismatched and missing references."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("gateway", choices=list(GATEWAYS))
+        parser.add_argument("path")
+        parser.add_argument(
+            "--from",
+            dest="period_start",
+            type=date.fromisoformat,
+            help="First day the report settles",
+        )
+        parser.add_argument(
+            "--to",
+            dest="period_end",
+            type=date.fromisoformat,
+            help="Last day the report settles",
+        )
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        period = None
+        if options["period_start"] or options["period_end"]:
+            if not (options["period_start"] and options["period_end"]):
+                raise CommandError("--from and --to must be given together")
+            period = (options["period_start"], options["period_end"])
+        try:
+            # utf-8-sig: spreadsheet exports often start with a BOM.
+            with open(options["path"], newline="", encoding="utf-8-sig") as lines:
+                reconciliation = reconcile(
+                    options["gateway"],
+                    lines,
+                    source=options["path"],
+                    period=period,
+                    chunk_size=options["chunk_size"],
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(e)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reconciled {reconciliation}: {reconciliation.matched} matched, "
+                f"{reconciliation.amount_mismatches} amount mismatches, "
+                f"{reconciliation.missing_payments} missing payments, "
+                f"{reconciliation.missing_settlements} missing settlements"
+            )
+        )
@@ -1,3 +1,130 @@
 from django.db import models
 
-# Create your models here.
+from customer.models import Customer
+from payment.enums import ReconciliationStatus
+from subscription.models import Invoice
+
+
+class WebhookEvent(models.Model):
+    """
+    Inbox of verified webhook deliveries, stored as received. Gateways
+    redeliver events; the (gateway, event_key) constraint absorbs repeats.
+    """
+
+    gateway = models.CharField(max_length=20)
+    event_key = models.CharField(max_length=255)
+    event_type = models.CharField(max_length=100)
+    body = models.TextField()
+    received = models.DateTimeField(auto_now_add=True)
+    processed = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.gateway}: {self.event_key}"
+
+    class Meta:
+        ordering = ["-received"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["gateway", "event_key"], name="unique_webhook_event"
+            ),
+        ]
+
+
+class Payment(models.Model):
+    gateway = models.CharField(max_length=20)
+    reference = models.CharField(max_length=255)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    currency = models.CharField(max_length=3, default="NGN")
+    email = models.EmailField(blank=True)
+    customer = models.ForeignKey(
+        Customer,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="payments",
+    )
+    invoice = models.ForeignKey(
+        Invoice,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="payments",
+    )
+    event = models.ForeignKey(WebhookEvent, on_delete=models.PROTECT)
+    # Set once the gateway's verify endpoint confirmed the amount.
+    verified = models.DateTimeField(null=True, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.gateway}: {self.reference} - {self.amount}"
+
+    class Meta:
+        ordering = ["-created"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["gateway", "reference"], name="unique_gateway_payment"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["gateway", "created"], name="payment_gateway_created_idx"
+            ),
+        ]
+
+
+class Reconciliation(models.Model):
+    """One settlement report checked against the recorded payments."""
+
+    gateway = models.CharField(max_length=20)
+    source = models.CharField(max_length=255, blank=True)
+    period_start = models.DateField(null=True, blank=True)
+    period_end = models.DateField(null=True, blank=True)
+    matched = models.PositiveIntegerField(default=0)
+    amount_mismatches = models.PositiveIntegerField(default=0)
+    missing_payments = models.PositiveIntegerField(default=0)
+    missing_settlements = models.PositiveIntegerField(default=0)
+    created = models.DateTimeField(auto_now_add=True)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.gateway}: {self.source or self.created}"
+
+    class Meta:
+        ordering = ["-created"]
+
+
+class ReconciliationItem(models.Model):
+    reconciliation = models.ForeignKey(
+        Reconciliation, on_delete=models.CASCADE, related_name="items"
+    )
+    status = models.CharField(max_length=20, choices=ReconciliationStatus.choices)
+    reference = models.CharField(max_length=255)
+    settled_amount = models.DecimalField(
+        max_digits=12, decimal_places=2, null=True, blank=True
+    )
+    recorded_amount = models.DecimalField(
+        max_digits=12, decimal_places=2, null=True, blank=True
+    )
+    billed_amount = models.DecimalField(
+        max_digits=12, decimal_places=2, null=True, blank=True
+    )
+    payment = models.ForeignKey(
+        Payment, null=True, blank=True, on_delete=models.SET_NULL
+    )
+
+    def __str__(self):
+        return f"{self.reference}: {self.status}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["reconciliation", "reference"],
+                name="unique_reconciliation_reference",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["reconciliation", "status"],
+                name="reconciliation_status_idx",
+            ),
+        ]
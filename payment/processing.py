@@ -0,0 +1,120 @@
+"""
+Webhook processing, off the request path.
+
+The webhook view only verifies, stores and enqueues; ``process_event`` runs
+on django-rq and turns a stored event into a Payment. Job ids are derived
+from the event, so enqueuing an event twice (e.g. when a redelivery finds
+it still unprocessed) runs it once, and a processed event is skipped.
+
+``verify_payments`` confirms recorded payments with the gateway's verify
+endpoint, a page of references at a time through the async client. It
+only sees Payment rows: a charge whose webhook never arrived has no row,
+and is found by settlement reconciliation (payment.reconciliation) as a
+missing payment.
+"""
+
+import json
+from functools import partial
+
+import django_rq
+from asgiref.sync import async_to_sync
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from account import identity
+from core.jobs import enqueue_once
+from payment.client import AsyncGatewayClient
+from payment.gateways import GATEWAYS
+from payment.models import Payment, WebhookEvent
+from subscription.models import Invoice
+
+
+def enqueue_event(event_id, queue=None):
+    queue = queue or django_rq.get_queue("default")
+    job_id = f"webhook:{event_id}"
+    # A redelivery of an event whose job failed runs it again.
+    enqueue_once(queue, process_event, event_id, job_id=job_id)
+    return job_id
+
+
+def enqueue_on_commit(event_id):
+    transaction.on_commit(partial(enqueue_event, event_id))
+
+
+def process_event(event_id):
+    with transaction.atomic():
+        event = WebhookEvent.objects.select_for_update().get(pk=event_id)
+        if event.processed is not None:
+            return None
+        charge = GATEWAYS[event.gateway].charge(json.loads(event.body))
+        payment = None
+        if charge is not None:
+            payment, _ = Payment.objects.get_or_create(
+                gateway=event.gateway,
+                reference=charge.reference,
+                defaults={
+                    "amount": charge.amount,
+                    "currency": charge.currency,
+                    "email": charge.email,
+                    "customer_id": _customer_id(charge.email),
+                    "invoice_id": _invoice_id(charge.metadata),
+                    "event": event,
+                },
+            )
+        event.processed = timezone.now()
+        event.save(update_fields=["processed"])
+    return payment
+
+
+VERIFY_BATCH_SIZE = 500
+
+
+async def averify_payments(gateway, batch_size=VERIFY_BATCH_SIZE, transport=None):
+    """
+    Verify ``gateway``'s recorded, unverified payments; returns (verified,
+    unconfirmed). Unconfirmed payments (failed, amount differs or gateway
+    unreachable) stay unverified for the next run. Charges with no Payment
+    row are not looked up.
+    """
+    verified = unconfirmed = 0
+    unverified = (
+        Payment.objects.filter(gateway=gateway, verified__isnull=True)
+        .only("pk", "reference", "amount")
+        .order_by("pk")
+    )
+    last_pk = 0
+    async with AsyncGatewayClient(gateway, transport=transport) as client:
+        while page := [p async for p in unverified.filter(pk__gt=last_pk)[:batch_size]]:
+            results = await client.verify_many([p.reference for p in page])
+            now = timezone.now()
+            confirmed = []
+            for payment, result in zip(page, results):
+                if result.status == "success" and result.amount == payment.amount:
+                    payment.verified = now
+                    confirmed.append(payment)
+            await Payment.objects.abulk_update(confirmed, ["verified"])
+            verified += len(confirmed)
+            unconfirmed += len(page) - len(confirmed)
+            last_pk = page[-1].pk
+    return verified, unconfirmed
+
+
+verify_payments = async_to_sync(averify_payments)
+
+
+def _customer_id(email):
+    owner = identity.resolve(email)
+    return owner.customer_id if owner else None
+
+
+def _invoice_id(metadata):
+    invoice_id = metadata.get("invoice_id") if isinstance(metadata, dict) else None
+    if invoice_id is None:
+        return None
+    try:
+        invoice_id = Invoice._meta.pk.to_python(invoice_id)
+    except ValidationError:
+        # Metadata is whatever the payer's checkout sent; a bad id is no id.
+        return None
+    return Invoice.objects.filter(pk=invoice_id).values_list("pk", flat=True).first()
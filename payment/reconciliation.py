@@ -0,0 +1,192 @@
+"""
+Settlement reconciliation.
+
+A gateway's settlement report is streamed in chunks of CHUNK_SIZE lines.
+Each chunk becomes a reference -> amount map (the build side), is joined
+against the recorded payments with one keyed query, and its items are
+bulk inserted before the next chunk is read, so memory depends on the
+chunk size and not on the length of the report. Payments of the period
+that no line settled are then found with an anti-join in the database,
+walked in primary-key pages.
+
+Amounts are compared with the payment and, when the payment settles an
+invoice, with the invoice (what was billed, e.g. the ServiceHistory cost
+of a per-service cycle). A reference the report repeats with the same
+amount is reconciled once; repeated with a different amount (e.g. a
+reversal), its item is an amount mismatch, whichever chunk the repeat is in.
+
+The header is checked before the run is created, and a run that fails on
+a later line is deleted with its items, so no half-finished run is left.
+"""
+
+import csv
+from datetime import datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db.models import Count, Exists, OuterRef
+from django.utils import timezone
+
+from payment.enums import ReconciliationStatus
+from payment.gateways import GATEWAYS
+from payment.models import Payment, Reconciliation, ReconciliationItem
+
+# Keeps reference__in under SQLite's 999-parameter limit.
+CHUNK_SIZE = 900
+
+COUNTERS = {
+    ReconciliationStatus.MATCHED: "matched",
+    ReconciliationStatus.AMOUNT_MISMATCH: "amount_mismatches",
+    ReconciliationStatus.MISSING_PAYMENT: "missing_payments",
+    ReconciliationStatus.MISSING_SETTLEMENT: "missing_settlements",
+}
+
+
+def read_settlement(lines, gateway):
+    """
+    (reference, amount) pairs from a settlement CSV's ``lines``. The header
+    is checked on the call; a bad row raises once it is reached.
+    """
+    rows = csv.reader(lines)
+    header = [column.strip().lower() for column in next(rows, [])]
+    try:
+        ref_col, amount_col = (
+            header.index(column) for column in GATEWAYS[gateway].settlement_columns
+        )
+    except ValueError:
+        raise ValueError(
+            f"Settlement header must contain {GATEWAYS[gateway].settlement_columns}"
+        )
+    return _read_rows(rows, ref_col, amount_col)
+
+
+def _read_rows(rows, ref_col, amount_col):
+    for line, row in enumerate(rows, start=2):
+        if not row:
+            continue
+        try:
+            amount = Decimal(row[amount_col].replace(",", ""))
+        except (IndexError, InvalidOperation):
+            raise ValueError(f"Line {line}: invalid settlement row")
+        yield row[ref_col].strip(), amount
+
+
+def reconcile(gateway, lines, source="", period=None, chunk_size=CHUNK_SIZE):
+    """
+    Reconcile the settlement report in ``lines`` (any iterable of CSV lines,
+    e.g. an open file). With a (start, end) ``period``, payments recorded in
+    it that the report does not settle are reported as missing settlements.
+    """
+    settlements = read_settlement(lines, gateway)
+    period_start, period_end = period or (None, None)
+    reconciliation = Reconciliation.objects.create(
+        gateway=gateway,
+        source=source,
+        period_start=period_start,
+        period_end=period_end,
+    )
+    try:
+        while chunk := list(islice(settlements, chunk_size)):
+            ReconciliationItem.objects.bulk_create(_join(reconciliation, chunk))
+        if period is not None:
+            _find_missing_settlements(reconciliation, chunk_size)
+    except Exception:
+        reconciliation.delete()
+        raise
+
+    counts = (
+        reconciliation.items.values("status")
+        .annotate(count=Count("pk"))
+        .values_list("status", "count")
+        .order_by()
+    )
+    for status, count in counts:
+        setattr(reconciliation, COUNTERS[status], count)
+    reconciliation.finished = timezone.now()
+    reconciliation.save()
+    return reconciliation
+
+
+def _join(reconciliation, chunk):
+    settled = {}
+    repeated = set()
+    for reference, amount in chunk:
+        if settled.setdefault(reference, amount) != amount:
+            repeated.add(reference)
+    # Repeats of references an earlier chunk already reconciled.
+    earlier = dict(
+        reconciliation.items.filter(reference__in=settled).values_list(
+            "reference", "settled_amount"
+        )
+    )
+    changed = [ref for ref, amount in earlier.items() if settled[ref] != amount]
+    reconciliation.items.filter(reference__in=changed + list(repeated)).exclude(
+        status=ReconciliationStatus.MISSING_PAYMENT
+    ).update(status=ReconciliationStatus.AMOUNT_MISMATCH)
+    for reference in earlier:
+        del settled[reference]
+    recorded = {
+        reference: (pk, amount, billed)
+        for pk, reference, amount, billed in Payment.objects.filter(
+            gateway=reconciliation.gateway, reference__in=settled
+        )
+        .values_list("pk", "reference", "amount", "invoice__amount")
+        .order_by()
+    }
+    for reference, settled_amount in settled.items():
+        payment_id, amount, billed = recorded.get(reference, (None, None, None))
+        if payment_id is None:
+            status = ReconciliationStatus.MISSING_PAYMENT
+        elif (
+            reference in repeated
+            or settled_amount != amount
+            or billed not in (None, amount)
+        ):
+            status = ReconciliationStatus.AMOUNT_MISMATCH
+        else:
+            status = ReconciliationStatus.MATCHED
+        yield ReconciliationItem(
+            reconciliation=reconciliation,
+            status=status,
+            reference=reference,
+            settled_amount=settled_amount,
+            recorded_amount=amount,
+            billed_amount=billed,
+            payment_id=payment_id,
+        )
+
+
+def _find_missing_settlements(reconciliation, chunk_size):
+    settled = ReconciliationItem.objects.filter(
+        reconciliation=reconciliation, reference=OuterRef("reference")
+    )
+    unsettled = (
+        Payment.objects.filter(
+            ~Exists(settled),
+            gateway=reconciliation.gateway,
+            created__gte=_start_of(reconciliation.period_start),
+            created__lt=_start_of(reconciliation.period_end + timedelta(days=1)),
+        )
+        .values_list("pk", "reference", "amount", "invoice__amount")
+        .order_by("pk")
+    )
+    last_pk = 0
+    # Keyset pages rather than a cursor: the items table is written to
+    # while the payments are read, which SQLite does not isolate.
+    while page := list(unsettled.filter(pk__gt=last_pk)[:chunk_size]):
+        ReconciliationItem.objects.bulk_create(
+            ReconciliationItem(
+                reconciliation=reconciliation,
+                status=ReconciliationStatus.MISSING_SETTLEMENT,
+                reference=reference,
+                recorded_amount=amount,
+                billed_amount=billed,
+                payment_id=pk,
+            )
+            for pk, reference, amount, billed in page
+        )
+        last_pk = page[-1][0]
+
+
+def _start_of(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
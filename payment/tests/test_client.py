@@ -0,0 +1,183 @@
+import asyncio
+from decimal import Decimal
+from io import StringIO
+
+import httpx
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from payment import client
+from payment.client import AsyncGatewayClient, RateLimit, backoff
+from payment.models import Payment, WebhookEvent
+from payment.processing import verify_payments
+
+
+def paystack_response(request):
+    """A Paystack verify endpoint: ``ref-<kobo>`` was paid <kobo>."""
+    reference = request.url.path.rsplit("/", 1)[-1]
+    if not reference.startswith("ref-"):
+        return httpx.Response(
+            404, json={"status": False, "message": "Transaction reference not found"}
+        )
+    return httpx.Response(
+        200,
+        json={
+            "status": True,
+            "data": {
+                "status": "success",
+                "reference": reference,
+                "amount": int(reference[4:]),
+                "currency": "NGN",
+            },
+        },
+    )
+
+
+@override_settings(
+    PAYSTACK_API_URL="https://paystack.test",
+    PAYSTACK_SECRET_KEY="sk_test",
+    PAYSTACK_RATE_LIMIT=0,
+    PAYMENT_GATEWAY_BACKOFF=0,
+    PAYMENT_GATEWAY_RETRIES=2,
+)
+class GatewayClientTestCase(SimpleTestCase):
+    def setUp(self):
+        client._rate_limits.clear()
+        self.calls = 0
+
+    async def verify(self, handler, reference):
+        async with AsyncGatewayClient(
+            "paystack", transport=httpx.MockTransport(handler)
+        ) as gateway:
+            return await gateway.verify(reference)
+
+    async def test_success(self):
+        def handler(request):
+            self.assertEqual(request.headers["Authorization"], "Bearer sk_test")
+            return paystack_response(request)
+
+        result = await self.verify(handler, "ref-250000")
+        self.assertEqual(result.status, "success")
+        self.assertEqual(result.amount, Decimal(2500))
+
+    async def test_unknown_reference(self):
+        result = await self.verify(paystack_response, "nope")
+        self.assertEqual(result.status, "failed")
+        self.assertEqual(result.error, "Transaction reference not found")
+
+    async def test_retries_server_errors(self):
+        def handler(request):
+            self.calls += 1
+            if self.calls < 3:
+                return httpx.Response(503)
+            return paystack_response(request)
+
+        self.assertEqual((await self.verify(handler, "ref-100")).status, "success")
+        self.assertEqual(self.calls, 3)
+
+    async def test_gives_up_after_retries(self):
+        def handler(request):
+            self.calls += 1
+            raise httpx.ConnectError("connection refused", request=request)
+
+        result = await self.verify(handler, "ref-100")
+        self.assertEqual(result.status, "error")
+        self.assertIn("connection refused", result.error)
+        self.assertEqual(self.calls, 3)
+
+
+@override_settings(
+    PAYSTACK_API_URL="https://paystack.test",
+    PAYSTACK_RATE_LIMIT=0,
+    PAYMENT_GATEWAY_BACKOFF=0,
+)
+class AsyncGatewayClientTestCase(SimpleTestCase):
+    def setUp(self):
+        client._rate_limits.clear()
+
+    async def test_verify_many_is_bounded_and_ordered(self):
+        in_flight = peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return paystack_response(request)
+
+        references = [f"ref-{i}" for i in range(1, 21)]
+        async with AsyncGatewayClient(
+            "paystack", concurrency=5, transport=httpx.MockTransport(handler)
+        ) as gateway:
+            results = await gateway.verify_many(references)
+        self.assertEqual([r.reference for r in results], references)
+        self.assertEqual(peak, 5)
+
+
+class RateLimitTestCase(SimpleTestCase):
+    def test_slots_are_spaced(self):
+        limit = RateLimit(10)
+        self.assertEqual(limit.reserve(), 0)
+        self.assertAlmostEqual(limit.reserve(), 0.1, places=2)
+        self.assertAlmostEqual(limit.reserve(), 0.2, places=2)
+
+    def test_burst(self):
+        limit = RateLimit(10, burst=3)
+        self.assertEqual([limit.reserve() for _ in range(3)], [0, 0, 0])
+        self.assertGreater(limit.reserve(), 0)
+
+    @override_settings(PAYMENT_GATEWAY_BACKOFF=1)
+    def test_backoff(self):
+        self.assertLessEqual(backoff(3), 4)
+        response = httpx.Response(429, headers={"Retry-After": "7"})
+        self.assertEqual(backoff(1, response), 7)
+
+    @override_settings(PAYMENT_GATEWAY_TIMEOUT=10, PAYMENT_GATEWAY_RETRIES=3)
+    def test_retry_after_is_capped(self):
+        response = httpx.Response(429, headers={"Retry-After": "86400"})
+        self.assertEqual(backoff(1, response), 30)
+
+
+@override_settings(
+    PAYSTACK_API_URL="https://paystack.test",
+    PAYSTACK_RATE_LIMIT=0,
+    PAYMENT_GATEWAY_BACKOFF=0,
+)
+class VerifyPaymentsTestCase(TestCase):
+    def setUp(self):
+        client._rate_limits.clear()
+        event = WebhookEvent.objects.create(
+            gateway="paystack", event_key="seed", event_type="seed", body="{}"
+        )
+        for reference, amount in [("ref-1000", 10), ("ref-2000", 25), ("x", 5)]:
+            Payment.objects.create(
+                gateway="paystack",
+                reference=reference,
+                amount=Decimal(amount),
+                event=event,
+            )
+
+    def test_verify_payments(self):
+        transport = httpx.MockTransport(paystack_response)
+        self.assertEqual(
+            verify_payments("paystack", batch_size=2, transport=transport), (1, 2)
+        )
+        self.assertEqual(
+            list(
+                Payment.objects.filter(verified__isnull=False).values_list(
+                    "reference", flat=True
+                )
+            ),
+            ["ref-1000"],
+        )
+        # Verified payments are not asked about again.
+        self.assertEqual(verify_payments("paystack", transport=transport), (0, 2))
+
+    @override_settings(PAYMENT_GATEWAY_RETRIES=0)
+    def test_command(self):
+        # Nothing listens on the test API URL: every payment stays unconfirmed.
+        out = StringIO()
+        with override_settings(PAYSTACK_API_URL="http://127.0.0.1:9"):
+            call_command("verify_payments", "paystack", stdout=out)
+        self.assertIn("0 payments verified, 3 unconfirmed", out.getvalue())
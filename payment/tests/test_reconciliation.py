@@ -0,0 +1,197 @@
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from tempfile import NamedTemporaryFile
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from customer.models import Customer
+from payment.enums import ReconciliationStatus
+from payment.models import (
+    Payment,
+    Reconciliation,
+    ReconciliationItem,
+    WebhookEvent,
+)
+from payment.reconciliation import read_settlement, reconcile
+from subscription.billing import run_billing, start_run
+from subscription.models import Invoice, Subscription
+
+MARCH = (date(2024, 3, 1), date(2024, 3, 31))
+
+
+def settlement(*rows, header="Reference,Amount,Settled At"):
+    lines = [header] + [
+        f"{reference},{amount},2024-03-31" for reference, amount in rows
+    ]
+    return StringIO("\n".join(lines) + "\n")
+
+
+class ReadSettlementTestCase(TestCase):
+    def test_columns_are_found_by_name(self):
+        lines = StringIO('Settled At,REFERENCE,Amount\n2024-03-31,ref-1,"1,250.50"\n')
+        self.assertEqual(
+            list(read_settlement(lines, "paystack")), [("ref-1", Decimal("1250.50"))]
+        )
+
+    def test_missing_column(self):
+        with self.assertRaisesMessage(ValueError, "header"):
+            list(read_settlement(StringIO("Reference,Fee\n"), "paystack"))
+
+    def test_invalid_amount(self):
+        with self.assertRaisesMessage(ValueError, "Line 2"):
+            list(read_settlement(settlement(("ref-1", "n/a")), "paystack"))
+
+
+class ReconcileTestCase(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(
+            user=User.objects.create_user(username="testuser"),
+            name="Customer",
+            email="customer@mail.com",
+        )
+        Subscription.objects.create(
+            customer=self.customer, billing="monthly", amount=Decimal(1000)
+        )
+        self.event = WebhookEvent.objects.create(
+            gateway="paystack", event_key="seed", event_type="seed", body="{}"
+        )
+        self.payments = {
+            reference: self.create_payment(reference, amount)
+            for reference, amount in [
+                ("ref-1", 1000),
+                ("ref-2", 2000),
+                ("ref-3", 3000),
+                ("ref-4", 4000),
+            ]
+        }
+
+    def create_payment(self, reference, amount, **kwargs):
+        payment = Payment.objects.create(
+            gateway="paystack",
+            reference=reference,
+            amount=Decimal(amount),
+            event=self.event,
+            **kwargs,
+        )
+        Payment.objects.filter(pk=payment.pk).update(
+            created=datetime(2024, 3, 15, tzinfo=dt_timezone.utc)
+        )
+        return payment
+
+    def statuses(self, reconciliation):
+        return dict(reconciliation.items.values_list("reference", "status"))
+
+    def test_matched_mismatched_and_missing(self):
+        lines = settlement(
+            ("ref-1", "1000"), ("ref-2", "1999.99"), ("ref-3", "3000"), ("ref-9", "50")
+        )
+        # A lookup of earlier repeats, one join and one insert per chunk,
+        # whatever the chunk size.
+        with self.assertNumQueries(12):
+            reconciliation = reconcile("paystack", lines, period=MARCH, chunk_size=2)
+        self.assertEqual(
+            self.statuses(reconciliation),
+            {
+                "ref-1": ReconciliationStatus.MATCHED,
+                "ref-2": ReconciliationStatus.AMOUNT_MISMATCH,
+                "ref-3": ReconciliationStatus.MATCHED,
+                "ref-9": ReconciliationStatus.MISSING_PAYMENT,
+                "ref-4": ReconciliationStatus.MISSING_SETTLEMENT,
+            },
+        )
+        self.assertEqual(
+            (
+                reconciliation.matched,
+                reconciliation.amount_mismatches,
+                reconciliation.missing_payments,
+                reconciliation.missing_settlements,
+            ),
+            (2, 1, 1, 1),
+        )
+        missing = reconciliation.items.get(reference="ref-4")
+        self.assertEqual(missing.payment, self.payments["ref-4"])
+        self.assertIsNotNone(reconciliation.finished)
+
+    def test_without_period_only_the_report_is_checked(self):
+        reconciliation = reconcile("paystack", settlement(("ref-1", "1000")))
+        self.assertEqual(
+            self.statuses(reconciliation), {"ref-1": ReconciliationStatus.MATCHED}
+        )
+
+    def test_payments_outside_period_are_not_missing(self):
+        reconciliation = reconcile(
+            "paystack", settlement(), period=(date(2024, 4, 1), date(2024, 4, 30))
+        )
+        self.assertFalse(reconciliation.items.exists())
+
+    def test_repeated_reference_is_reconciled_once(self):
+        lines = settlement(("ref-1", "1000"), ("ref-1", "1000"), ("ref-1", "1000"))
+        reconciliation = reconcile("paystack", lines, chunk_size=2)
+        self.assertEqual(reconciliation.items.count(), 1)
+
+    def test_repeated_reference_with_other_amount_is_mismatch(self):
+        for chunk_size in (2, 10):
+            lines = settlement(("ref-1", "1000"), ("ref-2", "2000"), ("ref-1", "-1000"))
+            reconciliation = reconcile("paystack", lines, chunk_size=chunk_size)
+            self.assertEqual(
+                self.statuses(reconciliation),
+                {
+                    "ref-1": ReconciliationStatus.AMOUNT_MISMATCH,
+                    "ref-2": ReconciliationStatus.MATCHED,
+                },
+            )
+
+    def test_bad_header_creates_no_run(self):
+        with self.assertRaisesMessage(ValueError, "header"):
+            reconcile("paystack", StringIO("Reference,Fee\n"))
+        self.assertFalse(Reconciliation.objects.exists())
+
+    def test_bad_line_removes_run(self):
+        lines = settlement(("ref-1", "1000"), ("ref-2", "2000"), ("ref-3", "n/a"))
+        with self.assertRaisesMessage(ValueError, "Line 4"):
+            reconcile("paystack", lines, chunk_size=2)
+        self.assertFalse(Reconciliation.objects.exists())
+        self.assertFalse(ReconciliationItem.objects.exists())
+
+    def test_payment_short_of_invoice(self):
+        run_billing(start_run("monthly", *MARCH))
+        invoice = Invoice.objects.get()
+        self.create_payment("ref-5", 900, invoice=invoice)
+        reconciliation = reconcile("paystack", settlement(("ref-5", "900")))
+        item = reconciliation.items.get()
+        self.assertEqual(item.status, ReconciliationStatus.AMOUNT_MISMATCH)
+        self.assertEqual(item.billed_amount, Decimal(1000))
+
+    def test_other_gateway_payments_are_ignored(self):
+        lines = StringIO("Merchant Reference,Amount\nref-1,1000\n")
+        reconciliation = reconcile("interswitch", lines)
+        self.assertEqual(
+            self.statuses(reconciliation),
+            {"ref-1": ReconciliationStatus.MISSING_PAYMENT},
+        )
+
+    def test_command(self):
+        with NamedTemporaryFile("w", suffix=".csv", encoding="utf-8-sig") as report:
+            report.write(settlement(("ref-1", "1000")).getvalue())
+            report.flush()
+            out = StringIO()
+            call_command(
+                "reconcile_settlement",
+                "paystack",
+                report.name,
+                "--from=2024-03-01",
+                "--to=2024-03-31",
+                stdout=out,
+            )
+        self.assertIn("1 matched", out.getvalue())
+        self.assertIn("3 missing settlements", out.getvalue())
+        self.assertEqual(ReconciliationItem.objects.count(), 4)
+
+    def test_command_rejects_half_a_period(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "reconcile_settlement", "paystack", "x.csv", "--from=2024-03-01"
+            )
@@ -0,0 +1,201 @@
+import hashlib
+import hmac
+import json
+from decimal import Decimal
+
+import django_rq
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from fakeredis import FakeStrictRedis
+
+from core.middleware import PIN_SESSION_KEY
+from customer.models import Customer
+from payment.models import Payment, WebhookEvent
+from payment.processing import enqueue_event, process_event
+
+SECRET = "sk_test_secret"
+
+
+class FakeGateway:
+    """Signs and delivers Paystack-shaped events, as the gateway would."""
+
+    def __init__(self, client, secret=SECRET):
+        self.client = client
+        self.secret = secret
+
+    def event(self, id, reference, amount, email, **metadata):
+        return {
+            "event": "charge.success",
+            "data": {
+                "id": id,
+                "status": "success",
+                "reference": reference,
+                "amount": amount,
+                "currency": "NGN",
+                "customer": {"email": email},
+                "metadata": metadata,
+            },
+        }
+
+    def deliver(self, payload, signature=None):
+        body = json.dumps(payload).encode()
+        if signature is None:
+            signature = hmac.new(self.secret.encode(), body, hashlib.sha512).hexdigest()
+        return self.client.post(
+            reverse("payment:webhook", args=["paystack"]),
+            body,
+            content_type="application/json",
+            HTTP_X_PAYSTACK_SIGNATURE=signature,
+        )
+
+
+@override_settings(PAYSTACK_SECRET_KEY=SECRET)
+class WebhookViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.gateway = FakeGateway(self.client)
+        self.payload = self.gateway.event(1, "ref-1", 250000, "ada@example.com")
+
+    def test_event_is_stored_and_queued(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.gateway.deliver(self.payload)
+        self.assertEqual(response.status_code, 200)
+        event = WebhookEvent.objects.get()
+        self.assertEqual(event.event_key, "charge.success:1")
+        self.assertIsNone(event.processed)
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(Payment.objects.exists())
+
+    def test_delivery_creates_no_session(self):
+        response = self.gateway.deliver(self.payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        self.assertFalse(Session.objects.exists())
+
+    def test_delivery_does_not_pin_an_existing_session(self):
+        self.client.force_login(User.objects.create_user(username="ada"))
+        self.gateway.deliver(self.payload)
+        self.assertNotIn(PIN_SESSION_KEY, self.client.session)
+
+    def test_bad_signature_is_rejected(self):
+        response = self.gateway.deliver(self.payload, signature="0" * 128)
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+    @override_settings(PAYSTACK_SECRET_KEY="")
+    def test_missing_secret_rejects_everything(self):
+        self.assertEqual(self.gateway.deliver(self.payload).status_code, 401)
+
+    def test_unknown_gateway(self):
+        response = self.client.post(
+            reverse("payment:webhook", args=["nope"]), b"{}", "application/json"
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_malformed_event(self):
+        self.assertEqual(self.gateway.deliver({"data": {}}).status_code, 400)
+
+    def test_only_post(self):
+        response = self.client.get(reverse("payment:webhook", args=["paystack"]))
+        self.assertEqual(response.status_code, 405)
+
+    def test_redelivery_is_absorbed(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            self.gateway.deliver(self.payload)
+        process_event(WebhookEvent.objects.get().pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.gateway.deliver(self.payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+        self.assertEqual(callbacks, [])
+
+    def test_redelivery_requeues_unprocessed_event(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            self.gateway.deliver(self.payload)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.gateway.deliver(self.payload)
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+        self.assertEqual(len(callbacks), 1)
+
+
+@override_settings(PAYSTACK_SECRET_KEY=SECRET)
+class ProcessEventTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.gateway = FakeGateway(self.client)
+        user = User.objects.create_user(username="ada", password="pass")
+        self.customer = Customer.objects.create(
+            user=user,
+            name="Ada",
+            address="1 Marina",
+            phone="0801",
+            email="ada@example.com",
+        )
+
+    def deliver(self, payload):
+        with self.captureOnCommitCallbacks(execute=False):
+            self.gateway.deliver(payload)
+        return WebhookEvent.objects.latest("pk")
+
+    def test_payment_is_linked_to_customer(self):
+        event = self.deliver(self.gateway.event(1, "ref-1", 250000, "ADA@example.com"))
+        payment = process_event(event.pk)
+        self.assertEqual(payment.amount, Decimal("2500"))
+        self.assertEqual(payment.customer, self.customer)
+        event.refresh_from_db()
+        self.assertIsNotNone(event.processed)
+
+    def test_processing_twice_creates_one_payment(self):
+        event = self.deliver(self.gateway.event(1, "ref-1", 1000, "ada@example.com"))
+        process_event(event.pk)
+        self.assertIsNone(process_event(event.pk))
+        self.assertEqual(Payment.objects.count(), 1)
+
+    def test_distinct_events_for_one_reference(self):
+        first = self.deliver(self.gateway.event(1, "ref-1", 1000, "ada@example.com"))
+        second = self.deliver(self.gateway.event(2, "ref-1", 1000, "ada@example.com"))
+        process_event(first.pk)
+        process_event(second.pk)
+        self.assertEqual(Payment.objects.count(), 1)
+
+    def test_malformed_invoice_id_is_ignored(self):
+        for id, invoice_id in enumerate(("abc", [1], {"pk": 1}), start=1):
+            payload = self.gateway.event(
+                id, f"ref-{id}", 1000, "ada@example.com", invoice_id=invoice_id
+            )
+            payment = process_event(self.deliver(payload).pk)
+            self.assertIsNone(payment.invoice)
+            self.assertEqual(payment.customer, self.customer)
+        self.assertFalse(WebhookEvent.objects.filter(processed__isnull=True).exists())
+
+    def test_non_charge_event_is_marked_processed(self):
+        event = self.deliver({"event": "transfer.success", "data": {"id": 9}})
+        self.assertIsNone(process_event(event.pk))
+        event.refresh_from_db()
+        self.assertIsNotNone(event.processed)
+
+    def test_enqueue_event(self):
+        queue = django_rq.get_queue(
+            "default", connection=FakeStrictRedis(), is_async=False
+        )
+        event = self.deliver(self.gateway.event(1, "ref-1", 1000, "ada@example.com"))
+        self.assertEqual(enqueue_event(event.pk, queue=queue), f"webhook:{event.pk}")
+        self.assertEqual(Payment.objects.get().customer, self.customer)
+
+    def test_failed_event_is_requeued_on_redelivery(self):
+        queue = django_rq.get_queue(
+            "default", connection=FakeStrictRedis(), is_async=False
+        )
+        event = self.deliver(self.gateway.event(1, "ref-1", 1000, "ada@example.com"))
+        body = event.body
+        WebhookEvent.objects.filter(pk=event.pk).update(body="{not json")
+        job_id = enqueue_event(event.pk, queue=queue)
+        self.assertEqual(queue.failed_job_registry.get_job_ids(), [job_id])
+        WebhookEvent.objects.filter(pk=event.pk).update(body=body)
+        enqueue_event(event.pk, queue=queue)
+        self.assertEqual(Payment.objects.get().reference, "ref-1")
+        self.assertEqual(queue.failed_job_registry.get_job_ids(), [])
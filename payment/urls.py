@@ -0,0 +1,8 @@
+from django.urls import path
+from payment import views
+
+app_name = "payment"
+
+urlpatterns = [
+    path("webhooks/<str:gateway>", views.WebhookView.as_view(), name="webhook"),
+]
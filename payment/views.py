@@ -1,3 +1,57 @@
-from django.shortcuts import render
+import json
 
-# Create your views here.
+from django.db import IntegrityError, transaction
+from django.http import Http404, HttpResponse, HttpResponseBadRequest
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from core.middleware import primary_pin_exempt
+from payment.gateways import GATEWAYS
+from payment.models import WebhookEvent
+from payment.processing import enqueue_on_commit
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(primary_pin_exempt, name="dispatch")
+class WebhookView(View):
+    """
+    Verify a gateway's signature, store the raw event and acknowledge.
+    Processing happens on the queue (payment.processing), so the gateway
+    gets its 200 after one insert. A redelivered event hits the inbox's
+    unique constraint and is acknowledged again without reprocessing.
+    """
+
+    http_method_names = ["post"]
+
+    def post(self, request, gateway):
+        handler = GATEWAYS.get(gateway)
+        if handler is None:
+            raise Http404("Unknown payment gateway")
+        body = request.body
+        if not handler.verify(body, request.headers.get(handler.signature_header)):
+            return HttpResponse("Invalid signature", status=401)
+        try:
+            payload = json.loads(body)
+            event_key = handler.event_key(payload)
+            event_type = handler.event_type(payload)
+        except (ValueError, KeyError, TypeError):
+            return HttpResponseBadRequest("Malformed event")
+
+        try:
+            with transaction.atomic():
+                event = WebhookEvent.objects.create(
+                    gateway=gateway,
+                    event_key=event_key,
+                    event_type=event_type,
+                    body=body.decode("utf-8"),
+                )
+                enqueue_on_commit(event.pk)
+        except IntegrityError:
+            # Redelivery. Re-enqueue if the first delivery's job never ran.
+            event = WebhookEvent.objects.filter(
+                gateway=gateway, event_key=event_key, processed__isnull=True
+            ).first()
+            if event is not None:
+                enqueue_on_commit(event.pk)
+        return HttpResponse(status=200)
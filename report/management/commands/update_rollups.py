@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from report.rollups import rebuild_rollups, update_rollups
+
+
+class Command(BaseCommand):
+    help = "Fold new ServiceHistory rows into the revenue rollup tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10000)
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Drop the rollups and recompute them from all service history",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            processed = rebuild_rollups(batch_size=options["batch_size"])
+        else:
+            processed = update_rollups(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} services"))
@@ -1,3 +1,46 @@
 from django.db import models
 
-# Create your models here.
+from customer.models import Customer
+from tenant.managers import TenantManager
+
+
+class CustomerMonthlyRevenueManager(TenantManager):
+    tenant_field = "customer__company"
+
+
+class CustomerMonthlyRevenue(models.Model):
+    """
+    Collections and revenue per customer and calendar month (see
+    report.rollups). Per-day and per-schedule totals are core.DailyMetric.
+    """
+
+    customer = models.ForeignKey(
+        Customer, on_delete=models.CASCADE, related_name="monthly_revenue"
+    )
+    month = models.DateField()
+    collections = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    objects = CustomerMonthlyRevenueManager()
+
+    def __str__(self):
+        return f"{self.customer_id} - {self.month:%Y-%m} - {self.revenue}"
+
+    class Meta:
+        ordering = ["-month"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["customer", "month"], name="unique_customer_monthly_revenue"
+            ),
+        ]
+
+
+class RollupWatermark(models.Model):
+    """Highest ServiceHistory id already folded into the rollup tables."""
+
+    name = models.CharField(max_length=100, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} - {self.last_id}"
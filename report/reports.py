@@ -0,0 +1,43 @@
+"""
+Revenue and collection reports. These read the precomputed DailyMetric and
+CustomerMonthlyRevenue rows only, so a report over years costs about the
+same as one over a single day.
+"""
+
+from django.db.models import DateField, Sum
+from django.db.models.functions import Trunc
+
+from core.models import DailyMetric
+from report.models import CustomerMonthlyRevenue
+
+PERIODS = ("day", "month", "year")
+
+
+def revenue_by_period(start, end, period="day"):
+    if period not in PERIODS:
+        raise ValueError(f"period must be one of {', '.join(PERIODS)}")
+    return (
+        DailyMetric.objects.filter(date__range=(start, end))
+        .annotate(period=Trunc("date", period, output_field=DateField()))
+        .order_by("period")
+        .values("period")
+        .annotate(collections=Sum("collections"), revenue=Sum("revenue"))
+    )
+
+
+def revenue_by_schedule(start, end):
+    return (
+        DailyMetric.objects.filter(date__range=(start, end))
+        .order_by("schedule")
+        .values("schedule")
+        .annotate(collections=Sum("collections"), revenue=Sum("revenue"))
+    )
+
+
+def revenue_by_customer(start, end):
+    return (
+        CustomerMonthlyRevenue.objects.filter(month__range=(start.replace(day=1), end))
+        .order_by("-revenue")
+        .values("customer_id", "customer__name")
+        .annotate(collections=Sum("collections"), revenue=Sum("revenue"))
+    )
@@ -0,0 +1,98 @@
+"""
+Incremental revenue rollups.
+
+``update_rollups`` folds ServiceHistory rows created since the last run
+into CustomerMonthlyRevenue, then moves the watermark forward in the same
+transaction, so a crashed run is simply repeated.
+Rows are picked up by primary key once they were recorded at least
+``settle_seconds`` ago, which keeps transactions that commit out of id order
+from being skipped. That goes by ``recorded_at``, which the server sets:
+``created`` can be backdated by clients, and a backdated row would move
+the watermark past rows that have not committed yet.
+Edits to, or deletions of, already rolled-up services are not tracked
+incrementally; ``rebuild_rollups`` recomputes everything from scratch.
+Per-day and per-schedule totals are kept by core.metrics as services are
+recorded, so they are not rolled up again here.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from customer.models import ServiceHistory
+from report.models import CustomerMonthlyRevenue, RollupWatermark
+
+WATERMARK_NAME = "service_history"
+
+
+def update_rollups(batch_size=10000, settle_seconds=60):
+    """Process every settled, unprocessed row. Returns the number of rows."""
+    processed = 0
+    while True:
+        count = _process_batch(batch_size, settle_seconds)
+        if not count:
+            return processed
+        processed += count
+
+
+@transaction.atomic
+def _process_batch(batch_size, settle_seconds):
+    watermark, _ = RollupWatermark.objects.get_or_create(name=WATERMARK_NAME)
+    watermark = RollupWatermark.objects.select_for_update().get(pk=watermark.pk)
+    cutoff = timezone.now() - timedelta(seconds=settle_seconds)
+    ids = list(
+        ServiceHistory.objects.filter(pk__gt=watermark.last_id, recorded_at__lte=cutoff)
+        .order_by("pk")
+        .values_list("pk", flat=True)[:batch_size]
+    )
+    if not ids:
+        return 0
+    rows = ServiceHistory.objects.filter(pk__gt=watermark.last_id, pk__lte=ids[-1])
+    _fold_customer_monthly(rows)
+    watermark.last_id = ids[-1]
+    watermark.save(update_fields=["last_id", "updated"])
+    return len(ids)
+
+
+def _fold(model, keys, groups):
+    """Add grouped (collections, revenue) deltas onto existing rollup rows."""
+    groups = {tuple(row[key] for key in keys): row for row in groups}
+    if not groups:
+        return
+    lookup = {f"{name}__in": {key[i] for key in groups} for i, name in enumerate(keys)}
+    existing = {
+        tuple(getattr(obj, key) for key in keys): obj
+        for obj in model.objects.filter(**lookup)
+    }
+    created, updated = [], []
+    for key, row in groups.items():
+        obj = existing.get(key)
+        if obj is None:
+            obj = model(**dict(zip(keys, key)))
+            created.append(obj)
+        else:
+            updated.append(obj)
+        obj.collections += row["collections"]
+        obj.revenue += row["revenue"]
+    model.objects.bulk_create(created, batch_size=1000)
+    model.objects.bulk_update(updated, ["collections", "revenue"], batch_size=1000)
+
+
+def _fold_customer_monthly(rows):
+    groups = (
+        rows.annotate(month=TruncMonth("created", output_field=DateField()))
+        .order_by()
+        .values("customer_id", "month")
+        .annotate(collections=Count("pk"), revenue=Sum("cost"))
+    )
+    _fold(CustomerMonthlyRevenue, ("customer_id", "month"), groups)
+
+
+@transaction.atomic
+def rebuild_rollups(batch_size=10000):
+    CustomerMonthlyRevenue.objects.all().delete()
+    RollupWatermark.objects.filter(name=WATERMARK_NAME).delete()
+    return update_rollups(batch_size=batch_size, settle_seconds=0)
@@ -0,0 +1,101 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from customer.models import Customer, ServiceHistory
+from report import reports
+from report.models import CustomerMonthlyRevenue, RollupWatermark
+from report.rollups import rebuild_rollups, update_rollups
+
+
+class RollupTestCase(TestCase):
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.user = User.objects.create_user(username="testuser", password="pass")
+        self.weekly = Customer.objects.create(
+            user=self.user, name="Meta", email="meta@mail.com", schedule="weekly"
+        )
+        self.daily = Customer.objects.create(
+            user=User.objects.create_user(username="other", password="pass"),
+            name="Alphabet",
+            email="alphabet@mail.com",
+            schedule="daily",
+        )
+
+    def record_service(self, customer, cost):
+        return ServiceHistory.objects.create(
+            customer=customer, cost=Decimal(cost), created_by=self.user
+        )
+
+    def test_update_rollups(self):
+        self.record_service(self.weekly, 5000)
+        self.record_service(self.weekly, 3000)
+        last = self.record_service(self.daily, 1000)
+        self.assertEqual(update_rollups(settle_seconds=0), 3)
+        weekly = CustomerMonthlyRevenue.objects.get(customer=self.weekly)
+        self.assertEqual((weekly.collections, weekly.revenue), (2, Decimal(8000)))
+        monthly = CustomerMonthlyRevenue.objects.get(customer=self.daily)
+        self.assertEqual(monthly.month, self.today.replace(day=1))
+        self.assertEqual(monthly.revenue, Decimal(1000))
+        self.assertEqual(RollupWatermark.objects.get().last_id, last.pk)
+
+    def test_update_rollups_is_incremental(self):
+        self.record_service(self.weekly, 5000)
+        update_rollups(settle_seconds=0)
+        self.assertEqual(update_rollups(settle_seconds=0), 0)
+        self.record_service(self.weekly, 2500)
+        self.assertEqual(update_rollups(batch_size=1, settle_seconds=0), 1)
+        weekly = CustomerMonthlyRevenue.objects.get(customer=self.weekly)
+        self.assertEqual((weekly.collections, weekly.revenue), (2, Decimal(7500)))
+
+    def test_update_rollups_waits_for_rows_to_settle(self):
+        self.record_service(self.weekly, 5000)
+        self.assertEqual(update_rollups(), 0)
+        self.assertFalse(CustomerMonthlyRevenue.objects.exists())
+
+    def test_backdated_rows_wait_for_rows_to_settle(self):
+        ServiceHistory.objects.create(
+            customer=self.weekly,
+            cost=Decimal(5000),
+            created_by=self.user,
+            created=timezone.now() - timezone.timedelta(days=2),
+        )
+        self.assertEqual(update_rollups(), 0)
+        self.assertEqual(RollupWatermark.objects.get().last_id, 0)
+
+    def test_rebuild_rollups(self):
+        self.record_service(self.weekly, 5000)
+        update_rollups(settle_seconds=0)
+        ServiceHistory.objects.all().delete()
+        self.record_service(self.daily, 700)
+        self.assertEqual(rebuild_rollups(), 1)
+        self.assertListEqual(
+            list(CustomerMonthlyRevenue.objects.values_list("customer", "revenue")),
+            [(self.daily.pk, Decimal(700))],
+        )
+
+    def test_reports_read_rollups(self):
+        self.record_service(self.weekly, 5000)
+        self.record_service(self.daily, 1000)
+        update_rollups(settle_seconds=0)
+        for period in reports.PERIODS:
+            with self.assertNumQueries(1):
+                rows = list(reports.revenue_by_period(self.today, self.today, period))
+            self.assertEqual(len(rows), 1)
+            self.assertEqual(rows[0]["collections"], 2)
+            self.assertEqual(rows[0]["revenue"], Decimal(6000))
+        schedules = {
+            row["schedule"]: row["revenue"]
+            for row in reports.revenue_by_schedule(self.today, self.today)
+        }
+        self.assertDictEqual(
+            schedules, {"daily": Decimal(1000), "weekly": Decimal(5000)}
+        )
+        customers = list(reports.revenue_by_customer(self.today, self.today))
+        self.assertEqual(customers[0]["customer__name"], "Meta")
+
+    def test_invalid_period(self):
+        with self.assertRaises(ValueError):
+            reports.revenue_by_period(self.today, self.today, "week")
@@ -0,0 +1,161 @@
+import csv
+import gzip
+import io
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import DailyMetric
+from customer.models import Customer, ServiceHistory
+from tenant.models import Domain
+from tenant.resolver import tenants
+from tenant.tests.test_middleware import create_company
+
+EXPORT_URL = reverse("report:export_services")
+LOGIN_URL = reverse("account:login")
+
+
+def get_user_data(username="testuser", password="testpass123"):
+    return {"username": username, "password": password}
+
+
+class ServiceHistoryExportViewTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user_data = get_user_data()
+        self.user = User.objects.create_user(**self.user_data)
+        self.customer = Customer.objects.create(
+            user=self.user, name="Meta", email="mail@gmail.com"
+        )
+        for cost in (5000, 12000, 700):
+            ServiceHistory.objects.create(
+                customer=self.customer, cost=Decimal(cost), created_by=self.user
+            )
+
+    def read_rows(self, content):
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_export_requires_authentication(self):
+        response = self.client.get(EXPORT_URL)
+        self.assertRedirects(response, f"{LOGIN_URL}?next={EXPORT_URL}")
+
+    def test_export_streams_csv(self):
+        self.client.login(**self.user_data)
+        response = self.client.get(EXPORT_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = self.read_rows(b"".join(response.streaming_content).decode())
+        self.assertListEqual(rows[0], ["id", "customer", "cost", "date"])
+        self.assertListEqual(
+            [(row[1], row[2]) for row in rows[1:]],
+            [("Meta", "5000.00"), ("Meta", "12000.00"), ("Meta", "700.00")],
+        )
+
+    def test_export_gzip(self):
+        self.client.login(**self.user_data)
+        response = self.client.get(EXPORT_URL, {"gzip": 1})
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn("service-history.csv.gz", response["Content-Disposition"])
+        content = gzip.decompress(b"".join(response.streaming_content)).decode()
+        self.assertEqual(len(self.read_rows(content)), 4)
+
+    def test_export_date_filter(self):
+        self.client.login(**self.user_data)
+        response = self.client.get(
+            EXPORT_URL, {"start": "2000-01-01", "end": "2000-12-31"}
+        )
+        rows = self.read_rows(b"".join(response.streaming_content).decode())
+        self.assertEqual(len(rows), 1)
+
+    def test_export_date_filter_includes_end_date(self):
+        self.client.login(**self.user_data)
+        today = timezone.localdate().isoformat()
+        response = self.client.get(EXPORT_URL, {"start": today, "end": today})
+        rows = self.read_rows(b"".join(response.streaming_content).decode())
+        self.assertEqual(len(rows), 4)
+
+    def test_export_ignores_invalid_dates(self):
+        self.client.login(**self.user_data)
+        response = self.client.get(EXPORT_URL, {"start": "2024-13-45"})
+        self.assertEqual(response.status_code, 200)
+        rows = self.read_rows(b"".join(response.streaming_content).decode())
+        self.assertEqual(len(rows), 4)
+
+    def test_export_reads_rows_in_one_query(self):
+        self.client.login(**self.user_data)
+        response = self.client.get(EXPORT_URL)
+        with self.assertNumQueries(1):
+            b"".join(response.streaming_content)
+
+    @override_settings(ALLOWED_HOSTS=["*"], TENANT_BASE_DOMAIN="recyclor.com")
+    def test_export_streams_only_the_hosts_tenant(self):
+        tenants.invalidate()
+        self.addCleanup(tenants.invalidate)
+        acme = create_company("acme")
+        other = create_company("other")
+        Domain.objects.create(domain="acme", company=acme)
+        Customer.objects.filter(pk=self.customer.pk).update(company=acme)
+        ServiceHistory.objects.sync_companies()
+        rival = Customer.objects.create(
+            user=User.objects.create_user(username="rival"),
+            name="Rival",
+            email="rival@gmail.com",
+            company=other,
+        )
+        ServiceHistory.objects.create(
+            customer=rival, cost=Decimal(900), created_by=self.user
+        )
+        self.client.login(**self.user_data)
+        response = self.client.get(EXPORT_URL, HTTP_HOST="acme.recyclor.com")
+        rows = self.read_rows(b"".join(response.streaming_content).decode())
+        self.assertListEqual([row[1] for row in rows[1:]], ["Meta", "Meta", "Meta"])
+
+
+class RevenueReportViewTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user_data = get_user_data()
+        self.user = User.objects.create_user(**self.user_data)
+        self.url = reverse("report:revenue")
+
+    def test_revenue_report_requires_authentication(self):
+        response = self.client.get(self.url)
+        self.assertRedirects(response, f"{LOGIN_URL}?next={self.url}")
+
+    def test_revenue_report_context(self):
+        self.client.login(**self.user_data)
+        response = self.client.get(self.url, {"period": "month"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "report/revenue.html")
+        self.assertEqual(response.context.get("period"), "month")
+        self.assertEqual(response.context.get("title"), "Revenue Report")
+
+    def test_revenue_report_formats_money(self):
+        DailyMetric.objects.create(
+            date=timezone.now().date(),
+            schedule="weekly",
+            collections=3,
+            revenue=Decimal("1234567.5"),
+        )
+        self.client.login(**self.user_data)
+        response = self.client.get(self.url)
+        self.assertContains(response, "₦1,234,567.50", count=2)
+
+    def test_revenue_report_invalid_dates(self):
+        self.client.login(**self.user_data)
+        response = self.client.get(
+            self.url, {"start": "2024-13-45", "end": "2024-02-30"}
+        )
+        self.assertEqual(response.status_code, 200)
+        today = timezone.now().date()
+        self.assertEqual(response.context.get("start"), today.replace(day=1))
+        self.assertEqual(response.context.get("end"), today)
+
+    def test_revenue_report_invalid_period(self):
+        self.client.login(**self.user_data)
+        response = self.client.get(self.url, {"period": "invalid"})
+        self.assertEqual(response.context.get("period"), "day")
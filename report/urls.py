@@ -0,0 +1,13 @@
+from django.urls import path
+from report import views
+
+app_name = "report"
+
+urlpatterns = [
+    path("revenue", views.RevenueReportView.as_view(), name="revenue"),
+    path(
+        "export/services",
+        views.ServiceHistoryExportView.as_view(),
+        name="export_services",
+    ),
+]
@@ -1,3 +1,122 @@
-from django.shortcuts import render
+import csv
+import zlib
+from datetime import datetime, time, timedelta
 
-# Create your views here.
+from braces.views import LoginRequiredMixin
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.views import View
+from django.views.generic import TemplateView
+
+from core.mixins import ReplicaReadMixin
+from customer.models import ServiceHistory
+from report import reports
+
+
+def _start_of(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _get_date(request, name, default=None):
+    """The ``name`` query parameter as a date; ``default`` if missing or invalid."""
+    try:
+        return parse_date(request.GET.get(name, "")) or default
+    except ValueError:
+        # Well formed but not a real date, e.g. 2024-13-45.
+        return default
+
+
+class Echo:
+    """File-like object whose write() hands the row back instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(header, rows, chunk_size):
+    """Yield CSV text in blocks of ``chunk_size`` rows."""
+    writer = csv.writer(Echo())
+    block = [writer.writerow(header)]
+    for row in rows:
+        block.append(writer.writerow(row))
+        if len(block) >= chunk_size:
+            yield "".join(block)
+            block = []
+    if block:
+        yield "".join(block)
+
+
+def gzip_stream(chunks):
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class ServiceHistoryExportView(LoginRequiredMixin, ReplicaReadMixin, View):
+    """
+    Stream every ServiceHistory row as CSV (or gzipped CSV with ?gzip=1).
+
+    Rows are read with a chunked iterator and written as they arrive, so
+    memory use does not grow with the size of the export.
+    """
+
+    chunk_size = 2000
+    header = ["id", "customer", "cost", "date"]
+
+    def get_queryset(self):
+        queryset = ServiceHistory.objects.using(self.read_db).order_by("pk")
+        start = _get_date(self.request, "start")
+        end = _get_date(self.request, "end")
+        # Bare datetime bounds, so the range is served by the created index.
+        if start:
+            queryset = queryset.filter(created__gte=_start_of(start))
+        if end:
+            queryset = queryset.filter(created__lt=_start_of(end + timedelta(days=1)))
+        return queryset
+
+    def get_rows(self, rows):
+        for pk, name, cost, created in rows.iterator(chunk_size=self.chunk_size):
+            yield pk, name, cost, created.isoformat()
+
+    def get(self, request, *args, **kwargs):
+        # Built here rather than in the generator: the body is streamed after
+        # TenantMiddleware has returned, when the manager no longer sees the
+        # request's tenant. values_list joins the customer in the same query
+        # like select_related does, without building model instances per row.
+        rows = self.get_queryset().values_list(
+            "pk", "customer__name", "cost", "created"
+        )
+        content = stream_csv(self.header, self.get_rows(rows), self.chunk_size)
+        filename = "service-history.csv"
+        if request.GET.get("gzip"):
+            content = gzip_stream(content)
+            filename += ".gz"
+            response = StreamingHttpResponse(content, content_type="application/gzip")
+        else:
+            response = StreamingHttpResponse(content, content_type="text/csv")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class RevenueReportView(LoginRequiredMixin, ReplicaReadMixin, TemplateView):
+    template_name = "report/revenue.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        today = timezone.now().date()
+        start = _get_date(self.request, "start", today.replace(day=1))
+        end = _get_date(self.request, "end", today)
+        period = self.request.GET.get("period", "day")
+        if period not in reports.PERIODS:
+            period = "day"
+        context["title"] = "Revenue Report"
+        context["start"] = start
+        context["end"] = end
+        context["period"] = period
+        context["rows"] = reports.revenue_by_period(start, end, period)
+        context["schedules"] = reports.revenue_by_schedule(start, end)
+        return context
@@ -0,0 +1,225 @@
+"""
+Billing runs.
+
+A run bills every active subscription on one plan for one period.
+``start_run`` splits the plan's subscribers into customer-id ranges
+(BillingPartition rows), created together with the run. ``bill_partition``
+writes one range's invoices with batched inserts and marks the range done
+in the same transaction, so a crash leaves it pending and running the
+billing again only bills what is still pending. Invoice's unique
+(subscription, period) constraint is the backstop against a range being
+billed twice by overlapping workers.
+
+Ranges are billed in-process, on a process pool, or as rq jobs.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, time, timedelta
+
+import django_rq
+from django.db import connections, transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from core.jobs import enqueue_once
+from core.workers import init_worker
+from customer.models import ServiceHistory
+from subscription.enums import BillingChoices
+from subscription.models import BillingPartition, BillingRun, Invoice, Subscription
+
+PARTITION_SIZE = 10_000
+INSERT_BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def billing_period(billing, day):
+    """
+    The last complete cycle before ``day``: the previous Monday-to-Sunday
+    week or calendar month, so every day of a cycle maps to the same period.
+    """
+    if billing == BillingChoices.WEEKLY:
+        end = day - timedelta(days=day.weekday() + 1)
+        return end - timedelta(days=6), end
+    end = day.replace(day=1) - timedelta(days=1)
+    return end.replace(day=1), end
+
+
+def start_run(billing, period_start, period_end, partition_size=PARTITION_SIZE):
+    """Get or create the run for this cycle, partitioned on first creation."""
+    with transaction.atomic():
+        run, created = BillingRun.objects.get_or_create(
+            billing=billing, period_start=period_start, period_end=period_end
+        )
+        if created:
+            BillingPartition.objects.bulk_create(
+                BillingPartition(
+                    run=run, first_customer_id=first, last_customer_id=last
+                )
+                for first, last in _customer_ranges(billing, partition_size)
+            )
+    if run.finished is None:
+        # A run with no subscribers has no partitions to finish it.
+        _finish_if_complete(run)
+    return run
+
+
+def _customer_ranges(billing, size):
+    customer_ids = (
+        Subscription.objects.filter(billing=billing, active=True)
+        .order_by("customer_id")
+        .values_list("customer_id", flat=True)
+    )
+    chunk = []
+    for customer_id in customer_ids.iterator(chunk_size=size):
+        chunk.append(customer_id)
+        if len(chunk) == size:
+            yield chunk[0], chunk[-1]
+            chunk = []
+    if chunk:
+        yield chunk[0], chunk[-1]
+
+
+def pending_partitions(run):
+    return list(run.partitions.filter(done=False).values_list("pk", flat=True))
+
+
+def bill_partition(partition_id):
+    """Invoice one customer range; returns the number of invoices written."""
+    with transaction.atomic():
+        partition = (
+            BillingPartition.objects.select_for_update()
+            .select_related("run")
+            .get(pk=partition_id)
+        )
+        if partition.done:
+            return 0
+        run = partition.run
+        # ignore_conflicts skips invoices an overlapping worker already
+        # wrote, so count what the insert added rather than what was built.
+        existing = Invoice.objects.filter(
+            period_start=run.period_start,
+            period_end=run.period_end,
+            **_customer_range(partition),
+        )
+        before = existing.count()
+        Invoice.objects.bulk_create(
+            _build_invoices(run, partition),
+            batch_size=INSERT_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        partition.done = True
+        partition.invoices = existing.count() - before
+        partition.finished = timezone.now()
+        partition.error = ""
+        partition.save(update_fields=["done", "invoices", "finished", "error"])
+    _finish_if_complete(run)
+    return partition.invoices
+
+
+def _customer_range(partition):
+    return {
+        "customer_id__gte": partition.first_customer_id,
+        "customer_id__lte": partition.last_customer_id,
+    }
+
+
+def _mark_failed(partition_id, error):
+    logger.error("Billing partition %s failed: %r", partition_id, error)
+    BillingPartition.objects.filter(pk=partition_id).update(error=repr(error))
+
+
+def _build_invoices(run, partition):
+    customer_range = _customer_range(partition)
+    subscriptions = Subscription.objects.filter(
+        billing=run.billing, active=True, **customer_range
+    ).values_list("pk", "customer_id", "company_id", "amount")
+    usage = {}
+    if run.billing == BillingChoices.PER_SERVICE:
+        usage = {
+            customer_id: (services, total)
+            for customer_id, services, total in ServiceHistory.objects.filter(
+                **customer_range,
+                created__gte=_start_of(run.period_start),
+                created__lt=_start_of(run.period_end + timedelta(days=1)),
+            )
+            .values("customer_id")
+            .annotate(services=Count("pk"), total=Sum("cost"))
+            .values_list("customer_id", "services", "total")
+            .order_by()
+        }
+    for pk, customer_id, company_id, amount in subscriptions.iterator():
+        services = 0
+        if run.billing == BillingChoices.PER_SERVICE:
+            if customer_id not in usage:
+                continue
+            services, amount = usage[customer_id]
+        yield Invoice(
+            subscription_id=pk,
+            customer_id=customer_id,
+            company_id=company_id,
+            run=run,
+            period_start=run.period_start,
+            period_end=run.period_end,
+            services=services,
+            amount=amount,
+        )
+
+
+def _start_of(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _finish_if_complete(run):
+    if not run.partitions.filter(done=False).exists():
+        BillingRun.objects.filter(pk=run.pk, finished__isnull=True).update(
+            finished=timezone.now()
+        )
+
+
+def run_billing(run, workers=1, initializer=init_worker, initargs=()):
+    """
+    Bill the run's pending partitions, on ``workers`` processes when more
+    than one. Partitions a worker failed on (e.g. a lock timeout) are
+    logged, marked with the error and retried here once the pool is done.
+    Returns the invoices written.
+    """
+    pending = pending_partitions(run)
+    written = 0
+    if workers > 1 and len(pending) > 1:
+        # Workers open their own connections; never share one across fork.
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=initializer,
+            initargs=initargs,
+        ) as pool:
+            futures = {pool.submit(bill_partition, pk): pk for pk in pending}
+            for future in as_completed(futures):
+                error = future.exception()
+                if error is None:
+                    written += future.result()
+                else:
+                    _mark_failed(futures[future], error)
+        pending = pending_partitions(run)
+    for pk in pending:
+        try:
+            written += bill_partition(pk)
+        except Exception as e:
+            _mark_failed(pk, e)
+            raise
+    return written
+
+
+def enqueue_billing(run, queue=None):
+    """Enqueue one rq job per pending partition. Returns the job ids."""
+    queue = queue or django_rq.get_queue("default")
+    job_ids = []
+    for pk in pending_partitions(run):
+        job_id = f"billing:{run.pk}:{pk}"
+        enqueue_once(queue, bill_partition, pk, job_id=job_id)
+        job_ids.append(job_id)
+    return job_ids
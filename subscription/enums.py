@@ -0,0 +1,7 @@
+from django.db.models import TextChoices
+
+
+class BillingChoices(TextChoices):
+    WEEKLY = "weekly", "Weekly"
+    MONTHLY = "monthly", "Monthly"
+    PER_SERVICE = "per_service", "Per Service"
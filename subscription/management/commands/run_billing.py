@@ -0,0 +1,52 @@
+import os
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from subscription.billing import (
+    PARTITION_SIZE,
+    billing_period,
+    enqueue_billing,
+    run_billing,
+    start_run,
+)
+from subscription.enums import BillingChoices
+
+
+class Command(BaseCommand):
+    help = (
+        "Invoice every active subscription on a plan for its last complete "
+        "cycle. Rerunning resumes an interrupted run without double billing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("billing", choices=BillingChoices.values)
+        parser.add_argument(
+            "--date",
+            type=date.fromisoformat,
+            help="Bill the cycle before this date (default: today)",
+        )
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--partition-size", type=int, default=PARTITION_SIZE)
+        parser.add_argument(
+            "--rq", action="store_true", help="Enqueue partitions on django-rq"
+        )
+
+    def handle(self, *args, **options):
+        day = options["date"] or timezone.now().date()
+        period_start, period_end = billing_period(options["billing"], day)
+        run = start_run(
+            options["billing"], period_start, period_end, options["partition_size"]
+        )
+        if options["rq"]:
+            job_ids = enqueue_billing(run)
+            self.stdout.write(self.style.SUCCESS(f"Enqueued {len(job_ids)} jobs"))
+            return
+        written = run_billing(run, workers=options["workers"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Billed {run}: {written} invoices, "
+                f"{run.partitions.count()} partitions"
+            )
+        )
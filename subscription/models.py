@@ -1,3 +1,121 @@
 from django.db import models
 
-# Create your models here.
+from customer.models import Customer
+from subscription.enums import BillingChoices
+from tenant.managers import TenantManager
+
+
+class Subscription(models.Model):
+    """
+    A customer's billing plan. Weekly and monthly plans are invoiced
+    ``amount`` per cycle; per-service plans are invoiced the cost of the
+    services recorded in the cycle.
+    """
+
+    customer = models.OneToOneField(
+        Customer, on_delete=models.CASCADE, related_name="subscription"
+    )
+    company = models.ForeignKey(
+        "company.Company", null=True, blank=True, on_delete=models.CASCADE
+    )
+    billing = models.CharField(
+        max_length=20, choices=BillingChoices.choices, default=BillingChoices.MONTHLY
+    )
+    amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    active = models.BooleanField(default=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    objects = TenantManager()
+
+    def __str__(self):
+        return f"{self.customer_id} - {self.billing}"
+
+    def save(self, *args, **kwargs):
+        if self.company_id is None:
+            self.company_id = self.customer.company_id
+        super().save(*args, **kwargs)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["billing", "active", "customer"],
+                name="subscription_billing_idx",
+            ),
+        ]
+
+
+class BillingRun(models.Model):
+    """One billing cycle for one plan type, e.g. monthly for March."""
+
+    billing = models.CharField(max_length=20, choices=BillingChoices.choices)
+    period_start = models.DateField()
+    period_end = models.DateField()
+    created = models.DateTimeField(auto_now_add=True)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.billing} {self.period_start} - {self.period_end}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["billing", "period_start", "period_end"],
+                name="unique_billing_run",
+            ),
+        ]
+
+
+class BillingPartition(models.Model):
+    """
+    A customer-id range of a run. ``done`` is set in the same transaction
+    that inserts the range's invoices, so it doubles as the checkpoint.
+    ``error`` holds the last failure, until the range is billed.
+    """
+
+    run = models.ForeignKey(
+        BillingRun, on_delete=models.CASCADE, related_name="partitions"
+    )
+    first_customer_id = models.BigIntegerField()
+    last_customer_id = models.BigIntegerField()
+    done = models.BooleanField(default=False)
+    invoices = models.PositiveIntegerField(default=0)
+    finished = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.run_id}: {self.first_customer_id}-{self.last_customer_id}"
+
+    class Meta:
+        ordering = ["first_customer_id"]
+
+
+class Invoice(models.Model):
+    subscription = models.ForeignKey(
+        Subscription, on_delete=models.CASCADE, related_name="invoices"
+    )
+    customer = models.ForeignKey(
+        Customer, on_delete=models.CASCADE, related_name="invoices"
+    )
+    company = models.ForeignKey(
+        "company.Company", null=True, blank=True, on_delete=models.CASCADE
+    )
+    run = models.ForeignKey(BillingRun, on_delete=models.CASCADE)
+    period_start = models.DateField()
+    period_end = models.DateField()
+    services = models.PositiveIntegerField(default=0)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    created = models.DateTimeField(auto_now_add=True)
+
+    objects = TenantManager()
+
+    def __str__(self):
+        return f"{self.customer_id} - {self.period_start} - {self.amount}"
+
+    class Meta:
+        ordering = ["-created"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["subscription", "period_start", "period_end"],
+                name="unique_subscription_invoice",
+            ),
+        ]
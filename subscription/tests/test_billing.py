@@ -0,0 +1,168 @@
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+
+import django_rq
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from fakeredis import FakeStrictRedis
+
+from customer.models import Customer, ServiceHistory
+from subscription.billing import (
+    billing_period,
+    bill_partition,
+    enqueue_billing,
+    pending_partitions,
+    run_billing,
+    start_run,
+)
+from subscription.models import BillingRun, Invoice, Subscription
+from tenant.tests.test_middleware import create_company
+
+MARCH = (date(2024, 3, 1), date(2024, 3, 31))
+
+
+class BillingPeriodTestCase(TestCase):
+    def test_weekly(self):
+        self.assertEqual(
+            billing_period("weekly", date(2024, 3, 11)),
+            (date(2024, 3, 4), date(2024, 3, 10)),
+        )
+
+    def test_weekly_is_the_previous_iso_week_on_any_day(self):
+        for day in range(11, 18):
+            self.assertEqual(
+                billing_period("weekly", date(2024, 3, day)),
+                (date(2024, 3, 4), date(2024, 3, 10)),
+            )
+
+    def test_monthly(self):
+        self.assertEqual(billing_period("monthly", date(2024, 4, 15)), MARCH)
+        self.assertEqual(
+            billing_period("per_service", date(2024, 3, 1)),
+            (date(2024, 2, 1), date(2024, 2, 29)),
+        )
+
+
+class BillingRunTestCase(TestCase):
+    def setUp(self):
+        self.company = create_company("acme")
+        self.staff = User.objects.create_user(username="staff")
+        self.subscriptions = []
+        for i in range(7):
+            customer = Customer.objects.create(
+                user=User.objects.create_user(username=f"testuser{i}"),
+                company=self.company,
+                name=f"Customer {i}",
+                email=f"customer{i}@mail.com",
+            )
+            self.subscriptions.append(
+                Subscription.objects.create(
+                    customer=customer, billing="monthly", amount=Decimal(1000 + i)
+                )
+            )
+        self.subscriptions[-1].active = False
+        self.subscriptions[-1].save()
+
+    def test_partitions_cover_active_subscribers(self):
+        run = start_run("monthly", *MARCH, partition_size=2)
+        ranges = list(
+            run.partitions.values_list("first_customer_id", "last_customer_id")
+        )
+        customer_ids = [s.customer_id for s in self.subscriptions[:6]]
+        self.assertEqual(ranges, list(zip(customer_ids[::2], customer_ids[1::2])))
+
+    def test_run_bills_each_active_subscription(self):
+        run = start_run("monthly", *MARCH, partition_size=2)
+        self.assertEqual(run_billing(run), 6)
+        invoices = Invoice.objects.order_by("customer_id")
+        self.assertEqual(
+            [invoice.amount for invoice in invoices],
+            [Decimal(1000 + i) for i in range(6)],
+        )
+        self.assertTrue(all(invoice.company == self.company for invoice in invoices))
+        run.refresh_from_db()
+        self.assertIsNotNone(run.finished)
+
+    def test_interrupted_run_resumes_without_duplicates(self):
+        run = start_run("monthly", *MARCH, partition_size=2)
+        first = pending_partitions(run)[0]
+        self.assertEqual(bill_partition(first), 2)
+        run = start_run("monthly", *MARCH, partition_size=2)
+        self.assertEqual(len(pending_partitions(run)), 2)
+        self.assertEqual(run_billing(run), 4)
+        self.assertEqual(run_billing(run), 0)
+        self.assertEqual(bill_partition(first), 0)
+        self.assertEqual(Invoice.objects.count(), 6)
+        self.assertEqual(BillingRun.objects.count(), 1)
+
+    def test_partition_counts_only_inserted_invoices(self):
+        run = start_run("monthly", *MARCH, partition_size=2)
+        first = run.partitions.first()
+        subscription = self.subscriptions[0]
+        # Written by an overlapping worker.
+        Invoice.objects.create(
+            subscription=subscription,
+            customer=subscription.customer,
+            run=run,
+            period_start=MARCH[0],
+            period_end=MARCH[1],
+            amount=subscription.amount,
+        )
+        first.error = "OperationalError('database is locked')"
+        first.save()
+        self.assertEqual(bill_partition(first.pk), 1)
+        first.refresh_from_db()
+        self.assertEqual((first.invoices, first.error), (1, ""))
+
+    def test_per_service_billing(self):
+        subscription = self.subscriptions[0]
+        subscription.billing = "per_service"
+        subscription.save()
+        Subscription.objects.filter(pk=self.subscriptions[1].pk).update(
+            billing="per_service"
+        )
+        for day, cost in ((1, 500), (31, 700), (30, 0)):
+            ServiceHistory.objects.create(
+                customer=subscription.customer,
+                created_by=self.staff,
+                cost=Decimal(cost or 900),
+                created=datetime(
+                    2024, 3 + (cost == 0), day, 12, tzinfo=dt_timezone.utc
+                ),
+            )
+        run = start_run("per_service", *MARCH)
+        self.assertEqual(run_billing(run), 1)
+        invoice = Invoice.objects.get()
+        self.assertEqual((invoice.services, invoice.amount), (2, Decimal(1200)))
+
+    def test_enqueue_billing(self):
+        queue = django_rq.get_queue(
+            "default", connection=FakeStrictRedis(), is_async=False
+        )
+        run = start_run("monthly", *MARCH, partition_size=4)
+        self.assertEqual(len(enqueue_billing(run, queue=queue)), 2)
+        self.assertEqual(Invoice.objects.count(), 6)
+        self.assertEqual(pending_partitions(run), [])
+
+    def test_run_without_subscribers_is_finished(self):
+        run = start_run("weekly", date(2024, 3, 4), date(2024, 3, 10))
+        run.refresh_from_db()
+        self.assertFalse(run.partitions.exists())
+        self.assertIsNotNone(run.finished)
+
+    def test_weekly_rerun_next_day_bills_nothing_new(self):
+        Subscription.objects.update(billing="weekly")
+        call_command("run_billing", "weekly", "--date", "2026-10-19", stdout=StringIO())
+        self.assertEqual(Invoice.objects.count(), 6)
+        call_command("run_billing", "weekly", "--date", "2026-10-20", stdout=StringIO())
+        self.assertEqual(Invoice.objects.count(), 6)
+        self.assertEqual(BillingRun.objects.count(), 1)
+
+    def test_command(self):
+        out = StringIO()
+        call_command("run_billing", "monthly", "--date", "2024-04-02", stdout=out)
+        self.assertIn("6 invoices", out.getvalue())
+        call_command("run_billing", "monthly", "--date", "2024-04-02", stdout=out)
+        self.assertEqual(Invoice.objects.filter(period_start=MARCH[0]).count(), 6)
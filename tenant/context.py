@@ -0,0 +1,26 @@
+"""
+The tenant (a Company) the current request or job is working for.
+
+TenantMiddleware sets it for each request, to None only on the shared
+hosts; background jobs and commands run with no tenant unless they opt in
+with ``use_tenant``. Tenant-scoped managers (tenant.managers) filter on it,
+and see every row when it is None.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_tenant = ContextVar("current_tenant", default=None)
+
+
+def get_current_tenant():
+    return _current_tenant.get()
+
+
+@contextmanager
+def use_tenant(tenant):
+    token = _current_tenant.set(tenant)
+    try:
+        yield
+    finally:
+        _current_tenant.reset(token)
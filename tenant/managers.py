@@ -0,0 +1,34 @@
+from django.db import models
+
+from tenant.context import get_current_tenant
+
+
+class TenantManager(models.Manager):
+    """
+    Default manager that limits querysets to the current tenant. Subclasses
+    set ``tenant_field`` to the lookup that leads to the row's Company.
+    """
+
+    tenant_field = "company"
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        tenant = get_current_tenant()
+        if tenant is None:
+            return queryset
+        return queryset.filter(**{self.tenant_field: tenant.pk})
+
+    def owns(self, obj):
+        """
+        Whether ``obj`` is in this manager's queryset for the current tenant,
+        checked on the instance, e.g. for an object read from the cache.
+        """
+        tenant = get_current_tenant()
+        if tenant is None:
+            return True
+        *path, field = self.tenant_field.split("__")
+        for name in path:
+            obj = getattr(obj, name)
+        if field != "pk":
+            field = obj._meta.get_field(field).attname
+        return getattr(obj, field) == tenant.pk
@@ -0,0 +1,27 @@
+"""
+Which users may sign in on a tenant's hosts: the company's customers, the
+account whose email is the company's own, and superusers.
+"""
+
+from django.db.models import Q
+
+from company.models import Company
+
+
+def _members(user, tenant):
+    return Company._base_manager.filter(pk=tenant.pk).filter(
+        Q(customers__user=user.pk) | Q(email_identity__user=user.pk)
+    )
+
+
+def is_member(user, tenant):
+    """Whether ``user`` belongs to ``tenant``; everyone does on a shared host."""
+    if tenant is None or user.is_superuser:
+        return True
+    return _members(user, tenant).exists()
+
+
+async def ais_member(user, tenant):
+    if tenant is None or user.is_superuser:
+        return True
+    return await _members(user, tenant).aexists()
@@ -0,0 +1,34 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from tenant.context import use_tenant
+from tenant.resolver import aresolve_tenant, resolve_tenant
+
+
+class TenantMiddleware:
+    """
+    Attach ``request.tenant`` and scope the request's queries to it.
+
+    The scope ends when this middleware returns, so a streaming response
+    must build its querysets in the view, not in the generator it streams.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        request.tenant = resolve_tenant(request)
+        with use_tenant(request.tenant):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        request.tenant = await aresolve_tenant(request)
+        with use_tenant(request.tenant):
+            return await self.get_response(request)
@@ -1,3 +1,20 @@
 from django.db import models
 
-# Create your models here.
+
+class Domain(models.Model):
+    """
+    A host name served as a company, e.g. ``bins.acme.com``, or a bare label
+    such as ``acme`` for ``acme.<TENANT_BASE_DOMAIN>``.
+    """
+
+    domain = models.CharField(max_length=253, unique=True)
+    company = models.ForeignKey(
+        "company.Company", on_delete=models.CASCADE, related_name="domains"
+    )
+
+    def save(self, *args, **kwargs):
+        self.domain = self.domain.strip().lower()
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.domain
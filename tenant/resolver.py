@@ -0,0 +1,79 @@
+"""
+Host to tenant resolution from an in-process map.
+
+Every Domain row is loaded (with its company) into a dict once per
+TENANT_MAP_TTL seconds, so resolving a request is a dict lookup. Domain
+and Company writes invalidate the map in the writing process through
+core.signals; other processes pick the change up when their map expires.
+"""
+
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404
+from django.http.request import split_domain_port
+
+from tenant.models import Domain
+
+
+class TenantMap:
+    def __init__(self):
+        self._tenants = {}
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def expired(self):
+        return time.monotonic() >= self._expires
+
+    def get(self, key):
+        if self.expired():
+            self.load()
+        return self._tenants.get(key)
+
+    def load(self):
+        with self._lock:
+            if not self.expired():
+                return
+            self._tenants = {
+                domain.domain: domain.company
+                for domain in Domain.objects.select_related("company")
+            }
+            self._expires = time.monotonic() + settings.TENANT_MAP_TTL
+
+    def invalidate(self):
+        self._expires = 0.0
+
+
+tenants = TenantMap()
+
+
+def resolve_tenant(request):
+    """
+    The Company serving ``request``, or None on a TENANT_SHARED_HOSTS host.
+    Any other host raises Http404 rather than serving every tenant's rows.
+    """
+    host, _ = split_domain_port(request.get_host())
+    label = (
+        request.headers.get(settings.TENANT_HEADER) if settings.TENANT_HEADER else None
+    )
+    if label:
+        tenant = tenants.get(label.strip().lower())
+    else:
+        tenant = tenants.get(host)
+        base = settings.TENANT_BASE_DOMAIN
+        if tenant is None and base and host.endswith(f".{base}"):
+            tenant = tenants.get(host[: -len(base) - 1])
+        if tenant is None and host in settings.TENANT_SHARED_HOSTS:
+            return None
+    if tenant is None:
+        raise Http404("No company is served at this address.")
+    return tenant
+
+
+async def aresolve_tenant(request):
+    """resolve_tenant() for async middleware; an expired map loads on a thread."""
+    if tenants.expired():
+        await sync_to_async(tenants.load)()
+    return resolve_tenant(request)
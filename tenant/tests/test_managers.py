@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from company.models import Company
+from customer.models import Customer, ServiceHistory
+from tenant.context import use_tenant
+from tenant.tests.test_middleware import create_company
+
+
+class TenantManagerTestCase(TestCase):
+    def setUp(self):
+        self.acme = create_company("acme")
+        self.other = create_company("other")
+        staff = User.objects.create_user(username="staff")
+        for company in (self.acme, self.other):
+            user = User.objects.create_user(username=company.name)
+            customer = Customer.objects.create(
+                user=user,
+                company=company,
+                name=company.name,
+                email=f"customer@{company.name}.com",
+            )
+            ServiceHistory.objects.create(
+                customer=customer, created_by=staff, cost=Decimal(100)
+            )
+
+    def test_no_tenant_sees_everything(self):
+        self.assertEqual(Customer.objects.count(), 2)
+        self.assertEqual(ServiceHistory.objects.count(), 2)
+        self.assertEqual(Company.objects.count(), 2)
+
+    def test_querysets_are_scoped_to_tenant(self):
+        with use_tenant(self.acme):
+            self.assertEqual(
+                list(Customer.objects.values_list("company", flat=True)),
+                [self.acme.pk],
+            )
+            self.assertEqual(
+                list(
+                    ServiceHistory.objects.values_list("customer__company", flat=True)
+                ),
+                [self.acme.pk],
+            )
+            self.assertEqual(list(Company.objects.all()), [self.acme])
+            self.assertFalse(Customer.objects.filter(name="other").exists())
+
+    def test_queryset_methods_are_kept(self):
+        with use_tenant(self.other):
+            customers = Customer.objects.with_service_stats()
+            self.assertEqual([c.service_count for c in customers], [1])
@@ -0,0 +1,168 @@
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.models import User
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from company.models import Company
+from customer.models import Customer
+from tenant.context import get_current_tenant
+from tenant.middleware import TenantMiddleware
+from tenant.models import Domain
+from tenant.resolver import tenants
+
+
+def create_company(name):
+    return Company.objects.create(
+        name=name,
+        email=f"{name}@mail.com",
+        address="Lagos",
+        phone="0800",
+        description="Waste collection",
+        website=f"https://{name}.com",
+        established_date="2020-01-01",
+    )
+
+
+@override_settings(
+    ALLOWED_HOSTS=["*"],
+    TENANT_BASE_DOMAIN="recyclor.com",
+    TENANT_HEADER="",
+    TENANT_SHARED_HOSTS=["admin.recyclor.com"],
+)
+class TenantMiddlewareTestCase(TestCase):
+    def setUp(self):
+        tenants.invalidate()
+        self.addCleanup(tenants.invalidate)
+        self.acme = create_company("acme")
+        Domain.objects.create(domain="Bins.Acme.com", company=self.acme)
+        Domain.objects.create(domain="acme", company=self.acme)
+        self.factory = RequestFactory()
+
+    def resolve(self, host, **headers):
+        seen = {}
+
+        def view(request):
+            seen["tenant"] = get_current_tenant()
+            return HttpResponse()
+
+        request = self.factory.get("/", HTTP_HOST=host, headers=headers)
+        TenantMiddleware(view)(request)
+        self.assertEqual(seen["tenant"], request.tenant)
+        self.assertIsNone(get_current_tenant())
+        return request.tenant
+
+    def test_full_host(self):
+        self.assertEqual(self.resolve("bins.acme.com:8000"), self.acme)
+
+    def test_subdomain(self):
+        self.assertEqual(self.resolve("acme.recyclor.com"), self.acme)
+
+    def test_unknown_host(self):
+        for host in ("recyclor.com", "other.recyclor.com", "testserver"):
+            with self.subTest(host=host), self.assertRaises(Http404):
+                self.resolve(host)
+
+    def test_shared_host(self):
+        self.assertIsNone(self.resolve("admin.recyclor.com"))
+
+    @override_settings(TENANT_HEADER="X-Tenant")
+    def test_unknown_header(self):
+        with self.assertRaises(Http404):
+            self.resolve("admin.recyclor.com", X_Tenant="other")
+
+    @override_settings(TENANT_HEADER="X-Tenant")
+    def test_header(self):
+        self.assertEqual(self.resolve("recyclor.com", X_Tenant="ACME"), self.acme)
+
+    def test_hot_path_has_no_queries(self):
+        self.resolve("acme.recyclor.com")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.resolve("acme.recyclor.com"), self.acme)
+
+    def test_domain_change_invalidates_map(self):
+        self.resolve("acme.recyclor.com")
+        other = create_company("other")
+        Domain.objects.create(domain="other", company=other)
+        self.assertEqual(self.resolve("other.recyclor.com"), other)
+
+    def test_async_middleware(self):
+        seen = {}
+
+        async def view(request):
+            seen["tenant"] = get_current_tenant()
+            return HttpResponse()
+
+        middleware = TenantMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        request = self.factory.get("/", HTTP_HOST="acme.recyclor.com")
+        async_to_sync(middleware)(request)
+        self.assertEqual(request.tenant, self.acme)
+        self.assertEqual(seen["tenant"], self.acme)
+
+    @override_settings(TENANT_MAP_TTL=0)
+    def test_map_expires(self):
+        self.resolve("acme.recyclor.com")
+        Domain.objects.filter(domain="acme").delete()
+        with self.assertRaises(Http404):
+            self.resolve("acme.recyclor.com")
+
+
+@override_settings(
+    ALLOWED_HOSTS=["*"],
+    TENANT_BASE_DOMAIN="recyclor.com",
+    TENANT_HEADER="",
+    TENANT_SHARED_HOSTS=["testserver"],
+)
+class TenantMembershipTestCase(TestCase):
+    def setUp(self):
+        tenants.invalidate()
+        self.addCleanup(tenants.invalidate)
+        self.acme = create_company("acme")
+        self.other = create_company("other")
+        Domain.objects.create(domain="acme", company=self.acme)
+        Domain.objects.create(domain="other", company=self.other)
+        self.user = User.objects.create_user(username="meta", password="pass")
+        Customer.objects.create(
+            user=self.user, name="Meta", email="meta@mail.com", company=self.acme
+        )
+        self.login_url = reverse("account:login")
+
+    def signed_in(self, host):
+        # The login page redirects users it sees as signed in.
+        response = self.client.get(self.login_url, HTTP_HOST=host)
+        return response.status_code == 302
+
+    def test_unknown_host_is_not_found(self):
+        response = self.client.get("/", HTTP_HOST="nobody.recyclor.com")
+        self.assertEqual(response.status_code, 404)
+
+    def test_login_only_on_own_tenant(self):
+        credentials = {"username": "meta", "password": "pass"}
+        self.client.post(self.login_url, credentials, HTTP_HOST="other.recyclor.com")
+        self.assertNotIn("_auth_user_id", self.client.session)
+        self.client.post(self.login_url, credentials, HTTP_HOST="acme.recyclor.com")
+        self.assertIn("_auth_user_id", self.client.session)
+
+    def test_session_user_only_on_own_tenant(self):
+        self.client.login(username="meta", password="pass")
+        self.assertTrue(self.signed_in("acme.recyclor.com"))
+        self.assertFalse(self.signed_in("other.recyclor.com"))
+        self.assertTrue(self.signed_in("testserver"))
+
+    def test_company_account_and_superuser_are_members(self):
+        owner = User.objects.create_user(
+            username="owner", email="other@mail.com", password="pass"
+        )
+        admin = User.objects.create_superuser(username="admin", password="pass")
+        for user in (owner, admin):
+            self.client.force_login(user)
+            self.assertTrue(self.signed_in("other.recyclor.com"))
+
+    def test_moving_customer_revokes_cached_user(self):
+        self.client.login(username="meta", password="pass")
+        self.assertTrue(self.signed_in("acme.recyclor.com"))
+        customer = self.user.customer
+        customer.company = self.other
+        customer.save()
+        self.assertFalse(self.signed_in("acme.recyclor.com"))
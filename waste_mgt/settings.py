@@ -10,10 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # from django.contrib.auth.views import reverse_lazy
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -40,18 +41,25 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django_rq",
     "account.apps.AccountConfig",
     "core.apps.CoreConfig",
     "customer.apps.CustomerConfig",
     "company.apps.CompanyConfig",
+    "report.apps.ReportConfig",
+    "tenant.apps.TenantConfig",
+    "subscription.apps.SubscriptionConfig",
+    "payment.apps.PaymentConfig",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "tenant.middleware.TenantMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.PrimaryPinningMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -87,6 +95,33 @@ DATABASES = {
     }
 }
 
+# "concurrent" switches SQLite to the WAL / BEGIN IMMEDIATE backend in
+# core.backends.sqlite3 for tenants with several concurrent writers.
+SQLITE_PROFILE = config("SQLITE_PROFILE", default="")
+
+if SQLITE_PROFILE == "concurrent":
+    DATABASES["default"]["ENGINE"] = "core.backends.sqlite3"
+
+# Optional read-only replica for reports, dashboard and exports; see
+# core.db_routers. Without it, replica reads fall back to "default". It uses
+# the primary's engine and options unless REPLICA_DATABASE_ENGINE is set.
+REPLICA_DATABASE_NAME = config("REPLICA_DATABASE_NAME", default="")
+
+if REPLICA_DATABASE_NAME:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "ENGINE": config(
+            "REPLICA_DATABASE_ENGINE", default=DATABASES["default"]["ENGINE"]
+        ),
+        "NAME": REPLICA_DATABASE_NAME,
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["core.db_routers.ReplicaRouter"]
+
+# Seconds a session keeps reading from the primary after it writes.
+REPLICA_PIN_SECONDS = 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -99,19 +134,53 @@ AUTH_PASSWORD_VALIDATORS = [
         "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
     },
     {
-        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
+        "NAME": "account.password_validation.CompiledCommonPasswordValidator",
     },
     {
         "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
     },
 ]
 
+# Where CompiledCommonPasswordValidator keeps its compiled tables. Must not be
+# writable by other users; see account.password_validation.
+PASSWORD_TABLE_DIR = config(
+    "PASSWORD_TABLE_DIR", default=str(BASE_DIR / "var" / "password-tables")
+)
+
+
+# Tenants are resolved from the request host: a Domain row for the full
+# host name, or for the subdomain label under TENANT_BASE_DOMAIN. Set
+# TENANT_HEADER (e.g. "X-Tenant") only behind a proxy that sets it, since it
+# takes precedence over the host. Hosts that resolve to no tenant get a 404,
+# except TENANT_SHARED_HOSTS (the operators' site), which see every tenant.
+TENANT_BASE_DOMAIN = config("TENANT_BASE_DOMAIN", default="")
+TENANT_HEADER = config("TENANT_HEADER", default="")
+TENANT_SHARED_HOSTS = config(
+    "TENANT_SHARED_HOSTS", default="localhost,127.0.0.1,[::1],testserver", cast=Csv()
+)
+# Seconds each process keeps its host-to-tenant map before reloading it.
+TENANT_MAP_TTL = config("TENANT_MAP_TTL", default=60, cast=int)
+
+# Async login and registration hash on a shared thread pool, sized to leave
+# CPU for serving other requests; once this many hashes are queued or
+# running, further attempts get a 503.
+PASSWORD_HASHING_WORKERS = config(
+    "PASSWORD_HASHING_WORKERS", default=max(1, (os.cpu_count() or 2) // 2), cast=int
+)
+PASSWORD_HASHING_BACKLOG = config("PASSWORD_HASHING_BACKLOG", default=64, cast=int)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
 LANGUAGE_CODE = "en-us"
 
+# Project number formats for languages Django has none for (see core.money).
+FORMAT_MODULE_PATH = ["core.formats"]
+
+# ISO 4217 code that money amounts are in unless stated (core.money).
+DEFAULT_CURRENCY = config("DEFAULT_CURRENCY", default="NGN")
+
 TIME_ZONE = "UTC"
 
 USE_I18N = True
@@ -134,6 +203,65 @@ MEDIA_ROOT = BASE_DIR / "media"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 LOGIN_URL = "account:login"
 
+REDIS_URL = config("REDIS_URL", default="redis://localhost:6379/0")
+
+# Shared cache: Redis when CACHE_URL is set, per-process memory otherwise
+# (tests, single-process development).
+CACHE_URL = config("CACHE_URL", default="")
+
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+            "KEY_PREFIX": "recyclor",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# With a shared cache, sessions and the logged-in user are read from it on
+# each request (sessions still write through to the database). Not with the
+# per-process cache: a logout or password change would only clear the cache
+# of the worker that handled it.
+if CACHE_URL:
+    SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+    AUTHENTICATION_BACKENDS = ["account.backends.CachedModelBackend"]
+else:
+    AUTHENTICATION_BACKENDS = ["account.backends.TenantModelBackend"]
+
+# Webhook signing secrets; a gateway without one rejects every delivery.
+PAYSTACK_SECRET_KEY = config("PAYSTACK_SECRET_KEY", default="")
+INTERSWITCH_SECRET_KEY = config("INTERSWITCH_SECRET_KEY", default="")
+INTERSWITCH_MERCHANT_CODE = config("INTERSWITCH_MERCHANT_CODE", default="")
+
+# Gateway API clients (payment.client): requests per second per gateway,
+# concurrent requests per async batch, seconds per request, and retries with
+# jittered exponential backoff starting at PAYMENT_GATEWAY_BACKOFF seconds.
+PAYSTACK_API_URL = config("PAYSTACK_API_URL", default="https://api.paystack.co")
+PAYSTACK_RATE_LIMIT = config("PAYSTACK_RATE_LIMIT", default=50, cast=float)
+INTERSWITCH_API_URL = config(
+    "INTERSWITCH_API_URL", default="https://webpay.interswitchng.com"
+)
+INTERSWITCH_RATE_LIMIT = config("INTERSWITCH_RATE_LIMIT", default=20, cast=float)
+PAYMENT_GATEWAY_CONCURRENCY = config(
+    "PAYMENT_GATEWAY_CONCURRENCY", default=50, cast=int
+)
+PAYMENT_GATEWAY_TIMEOUT = config("PAYMENT_GATEWAY_TIMEOUT", default=10, cast=float)
+PAYMENT_GATEWAY_RETRIES = config("PAYMENT_GATEWAY_RETRIES", default=3, cast=int)
+PAYMENT_GATEWAY_BACKOFF = config("PAYMENT_GATEWAY_BACKOFF", default=0.5, cast=float)
+
+RQ_QUEUES = {
+    "default": {
+        "URL": REDIS_URL,
+        "DEFAULT_TIMEOUT": 360,
+    },
+}
+
 try:
     from .local_settings import *
 except ImportError:
@@ -28,4 +28,6 @@ urlpatterns = [
     path("account/", include(("account.urls", "account"), namespace="account")),
     path("company/", include("company.urls", namespace="company")),
     path("customer/", include("customer.urls", namespace="customer")),
+    path("report/", include("report.urls", namespace="report")),
+    path("payment/", include("payment.urls", namespace="payment")),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)